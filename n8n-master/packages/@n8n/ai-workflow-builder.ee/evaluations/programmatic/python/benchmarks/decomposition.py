@@ -0,0 +1,106 @@
+"""Benchmark of component decomposition against whole-workflow comparisons.
+
+Compares synthetic workflows of independent branches, with the node types of
+every other branch changed, under the configured time budget.
+
+Usage: uv run python -m benchmarks.decomposition [--branches 2,4,6,8] [--length 10] [--timeout 10] [--workers 4]
+"""
+
+import argparse
+import dataclasses
+import time
+
+from src.config_loader import load_config
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+
+NODE_TYPES = ["test.a", "test.b", "test.c"]
+
+
+def branches_workflow(branch_count: int, length: int, shifted: bool) -> dict:
+    nodes = []
+    connections = {}
+    for branch in range(branch_count):
+        previous = f"Trigger {branch}"
+        nodes.append(
+            {
+                "id": f"t{branch}",
+                "name": previous,
+                "type": "n8n-nodes-base.webhook",
+                "parameters": {"path": f"/branch-{branch}"},
+            }
+        )
+        shift = 1 if shifted and branch % 2 == 0 else 0
+        for i in range(length):
+            name = f"Branch {branch} Node {i}"
+            nodes.append(
+                {
+                    "id": f"{branch}-{i}",
+                    "name": name,
+                    "type": NODE_TYPES[(i + shift) % len(NODE_TYPES)],
+                    "parameters": {"value": (i + branch) % 3},
+                }
+            )
+            connections[previous] = {
+                "main": [[{"node": name, "type": "main", "index": 0}]]
+            }
+            previous = name
+
+    return {"name": "Branches", "nodes": nodes, "connections": connections}
+
+
+def compare(g1, g2, config) -> tuple[dict, float]:
+    start_time = time.perf_counter()
+    result = calculate_graph_edit_distance(g1, g2, config)
+    return result, time.perf_counter() - start_time
+
+
+def main(branch_counts: list[int], length: int, timeout: float, workers: int) -> None:
+    config = dataclasses.replace(load_config("preset:standard"), ged_timeout=timeout)
+    variants = {
+        "whole": config,
+        "decomposed": dataclasses.replace(config, ged_decompose=True),
+        f"{workers} workers": dataclasses.replace(
+            config, ged_decompose=True, ged_workers=workers
+        ),
+    }
+
+    print(f"{'branches':>8} {'nodes':>5}", end="")
+    for name in variants:
+        print(f" {name + ' cost':>18} {'time':>8}", end="")
+    print()
+
+    for branch_count in branch_counts:
+        g1 = build_workflow_graph(
+            branches_workflow(branch_count, length, False), config
+        )
+        g2 = build_workflow_graph(branches_workflow(branch_count, length, True), config)
+
+        print(f"{branch_count:>8} {g1.number_of_nodes():>5}", end="")
+        for variant_config in variants.values():
+            result, elapsed = compare(g1, g2, variant_config)
+            approximate = "~" if result["is_approximate"] else " "
+            print(
+                f" {approximate}{result['edit_cost']:>17.1f} {elapsed * 1000:>6.0f}ms",
+                end="",
+            )
+        print()
+
+    print()
+    print("~ marks costs not proven optimal")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--branches", default="2,4,6,8")
+    parser.add_argument("--length", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    main(
+        [int(count) for count in args.branches.split(",")],
+        args.length,
+        args.timeout,
+        args.workers,
+    )
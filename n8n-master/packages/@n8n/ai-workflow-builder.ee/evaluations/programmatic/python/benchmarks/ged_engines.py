@@ -0,0 +1,87 @@
+"""Benchmark of bipartite edit distance accuracy and speed against the exact engine.
+
+Compares every ordered pair of workflows in a directory under each preset.
+
+Usage: uv run python -m benchmarks.ged_engines [--workflows-dir example_workflows] [--presets strict,standard,lenient]
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import statistics
+import time
+from pathlib import Path
+
+from src.config_loader import load_config
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+
+
+def compare(g1, g2, config, engine: str) -> tuple[dict, float]:
+    engine_config = dataclasses.replace(config, ged_engine=engine, ged_timeout=None)
+    start_time = time.perf_counter()
+    result = calculate_graph_edit_distance(g1, g2, engine_config)
+    return result, time.perf_counter() - start_time
+
+
+def main(workflows_dir: Path, presets: list[str]) -> None:
+    workflows = {
+        path.stem: json.loads(path.read_text())
+        for path in sorted(workflows_dir.glob("*.json"))
+    }
+
+    errors: list[float] = []
+    exact_time = bipartite_time = 0.0
+    optimal = 0
+
+    print(
+        f"{'preset':<9} {'generated':<30} {'ground truth':<30} {'exact':>6} {'bipart.':>7} {'error':>6}"
+    )
+    for preset in presets:
+        config = load_config(f"preset:{preset}")
+        graphs = {
+            name: build_workflow_graph(workflow, config)
+            for name, workflow in workflows.items()
+        }
+
+        for name1, name2 in itertools.product(graphs, repeat=2):
+            exact, exact_elapsed = compare(
+                graphs[name1], graphs[name2], config, "exact"
+            )
+            bipartite, bipartite_elapsed = compare(
+                graphs[name1], graphs[name2], config, "bipartite"
+            )
+
+            error = bipartite["similarity_score"] - exact["similarity_score"]
+            errors.append(abs(error))
+            exact_time += exact_elapsed
+            bipartite_time += bipartite_elapsed
+            optimal += bipartite["edit_cost"] == exact["edit_cost"]
+
+            print(
+                f"{preset:<9} {name1:<30} {name2:<30} {exact['similarity_score']:>6.3f} "
+                f"{bipartite['similarity_score']:>7.3f} {error:>+6.3f}"
+            )
+
+    print()
+    print(f"pairs:                  {len(errors)}")
+    print(f"optimal edit cost:      {optimal}/{len(errors)}")
+    print(f"mean similarity error:  {statistics.mean(errors):.4f}")
+    print(f"max similarity error:   {max(errors):.4f}")
+    print(
+        f"total time:             exact {exact_time * 1000:.1f}ms, bipartite {bipartite_time * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workflows-dir",
+        type=Path,
+        default=Path(__file__).parent.parent / "example_workflows",
+    )
+    parser.add_argument("--presets", default="strict,standard,lenient")
+    args = parser.parse_args()
+
+    main(args.workflows_dir, args.presets.split(","))
@@ -0,0 +1,131 @@
+"""Benchmark of per-pair latency of the comparison server against the one-shot CLI.
+
+Compares ordered pairs of workflows in a directory, once by running
+src.compare_workflows per pair, once through a single src.server process.
+
+Usage: uv run python -m benchmarks.server_latency [--workflows-dir example_workflows] [--pairs 20] [--workers 4]
+"""
+
+import argparse
+import itertools
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+def one_shot(pairs: list[tuple[Path, Path]], preset: str) -> list[float]:
+    latencies = []
+    for generated, ground_truth in pairs:
+        start_time = time.perf_counter()
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.compare_workflows",
+                str(generated),
+                str(ground_truth),
+                "--preset",
+                preset,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        latencies.append(time.perf_counter() - start_time)
+    return latencies
+
+
+def served(
+    pairs: list[tuple[Path, Path]], preset: str, workers: int
+) -> tuple[float, list[float], float]:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--workers", str(workers)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert server.stdin is not None and server.stdout is not None
+
+    requests = [
+        json.dumps(
+            {
+                "id": index,
+                "generated": json.loads(generated.read_text()),
+                "ground_truth": json.loads(ground_truth.read_text()),
+                "preset": preset,
+            }
+        )
+        + "\n"
+        for index, (generated, ground_truth) in enumerate(pairs)
+    ]
+
+    def request(line: str) -> None:
+        server.stdin.write(line)
+        server.stdin.flush()
+        response = json.loads(server.stdout.readline())
+        assert "result" in response, response
+
+    # The first request includes server startup, like every one-shot call
+    start_time = time.perf_counter()
+    request(requests[0])
+    first = time.perf_counter() - start_time
+
+    latencies = []
+    for line in requests:
+        start_time = time.perf_counter()
+        request(line)
+        latencies.append(time.perf_counter() - start_time)
+
+    # All requests at once, answered concurrently
+    start_time = time.perf_counter()
+    server.stdin.writelines(requests)
+    server.stdin.flush()
+    for _ in requests:
+        json.loads(server.stdout.readline())
+    burst = time.perf_counter() - start_time
+
+    server.stdin.close()
+    server.wait()
+
+    return first, latencies, burst
+
+
+def main(workflows_dir: Path, pair_count: int, preset: str, workers: int) -> None:
+    paths = sorted(workflows_dir.glob("*.json"))
+    pairs = list(itertools.islice(itertools.product(paths, repeat=2), pair_count))
+
+    one_shot_latencies = one_shot(pairs, preset)
+    first, served_latencies, burst = served(pairs, preset, workers)
+
+    print(f"pairs:                        {len(pairs)}")
+    print(
+        f"one-shot CLI per pair:        mean {statistics.mean(one_shot_latencies) * 1000:.1f}ms, "
+        f"median {statistics.median(one_shot_latencies) * 1000:.1f}ms, "
+        f"total {sum(one_shot_latencies) * 1000:.1f}ms"
+    )
+    print(f"server first request:         {first * 1000:.1f}ms (includes startup)")
+    print(
+        f"server per pair (sequential): mean {statistics.mean(served_latencies) * 1000:.1f}ms, "
+        f"median {statistics.median(served_latencies) * 1000:.1f}ms, "
+        f"total {sum(served_latencies) * 1000:.1f}ms"
+    )
+    print(
+        f"server all pairs (burst):     total {burst * 1000:.1f}ms with {workers} workers"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workflows-dir",
+        type=Path,
+        default=Path(__file__).parent.parent / "example_workflows",
+    )
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--preset", default="standard")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    main(args.workflows_dir, args.pairs, args.preset, args.workers)
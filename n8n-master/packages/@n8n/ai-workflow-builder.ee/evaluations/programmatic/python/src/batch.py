@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Batch workflow comparison over a dataset of generated/ground truth pairs.
+
+The configuration is loaded once and pairs are compared in parallel worker
+processes. Results are streamed as JSON lines as soon as each pair finishes,
+followed by aggregate statistics.
+
+Dataset formats:
+    manifest.jsonl         One {"id", "generated", "ground_truth"} object per line,
+                           paths relative to the manifest
+    manifest.json          A list of the same objects
+    directory/             One subdirectory per pair, holding generated.json
+                           and ground_truth.json
+
+Options:
+    --workers N            Worker processes [default: CPU count]
+    --pair-timeout SECONDS Hard limit per pair, exceeded pairs are reported as timeouts
+    --output PATH          Write JSON lines to PATH instead of stdout
+    --stats-output PATH    Write aggregate statistics to PATH instead of stderr
+    --cache-dir PATH       Share built graphs and results on disk between runs
+"""
+
+import argparse
+import json
+import signal
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.cache import ComparisonCache
+from src.compare_workflows import PASS_THRESHOLD, add_config_arguments, resolve_config
+from src.config_loader import WorkflowComparisonConfig
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+
+GENERATED_FILENAME = "generated.json"
+GROUND_TRUTH_FILENAME = "ground_truth.json"
+
+
+@dataclass
+class WorkflowPair:
+    """A generated workflow and the ground truth it is compared against"""
+
+    id: str
+    generated: Path
+    ground_truth: Path
+
+
+class PairTimeoutError(BaseException):
+    """
+    Raised inside a worker when a pair exceeds its time limit.
+
+    Derives from BaseException, like KeyboardInterrupt, so that it is not
+    swallowed by the fallbacks of the comparison code it interrupts.
+    """
+
+
+def load_pairs(dataset: Path) -> List[WorkflowPair]:
+    """
+    Load workflow pairs from a manifest file or a dataset directory.
+
+    Args:
+        dataset: Path to a .jsonl/.json manifest, or a directory with one
+            subdirectory per pair
+
+    Returns:
+        List of workflow pairs
+
+    Raises:
+        ValueError: If the dataset cannot be read
+    """
+    if dataset.is_dir():
+        return [
+            WorkflowPair(
+                id=pair_dir.name,
+                generated=pair_dir / GENERATED_FILENAME,
+                ground_truth=pair_dir / GROUND_TRUTH_FILENAME,
+            )
+            for pair_dir in sorted(dataset.iterdir())
+            if (pair_dir / GENERATED_FILENAME).exists()
+        ]
+
+    if not dataset.exists():
+        raise ValueError(f"Dataset not found: {dataset}")
+
+    text = dataset.read_text()
+    try:
+        if dataset.suffix == ".jsonl":
+            entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            entries = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid manifest {dataset}: {e}")
+
+    pairs = []
+    for index, entry in enumerate(entries):
+        try:
+            pairs.append(
+                WorkflowPair(
+                    id=str(entry.get("id", index)),
+                    generated=dataset.parent / entry["generated"],
+                    ground_truth=dataset.parent / entry["ground_truth"],
+                )
+            )
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError(
+                f"Manifest entry {index} needs 'generated' and 'ground_truth' paths"
+            )
+
+    return pairs
+
+
+# ========== Worker process ==========
+
+_worker_config: Optional[WorkflowComparisonConfig] = None
+_worker_pair_timeout: Optional[float] = None
+_worker_cache: Optional[ComparisonCache] = None
+
+
+def _init_worker(
+    config: WorkflowComparisonConfig,
+    pair_timeout: Optional[float],
+    cache_dir: Optional[Path],
+) -> None:
+    global _worker_config, _worker_pair_timeout, _worker_cache
+    # Records may be written to stdout, keep anything printed while comparing
+    # out of them
+    sys.stdout = sys.stderr
+    _worker_config = config
+    _worker_pair_timeout = pair_timeout
+    # Ground truths are compared against many candidates, keep their graphs
+    _worker_cache = ComparisonCache(cache_dir)
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]):
+    """Raise PairTimeoutError if the block runs longer than `seconds`"""
+    if seconds is None:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise PairTimeoutError(f"Comparison exceeded {seconds}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def evaluate_pair(
+    pair: WorkflowPair,
+    config: WorkflowComparisonConfig,
+    pair_timeout: Optional[float] = None,
+    cache: Optional[ComparisonCache] = None,
+) -> Dict[str, Any]:
+    """
+    Compare one workflow pair, never raising.
+
+    Args:
+        pair: Workflow pair to compare
+        config: Comparison configuration
+        pair_timeout: Hard limit in seconds, must run in the main thread
+        cache: Cache of graphs and results to use, if any
+
+    Returns:
+        Result record with `status` ok, error or timeout
+    """
+    started_at = time.perf_counter()
+    record: Dict[str, Any] = {"id": pair.id}
+
+    try:
+        with time_limit(pair_timeout):
+            with open(pair.generated) as f:
+                generated = json.load(f)
+            with open(pair.ground_truth) as f:
+                ground_truth = json.load(f)
+
+            if cache is not None:
+                result = cache.compare(generated, ground_truth, config)
+            else:
+                g1 = build_workflow_graph(generated, config)
+                g2 = build_workflow_graph(ground_truth, config)
+                result = calculate_graph_edit_distance(g1, g2, config)
+
+        record.update(
+            status="ok",
+            similarity_score=result["similarity_score"],
+            edit_cost=result["edit_cost"],
+            max_possible_cost=result["max_possible_cost"],
+            is_approximate=result["is_approximate"],
+            edit_cost_lower_bound=result["edit_cost_lower_bound"],
+            top_edits=result["top_edits"][: config.max_edits],
+        )
+    except PairTimeoutError as e:
+        record.update(status="timeout", error=str(e))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+
+    record["elapsed"] = time.perf_counter() - started_at
+    return record
+
+
+def _evaluate_in_worker(pair: WorkflowPair) -> Dict[str, Any]:
+    assert _worker_config is not None
+    return evaluate_pair(pair, _worker_config, _worker_pair_timeout, _worker_cache)
+
+
+# ========== Batch ==========
+
+
+def evaluate_pairs(
+    pairs: Iterable[WorkflowPair],
+    config: WorkflowComparisonConfig,
+    workers: Optional[int] = None,
+    pair_timeout: Optional[float] = None,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Compare workflow pairs in parallel worker processes.
+
+    The config is sent to each worker once, when the worker starts. Each
+    worker caches built graphs and results in memory, and on disk if
+    `cache_dir` is given.
+
+    Args:
+        pairs: Workflow pairs to compare
+        config: Comparison configuration
+        workers: Number of worker processes, defaults to the CPU count
+        pair_timeout: Hard limit in seconds per pair
+        cache_dir: Directory of a disk cache shared by the workers
+
+    Yields:
+        Result records from evaluate_pair, in completion order
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(config, pair_timeout, cache_dir),
+    ) as executor:
+        futures = {executor.submit(_evaluate_in_worker, pair): pair for pair in pairs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # worker process died
+                yield {
+                    "id": futures[future].id,
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                }
+
+
+def aggregate_results(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize batch result records.
+
+    Args:
+        records: Result records from evaluate_pairs
+
+    Returns:
+        Counts per status and statistics over the similarity scores
+    """
+    records = list(records)
+    scores = [
+        record["similarity_score"] for record in records if record["status"] == "ok"
+    ]
+
+    stats: Dict[str, Any] = {
+        "pairs": len(records),
+        "ok": len(scores),
+        "errors": sum(1 for record in records if record["status"] == "error"),
+        "timeouts": sum(1 for record in records if record["status"] == "timeout"),
+        "approximate": sum(1 for record in records if record.get("is_approximate")),
+    }
+
+    if scores:
+        stats.update(
+            mean_similarity=statistics.mean(scores),
+            median_similarity=statistics.median(scores),
+            min_similarity=min(scores),
+            max_similarity=max(scores),
+            pass_rate=sum(1 for score in scores if score >= PASS_THRESHOLD)
+            / len(scores),
+        )
+
+    return stats
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Compare many n8n workflow pairs using graph edit distance",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare all pairs listed in a manifest
+  python -m src.batch dataset/manifest.jsonl --preset standard --output results.jsonl
+
+  # Compare all pair directories, at most 60 seconds per pair
+  python -m src.batch dataset/ --workers 8 --pair-timeout 60
+
+  # Reuse graphs and results of unchanged pairs from earlier runs
+  python -m src.batch dataset/ --cache-dir .comparison-cache
+        """,
+    )
+
+    parser.add_argument(
+        "dataset", type=Path, help="Manifest (.jsonl or .json) or dataset directory"
+    )
+    add_config_arguments(parser)
+    parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--pair-timeout",
+        type=float,
+        help="Hard time limit in seconds per pair, reported as a timeout",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write JSON lines to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--stats-output",
+        type=Path,
+        help="Write aggregate statistics to this file instead of stderr",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Cache built graphs and comparison results in this directory",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+
+    try:
+        config = resolve_config(args)
+    except Exception as e:
+        print(f"Error loading configuration: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.pair_timeout is not None and args.pair_timeout <= 0:
+        print("Error: --pair-timeout must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        pairs = load_pairs(args.dataset)
+    except ValueError as e:
+        print(f"Error loading dataset: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    records = []
+    started_at = time.perf_counter()
+    try:
+        for record in evaluate_pairs(
+            pairs, config, args.workers, args.pair_timeout, args.cache_dir
+        ):
+            records.append(record)
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if args.output:
+            output.close()
+
+    stats = aggregate_results(records)
+    stats["elapsed"] = time.perf_counter() - started_at
+
+    if args.stats_output:
+        args.stats_output.write_text(json.dumps(stats, indent=2) + "\n")
+    else:
+        print(json.dumps(stats, indent=2), file=sys.stderr)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted by user", file=sys.stderr)
+        sys.exit(130)
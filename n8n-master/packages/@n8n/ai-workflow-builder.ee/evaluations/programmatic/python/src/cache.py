@@ -0,0 +1,292 @@
+"""
+Content-addressed cache of built workflow graphs and comparison results.
+
+Workflows are identified by the hash of their canonical JSON and configs by a
+fingerprint of every setting, so identical content hits the cache regardless
+of where it came from. Entries live in a bounded in-memory LRU and, if a
+directory is given, on disk where they are shared between processes.
+
+Disk entries are pickled graphs and JSON results. Only point the cache at
+directories you trust, as loading a pickle can run arbitrary code. Keys
+include CACHE_VERSION, so entries written by older code are never read, and
+are evicted as they age, along with temporary files left by killed writers.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import networkx as nx
+
+from src.config_loader import WorkflowComparisonConfig
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+
+# Bump whenever the graphs or results produced for the same workflows and
+# settings change, e.g. a new cost rule or result field
+CACHE_VERSION = 1
+DEFAULT_MEMORY_ENTRIES = 1024
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+# Disk eviction removes entries until the cache is this fraction of its limit,
+# so that it does not run again on the next write
+DISK_EVICTION_TARGET = 0.8
+# Temporary files older than this were left by a process killed mid-write
+STALE_TEMP_SECONDS = 3600
+
+
+def _json_default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def canonical_hash(value: Any) -> str:
+    """
+    Hash a JSON value independently of key order and formatting.
+
+    Args:
+        value: JSON-serializable value, sets and dataclasses are allowed
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON
+    """
+    canonical = json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def config_fingerprint(config: WorkflowComparisonConfig) -> str:
+    """
+    Fingerprint every public setting of a configuration.
+
+    Compiled matchers and memoized decisions are derived from the settings
+    and left out.
+
+    Args:
+        config: Comparison configuration
+
+    Returns:
+        Hex SHA-256 digest of the settings
+    """
+    return canonical_hash(
+        {
+            field.name: getattr(config, field.name)
+            for field in dataclasses.fields(config)
+            if not field.name.startswith("_")
+        }
+    )
+
+
+class ComparisonCache:
+    """Caches workflow graphs and comparison results by content."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Args:
+            directory: Directory for the disk cache, None keeps entries in
+                memory only
+            max_memory_entries: Graphs and results each kept in memory
+            max_disk_bytes: Size limit of the disk cache
+        """
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats: Counter = Counter()
+
+        self._graphs: "OrderedDict[str, nx.DiGraph]" = OrderedDict()
+        # Results are kept serialized, callers get a copy they may modify
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+
+        self._disk_bytes = 0
+        if directory is not None:
+            for kind in ("graphs", "results"):
+                (directory / kind).mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def graph(
+        self, workflow: Dict[str, Any], config: WorkflowComparisonConfig
+    ) -> nx.DiGraph:
+        """
+        Get the graph of a workflow, building it on a miss.
+
+        Cached graphs are shared and must not be modified.
+
+        Args:
+            workflow: n8n workflow JSON
+            config: Comparison configuration
+
+        Returns:
+            Workflow graph, as built by build_workflow_graph
+        """
+        return self._graph(workflow, canonical_hash(workflow), config)
+
+    def compare(
+        self,
+        generated: Dict[str, Any],
+        ground_truth: Dict[str, Any],
+        config: WorkflowComparisonConfig,
+    ) -> Dict[str, Any]:
+        """
+        Get the comparison result of a workflow pair, comparing it on a miss.
+
+        Args:
+            generated: Generated workflow JSON
+            ground_truth: Ground truth workflow JSON
+            config: Comparison configuration
+
+        Returns:
+            Result of calculate_graph_edit_distance
+        """
+        fingerprint = config_fingerprint(config)
+        generated_hash = canonical_hash(generated)
+        ground_truth_hash = canonical_hash(ground_truth)
+        key = canonical_hash(
+            ["result", CACHE_VERSION, generated_hash, ground_truth_hash, fingerprint]
+        )
+
+        serialized = self._get(self._results, "results", key, ".json")
+        if serialized is not None:
+            self.stats["result_hits"] += 1
+            return json.loads(serialized)
+
+        self.stats["result_misses"] += 1
+        g1 = self._graph(generated, generated_hash, config, fingerprint)
+        g2 = self._graph(ground_truth, ground_truth_hash, config, fingerprint)
+        result = calculate_graph_edit_distance(g1, g2, config)
+
+        serialized = json.dumps(result)
+        self._put(
+            self._results, "results", key, ".json", serialized, serialized.encode()
+        )
+        return json.loads(serialized)
+
+    def _graph(
+        self,
+        workflow: Dict[str, Any],
+        workflow_hash: str,
+        config: WorkflowComparisonConfig,
+        fingerprint: Optional[str] = None,
+    ) -> nx.DiGraph:
+        fingerprint = fingerprint or config_fingerprint(config)
+        key = canonical_hash(["graph", CACHE_VERSION, workflow_hash, fingerprint])
+
+        graph = self._get(self._graphs, "graphs", key, ".pickle")
+        if graph is not None:
+            self.stats["graph_hits"] += 1
+            return graph
+
+        self.stats["graph_misses"] += 1
+        graph = build_workflow_graph(workflow, config)
+        self._put(self._graphs, "graphs", key, ".pickle", graph, pickle.dumps(graph))
+        return graph
+
+    # ========== Storage ==========
+
+    def _get(self, memory: OrderedDict, kind: str, key: str, suffix: str) -> Any:
+        if key in memory:
+            memory.move_to_end(key)
+            return memory[key]
+
+        if self.directory is None:
+            return None
+
+        path = self.directory / kind / f"{key}{suffix}"
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # eviction removes the least recently used entries
+        except OSError:
+            return None
+
+        self.stats["disk_hits"] += 1
+        value = pickle.loads(data) if suffix == ".pickle" else data.decode()
+        self._remember(memory, key, value)
+        return value
+
+    def _put(
+        self,
+        memory: OrderedDict,
+        kind: str,
+        key: str,
+        suffix: str,
+        value: Any,
+        data: bytes,
+    ) -> None:
+        self._remember(memory, key, value)
+
+        if self.directory is None:
+            return
+
+        # Write atomically, other processes may read the entry concurrently
+        fd, temp_path = tempfile.mkstemp(dir=self.directory / kind, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.directory / kind / f"{key}{suffix}")
+        except OSError:
+            return
+        finally:
+            # No-op once replaced. Also runs when a pair timeout, which is not
+            # an OSError, interrupts the write
+            Path(temp_path).unlink(missing_ok=True)
+
+        self._disk_bytes += len(data)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _remember(self, memory: OrderedDict, key: str, value: Any) -> None:
+        memory[key] = value
+        memory.move_to_end(key)
+        if len(memory) > self.max_memory_entries:
+            memory.popitem(last=False)
+
+    def _disk_entries(self) -> list[tuple[float, int, Path]]:
+        assert self.directory is not None
+        entries = []
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        for kind in ("graphs", "results"):
+            for path in (self.directory / kind).iterdir():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue  # removed by another process
+                if path.suffix == ".tmp":
+                    if stat.st_mtime < stale_before:
+                        path.unlink(missing_ok=True)
+                    continue  # being written
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_disk(self) -> None:
+        """Remove the least recently used disk entries until below the limit"""
+        # Other processes sharing the directory write too, so recount
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * DISK_EVICTION_TARGET
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.stats["disk_evictions"] += 1
+
+        self._disk_bytes = total
@@ -6,6 +6,8 @@ Options:
     --config PATH          Path to custom config file (.yaml or .json)
     --preset NAME          Use built-in preset (strict|standard|lenient)
     --output-format FORMAT Output format (json|summary) [default: json]
+    --engine NAME          Edit distance engine (exact|bipartite)
+    --timeout SECONDS      Time budget for the edit distance search
     --verbose              Show detailed comparison info
     --help                 Show this help message
 """
@@ -15,9 +17,81 @@ import json
 import sys
 from typing import Dict, Any
 
+import networkx as nx
+
 from src.graph_builder import build_workflow_graph, graph_stats
 from src.similarity import calculate_graph_edit_distance
-from src.config_loader import load_config
+from src.config_loader import GED_ENGINES, WorkflowComparisonConfig, load_config
+from src.cost_functions import cost_function_calls, reset_cost_function_calls
+
+# Minimum similarity score for workflows to count as sufficiently similar
+PASS_THRESHOLD = 0.7
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the configuration options shared by the comparison CLIs"""
+    parser.add_argument(
+        "--config", help="Path to custom configuration file (.yaml or .json)"
+    )
+    parser.add_argument(
+        "--preset",
+        choices=["strict", "standard", "lenient"],
+        help="Use built-in configuration preset",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=GED_ENGINES,
+        help="Edit distance engine: exhaustive search within the time budget, or "
+        "polynomial-time bipartite approximation (overrides ged.engine in config)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Time budget in seconds for the edit distance search, after which "
+        "the best result so far is returned (overrides ged.timeout in config)",
+    )
+    parser.add_argument(
+        "--decompose",
+        action="store_true",
+        help="Compare connected components of the workflows separately "
+        "(overrides ged.decompose in config)",
+    )
+    parser.add_argument(
+        "--component-workers",
+        type=int,
+        help="Processes comparing components in parallel, with --decompose "
+        "(overrides ged.workers in config)",
+    )
+
+
+def resolve_config(args: argparse.Namespace) -> WorkflowComparisonConfig:
+    """
+    Load the configuration selected by the options of add_config_arguments.
+
+    Raises:
+        ValueError: If the configuration cannot be loaded or an option is invalid
+    """
+    if args.config:
+        config = load_config(args.config)
+    elif args.preset:
+        config = load_config(f"preset:{args.preset}")
+    else:
+        config = load_config()  # Default (standard)
+
+    if args.timeout is not None:
+        if args.timeout <= 0:
+            raise ValueError("--timeout must be positive")
+        config.ged_timeout = args.timeout
+    if args.engine:
+        config.ged_engine = args.engine
+    if args.decompose:
+        config.ged_decompose = True
+    if args.component_workers is not None:
+        if args.component_workers < 1:
+            raise ValueError("--component-workers must be at least 1")
+        config.ged_workers = args.component_workers
+
+    return config
 
 
 def parse_args():
@@ -43,14 +117,7 @@ Examples:
 
     parser.add_argument("generated", help="Path to generated workflow JSON file")
     parser.add_argument("ground_truth", help="Path to ground truth workflow JSON file")
-    parser.add_argument(
-        "--config", help="Path to custom configuration file (.yaml or .json)"
-    )
-    parser.add_argument(
-        "--preset",
-        choices=["strict", "standard", "lenient"],
-        help="Use built-in configuration preset",
-    )
+    add_config_arguments(parser)
     parser.add_argument(
         "--output-format",
         choices=["json", "summary"],
@@ -91,16 +158,51 @@ def load_workflow(path: str) -> Dict[str, Any]:
         sys.exit(1)
 
 
-def format_output_json(
+def build_metadata(
+    generated: Dict[str, Any],
+    ground_truth: Dict[str, Any],
+    g1: nx.DiGraph,
+    g2: nx.DiGraph,
+    config: WorkflowComparisonConfig,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """Describe the compared workflows and the configuration used"""
+    stats1 = graph_stats(g1)
+    stats2 = graph_stats(g2)
+
+    metadata: Dict[str, Any] = {
+        "generated_nodes": len(generated.get("nodes", [])),
+        "ground_truth_nodes": len(ground_truth.get("nodes", [])),
+        "generated_nodes_after_filter": stats1["node_count"],
+        "ground_truth_nodes_after_filter": stats2["node_count"],
+        "config_name": config.name,
+        "config_description": config.description,
+        "engine": config.ged_engine,
+    }
+
+    if verbose:
+        metadata["verbose_info"] = {
+            "generated_stats": stats1,
+            "ground_truth_stats": stats2,
+            "config_details": config.to_dict(),
+            "cost_function_calls": dict(cost_function_calls),
+        }
+
+    return metadata
+
+
+def build_output(
     result: Dict[str, Any], metadata: Dict[str, Any], verbose: bool = False
-) -> str:
-    """Format result as JSON"""
+) -> Dict[str, Any]:
+    """Build the JSON output object for a comparison result"""
     output: Dict[str, Any] = {
         "similarity_score": result["similarity_score"],
         "similarity_percentage": f"{result['similarity_score'] * 100:.1f}%",
         "edit_cost": result["edit_cost"],
         "max_possible_cost": result["max_possible_cost"],
         "top_edits": result["top_edits"],
+        "is_approximate": result["is_approximate"],
+        "edit_cost_lower_bound": result["edit_cost_lower_bound"],
         "metadata": metadata,
     }
 
@@ -113,7 +215,14 @@ def format_output_json(
             if "parameter_diff" in edit:
                 del edit["parameter_diff"]
 
-    return json.dumps(output, indent=2)
+    return output
+
+
+def format_output_json(
+    result: Dict[str, Any], metadata: Dict[str, Any], verbose: bool = False
+) -> str:
+    """Format result as JSON"""
+    return json.dumps(build_output(result, metadata, verbose), indent=2)
 
 
 def _format_parameter_diff(
@@ -191,6 +300,11 @@ def format_output_summary(
     lines.append(
         f"Edit Cost:          {result['edit_cost']:.1f} / {result['max_possible_cost']:.1f}"
     )
+    if result["is_approximate"]:
+        lines.append(
+            f"  Approximate ({metadata['engine']} engine): optimal cost is at least "
+            f"{result['edit_cost_lower_bound']:.1f}"
+        )
     lines.append("")
 
     # Configuration info
@@ -246,7 +360,7 @@ def format_output_summary(
 
     # Pass/Fail indicator
     lines.append("=" * 60)
-    if similarity_pct >= 70:
+    if result["similarity_score"] >= PASS_THRESHOLD:
         lines.append("✅ PASS - Workflows are sufficiently similar")
     else:
         lines.append("❌ FAIL - Workflows differ significantly")
@@ -265,12 +379,7 @@ def main():
 
     # Load configuration
     try:
-        if args.config:
-            config = load_config(args.config)
-        elif args.preset:
-            config = load_config(f"preset:{args.preset}")
-        else:
-            config = load_config()  # Default (standard)
+        config = resolve_config(args)
     except Exception as e:
         print(f"Error loading configuration: {e}", file=sys.stderr)
         sys.exit(1)
@@ -283,33 +392,15 @@ def main():
         print(f"Error building workflow graphs: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Get graph statistics
-    stats1 = graph_stats(g1)
-    stats2 = graph_stats(g2)
-
     # Calculate similarity
+    reset_cost_function_calls()
     try:
         result = calculate_graph_edit_distance(g1, g2, config)
     except Exception as e:
         print(f"Error calculating similarity: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Prepare metadata
-    metadata = {
-        "generated_nodes": len(generated.get("nodes", [])),
-        "ground_truth_nodes": len(ground_truth.get("nodes", [])),
-        "generated_nodes_after_filter": stats1["node_count"],
-        "ground_truth_nodes_after_filter": stats2["node_count"],
-        "config_name": config.name,
-        "config_description": config.description,
-    }
-
-    if args.verbose:
-        metadata["verbose_info"] = {
-            "generated_stats": stats1,
-            "ground_truth_stats": stats2,
-            "config_details": config.to_dict(),
-        }
+    metadata = build_metadata(generated, ground_truth, g1, g2, config, args.verbose)
 
     # Format and output result
     if args.output_format == "json":
@@ -3,13 +3,21 @@ Configuration loader for workflow comparison.
 Supports loading from YAML, JSON, and built-in presets.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Any, Set
 from pathlib import Path
 import yaml
 import json
 import re
 
+# Graph edit distance engines: exhaustive NetworkX search or bipartite assignment
+GED_ENGINES = ("exact", "bipartite")
+
+# Parameter decisions memoized per config, keyed by (node_type, param_path)
+PARAMETER_DECISION_CACHE_SIZE = 8192
+
 
 def _get_param_path_matching_pattern(pattern: str) -> str:
     """
@@ -27,6 +35,54 @@ def _get_param_path_matching_pattern(pattern: str) -> str:
     return regex_pattern
 
 
+@lru_cache(maxsize=None)
+def _compile_param_path_pattern(pattern: str) -> re.Pattern:
+    """Compile a glob-like parameter path pattern, once per pattern"""
+    return re.compile(f"^{_get_param_path_matching_pattern(pattern)}$")
+
+
+def _compile_param_path_patterns(
+    patterns: Iterable[str], named: bool = False
+) -> Optional[re.Pattern]:
+    """
+    Compile glob-like patterns into a single alternation regex.
+
+    Args:
+        patterns: Glob-like parameter path patterns
+        named: Wrap each pattern in a group named `p<index>`, so that
+            `match.lastgroup` tells which pattern matched first
+
+    Returns:
+        Combined pattern, or None if there are no patterns
+    """
+    alternatives = [
+        f"(?P<p{index}>{_get_param_path_matching_pattern(pattern)})"
+        if named
+        else f"(?:{_get_param_path_matching_pattern(pattern)})"
+        for index, pattern in enumerate(patterns)
+    ]
+    if not alternatives:
+        return None
+    return re.compile(f"^(?:{'|'.join(alternatives)})$")
+
+
+class _LRUCache(OrderedDict):
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, max_size: int = PARAMETER_DECISION_CACHE_SIZE):
+        super().__init__()
+        self.max_size = max_size
+
+    def get_or_compute(self, key: Any, compute) -> Any:
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        value = self[key] = compute()
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+        return value
+
+
 @dataclass
 class NodeIgnoreRule:
     """Rule for ignoring nodes during comparison"""
@@ -61,8 +117,7 @@ class ParameterComparisonRule:
 
     def matches_parameter(self, param_path: str) -> bool:
         """Check if this rule applies to a parameter path"""
-        regex_pattern = _get_param_path_matching_pattern(self.parameter)
-        return bool(re.match(f"^{regex_pattern}$", param_path))
+        return bool(_compile_param_path_pattern(self.parameter).match(param_path))
 
 
 @dataclass
@@ -136,12 +191,55 @@ class WorkflowComparisonConfig:
     ignored_connection_types: Set[str] = field(default_factory=set)
     equivalent_connection_types: List[List[str]] = field(default_factory=list)
 
+    # Graph edit distance search
+    ged_engine: str = "exact"
+    ged_timeout: Optional[float] = 10.0  # seconds, None searches exhaustively
+    ged_decompose: bool = False  # compare connected components separately
+    ged_workers: int = 1  # processes comparing components in parallel
+
     # Output config
     max_edits: int = 15
     group_by: str = "priority"
     include_explanations: bool = True
     include_suggestions: bool = True
 
+    # Compiled parameter matchers and memoized decisions, see compile_rules()
+    _ignored_node_type_matchers: Optional[Dict[str, Optional[re.Pattern]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _ignored_path_matcher: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _parameter_rule_matcher: Optional[re.Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _ignore_decisions: Optional[_LRUCache] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _rule_decisions: Optional[_LRUCache] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def compile_rules(self) -> None:
+        """
+        Compile parameter ignore and comparison patterns into combined matchers.
+
+        Runs when a config is loaded, or on first use. Call it again after
+        changing ignore or comparison rules of an already used config.
+        """
+        self._ignored_node_type_matchers = {
+            node_type: _compile_param_path_patterns(sorted(paths))
+            for node_type, paths in self.ignored_node_type_parameters.items()
+        }
+        self._ignored_path_matcher = _compile_param_path_patterns(
+            self.ignored_parameter_paths
+        )
+        self._parameter_rule_matcher = _compile_param_path_patterns(
+            [rule.parameter for rule in self.parameter_rules], named=True
+        )
+        self._ignore_decisions = _LRUCache(PARAMETER_DECISION_CACHE_SIZE)
+        self._rule_decisions = _LRUCache(PARAMETER_DECISION_CACHE_SIZE)
+
     def should_ignore_node(self, node: Dict) -> bool:
         """Check if node should be ignored"""
         # Check node type
@@ -157,33 +255,58 @@ class WorkflowComparisonConfig:
 
     def should_ignore_parameter(self, node_type: str, param_path: str) -> bool:
         """Check if parameter should be ignored"""
+        if self._ignore_decisions is None:
+            self.compile_rules()
+        assert self._ignore_decisions is not None
+
+        return self._ignore_decisions.get_or_compute(
+            (node_type, param_path),
+            lambda: self._match_ignored_parameter(node_type, param_path),
+        )
+
+    def _match_ignored_parameter(self, node_type: str, param_path: str) -> bool:
+        assert self._ignored_node_type_matchers is not None
+
         # Global parameters
         param_name = param_path.split(".")[-1]
         if param_name in self.ignored_global_parameters:
             return True
 
-        # Node type specific
+        # Node type specific, exact paths or wildcards
         if node_type in self.ignored_node_type_parameters:
             if param_path in self.ignored_node_type_parameters[node_type]:
                 return True
-            # Check wildcards
-            for ignored_path in self.ignored_node_type_parameters[node_type]:
-                if self._matches_path_pattern(param_path, ignored_path):
-                    return True
+            matcher = self._ignored_node_type_matchers.get(node_type)
+            if matcher is not None and matcher.match(param_path):
+                return True
 
         # Parameter path patterns
-        for pattern in self.ignored_parameter_paths:
-            if self._matches_path_pattern(param_path, pattern):
-                return True
+        if self._ignored_path_matcher is not None:
+            return bool(self._ignored_path_matcher.match(param_path))
 
         return False
 
     def get_parameter_rule(self, param_path: str) -> Optional[ParameterComparisonRule]:
-        """Get comparison rule for parameter"""
-        for rule in self.parameter_rules:
-            if rule.matches_parameter(param_path):
-                return rule
-        return None
+        """Get comparison rule for parameter, the first one matching"""
+        if self._rule_decisions is None:
+            self.compile_rules()
+        assert self._rule_decisions is not None
+
+        return self._rule_decisions.get_or_compute(
+            param_path, lambda: self._match_parameter_rule(param_path)
+        )
+
+    def _match_parameter_rule(
+        self, param_path: str
+    ) -> Optional[ParameterComparisonRule]:
+        if self._parameter_rule_matcher is None:
+            return None
+
+        match = self._parameter_rule_matcher.match(param_path)
+        if match is None or match.lastgroup is None:
+            return None
+
+        return self.parameter_rules[int(match.lastgroup[1:])]
 
     def get_exemption_penalty(
         self,
@@ -206,8 +329,7 @@ class WorkflowComparisonConfig:
     @staticmethod
     def _matches_path_pattern(path: str, pattern: str) -> bool:
         """Check if path matches pattern (supports ** and *)"""
-        regex_pattern = _get_param_path_matching_pattern(pattern)
-        return bool(re.match(f"^{regex_pattern}$", path))
+        return bool(_compile_param_path_pattern(pattern).match(path))
 
     def are_node_types_similar(self, type1: str, type2: str) -> bool:
         """Check if two node types are in the same similarity group"""
@@ -244,6 +366,12 @@ class WorkflowComparisonConfig:
                 },
             },
             "similarity_groups": self.similarity_groups,
+            "ged": {
+                "engine": self.ged_engine,
+                "timeout": self.ged_timeout,
+                "decompose": self.ged_decompose,
+                "workers": self.ged_workers,
+            },
             "max_edits": self.max_edits,
         }
 
@@ -335,6 +463,25 @@ class WorkflowComparisonConfig:
         )
         config.equivalent_connection_types = connections.get("equivalent_types", [])
 
+        # Graph edit distance search
+        ged = data.get("ged", {})
+        config.ged_engine = ged.get("engine", "exact")
+        if config.ged_engine not in GED_ENGINES:
+            raise ValueError(
+                f"ged.engine must be one of {', '.join(GED_ENGINES)}, got '{config.ged_engine}'"
+            )
+        config.ged_timeout = ged.get("timeout", 10.0)
+        if config.ged_timeout is not None and config.ged_timeout <= 0:
+            raise ValueError(
+                f"ged.timeout must be positive or null, got {config.ged_timeout}"
+            )
+        config.ged_decompose = bool(ged.get("decompose", False))
+        config.ged_workers = ged.get("workers", 1)
+        if not isinstance(config.ged_workers, int) or config.ged_workers < 1:
+            raise ValueError(
+                f"ged.workers must be a positive integer, got {config.ged_workers}"
+            )
+
         # Output config
         output = data.get("output", {})
         config.max_edits = output.get("max_edits", 15)
@@ -342,6 +489,8 @@ class WorkflowComparisonConfig:
         config.include_explanations = output.get("include_explanations", True)
         config.include_suggestions = output.get("include_suggestions", True)
 
+        config.compile_rules()
+
         return config
 
     @classmethod
@@ -4,9 +4,20 @@ Configuration-aware costs for node and edge operations.
 """
 
 import re
+from collections import Counter
 from typing import Dict, Any
+import networkx as nx
+import numpy as np
 from src.config_loader import WorkflowComparisonConfig, ParameterComparisonRule
 
+# Number of calls per cost function, for profiling comparisons
+cost_function_calls: Counter[str] = Counter()
+
+
+def reset_cost_function_calls() -> None:
+    """Reset the cost function call counters"""
+    cost_function_calls.clear()
+
 
 def normalize_expression(value: Any) -> Any:
     """
@@ -69,6 +80,8 @@ def node_substitution_cost(
     Returns:
         Cost value (0 = identical, higher = more different)
     """
+    cost_function_calls["node_substitution_cost"] += 1
+
     # Check for exemptions
     original_data = node1_data.get("parameters", "{}")
     exemption_penalty = config.get_exemption_penalty(original_data, "generated")
@@ -144,6 +157,8 @@ def node_deletion_cost(
     Returns:
         Cost value
     """
+    cost_function_calls["node_deletion_cost"] += 1
+
     # Check for exemptions
     original_data = node_data.get("parameters", "{}")
     exemption_penalty = config.get_exemption_penalty(original_data, "generated")
@@ -170,6 +185,8 @@ def node_insertion_cost(
     Returns:
         Cost value
     """
+    cost_function_calls["node_insertion_cost"] += 1
+
     # Check for exemptions
     original_data = node_data.get("parameters", "{}")
     exemption_penalty = config.get_exemption_penalty(original_data, "ground_truth")
@@ -182,6 +199,60 @@ def node_insertion_cost(
     return config.node_insertion_cost
 
 
+class NodeCostMatrix:
+    """
+    Node edit costs between two graphs, computed once per comparison.
+
+    The search, the bipartite engine and edit extraction all ask for the same
+    node costs repeatedly, and each substitution cost compares parameters
+    recursively. Costs are keyed by structural ID, which relabeled graphs
+    store on each node as `_structural_id`, so lookups accept the node
+    attribute dicts NetworkX passes to cost functions.
+    """
+
+    def __init__(
+        self, g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
+    ):
+        self.index1 = {node: i for i, node in enumerate(g1.nodes)}
+        self.index2 = {node: i for i, node in enumerate(g2.nodes)}
+
+        self.substitutions = np.array(
+            [
+                [
+                    node_substitution_cost(g1.nodes[u], g2.nodes[v], config)
+                    for v in g2.nodes
+                ]
+                for u in g1.nodes
+            ]
+        ).reshape(len(self.index1), len(self.index2))
+        self.deletions = [node_deletion_cost(g1.nodes[u], config) for u in g1.nodes]
+        self.insertions = [node_insertion_cost(g2.nodes[v], config) for v in g2.nodes]
+
+        self.lookups = 0
+
+    def substitution_cost(
+        self, node1_data: Dict[str, Any], node2_data: Dict[str, Any]
+    ) -> float:
+        """Cost of substituting a node of the first graph with one of the second"""
+        self.lookups += 1
+        return float(
+            self.substitutions[
+                self.index1[node1_data["_structural_id"]],
+                self.index2[node2_data["_structural_id"]],
+            ]
+        )
+
+    def deletion_cost(self, node_data: Dict[str, Any]) -> float:
+        """Cost of deleting a node of the first graph"""
+        self.lookups += 1
+        return self.deletions[self.index1[node_data["_structural_id"]]]
+
+    def insertion_cost(self, node_data: Dict[str, Any]) -> float:
+        """Cost of inserting a node of the second graph"""
+        self.lookups += 1
+        return self.insertions[self.index2[node_data["_structural_id"]]]
+
+
 def edge_substitution_cost(
     edge1_data: Dict[str, Any],
     edge2_data: Dict[str, Any],
@@ -262,6 +333,8 @@ def compare_parameters(
     Returns:
         Score representing parameter difference (higher = more different)
     """
+    cost_function_calls["compare_parameters"] += 1
+
     all_keys = set(params1.keys()) | set(params2.keys())
     diff_score = 0.0
 
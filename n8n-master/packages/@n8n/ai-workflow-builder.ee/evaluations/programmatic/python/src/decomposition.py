@@ -0,0 +1,311 @@
+"""
+Graph edit distance over the connected components of two workflows.
+
+The edit distance search is exponential in the number of nodes, but many
+workflows are several independent branches. Each weakly connected component
+(a sub-agent included, as its `ai_*` connections are edges too) is compared
+with every component of the other workflow by its bipartite edit path, and
+components are matched by solving an assignment problem over those costs.
+Only matched pairs are searched, in a pool of worker processes reused by
+every comparison if configured, sharing the time budget. Workflows whose components do not correspond are
+compared whole.
+
+Edit paths only pair nodes within matched components, so the combined path
+is valid but not necessarily optimal. Results are flagged approximate unless
+they meet the lower bound of the whole workflows.
+"""
+
+import dataclasses
+import itertools
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.bipartite import (
+    EdgeMatch,
+    bipartite_edit_path,
+    build_node_cost_matrix,
+    edit_path_lower_bound,
+    square_cost_matrix,
+)
+from src.config_loader import WorkflowComparisonConfig
+from src.cost_functions import NodeCostMatrix
+from src.similarity import (
+    _COST_EPSILON,
+    _calculate_max_cost,
+    _edge_match_function,
+    _relabeled,
+    _similarity_score,
+    calculate_graph_edit_distance,
+)
+from src.threshold import edit_cost_lower_bound
+
+# One pool per process, reused by every comparison with the same worker count
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def weakly_connected_components(graph: nx.DiGraph) -> List[nx.DiGraph]:
+    """
+    Split a graph into its weakly connected components.
+
+    Args:
+        graph: Workflow graph
+
+    Returns:
+        Component subgraphs, ordered by their first node name
+    """
+    return [
+        graph.subgraph(nodes).copy()
+        for nodes in sorted(nx.weakly_connected_components(graph), key=min)
+    ]
+
+
+def calculate_component_distance(
+    g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
+) -> Dict[str, Any]:
+    """
+    Calculate graph edit distance by comparing matched components.
+
+    Unmatched components are deleted or inserted whole. Every node and edge
+    belongs to exactly one compared pair, so the maximum costs of the pairs
+    add up to the maximum cost of the whole workflows.
+
+    The bipartite edit path of the whole workflows is computed before any
+    search. If it is cheaper than the pairs can possibly be, by their lower
+    bounds, the workflows are compared whole instead. If the searched pairs
+    still end up costlier, that path is returned, without searching again.
+
+    Args:
+        g1: First workflow graph (generated)
+        g2: Second workflow graph (ground truth)
+        config: Configuration with cost weights, ged_workers processes
+            compare the pairs
+
+    Returns:
+        Dictionary like calculate_graph_edit_distance, with:
+            - components: Number of component pairs compared, deletions and
+              insertions of whole components included
+    """
+    # Components are compared whole, they are not decomposed again
+    component_config = dataclasses.replace(config, ged_decompose=False)
+
+    g1_relabeled, g1_mapping = _relabeled(g1)
+    g2_relabeled, g2_mapping = _relabeled(g2)
+    components1 = weakly_connected_components(g1_relabeled)
+    components2 = weakly_connected_components(g2_relabeled)
+    if len(components1) <= 1 and len(components2) <= 1:
+        return calculate_graph_edit_distance(g1, g2, component_config)
+
+    # Node costs of the whole workflows price every pairing of components, and
+    # bound the cost of any edit path, including those pairing nodes across
+    # components
+    node_costs = NodeCostMatrix(g1_relabeled, g2_relabeled, config)
+    edge_match = _edge_match_function(config)
+    node_cost_matrix = build_node_cost_matrix(
+        g1_relabeled,
+        g2_relabeled,
+        node_costs.substitution_cost,
+        node_costs.deletion_cost,
+        node_costs.insertion_cost,
+    )
+    lower_bound = max(
+        edit_path_lower_bound(g1_relabeled, g2_relabeled, node_cost_matrix),
+        edit_cost_lower_bound(g1, g2, config),
+    )
+
+    m, n = len(components1), len(components2)
+    cost_matrix = square_cost_matrix(
+        np.array(
+            [
+                [_bipartite_cost(c1, c2, node_costs, edge_match) for c2 in components2]
+                for c1 in components1
+            ]
+        ).reshape(m, n),
+        np.array(
+            [
+                sum(node_costs.deletion_cost(data) for _, data in c1.nodes(data=True))
+                + c1.number_of_edges()
+                for c1 in components1
+            ]
+        ),
+        np.array(
+            [
+                sum(node_costs.insertion_cost(data) for _, data in c2.nodes(data=True))
+                + c2.number_of_edges()
+                for c2 in components2
+            ]
+        ),
+    )
+    rows, cols = linear_sum_assignment(cost_matrix)
+
+    # Components that do not correspond, e.g. a branch joined to another in
+    # one workflow only, are better compared whole. No pair search can beat
+    # its lower bound, so the whole path is compared with those.
+    whole_path = bipartite_edit_path(
+        g1_relabeled,
+        g2_relabeled,
+        node_cost_matrix,
+        node_costs.substitution_cost,
+        node_costs.deletion_cost,
+        node_costs.insertion_cost,
+        edge_match,
+    )
+    empty = nx.DiGraph()
+    pairs_lower_bound = sum(
+        _lower_bound(
+            components1[row] if row < m else empty,
+            components2[col] if col < n else empty,
+            node_costs,
+        )
+        for row, col in zip(rows, cols)
+        if row < m or col < n
+    )
+    if whole_path[2] < pairs_lower_bound - _COST_EPSILON:
+        return calculate_graph_edit_distance(g1, g2, component_config)
+
+    # Pairs are compared under the original node names, for the edit list
+    pairs = []
+    for row, col in zip(rows, cols):
+        if row >= m and col >= n:
+            continue
+        pairs.append(
+            (
+                g1.subgraph(g1_mapping[u] for u in components1[row]).copy()
+                if row < m
+                else empty,
+                g2.subgraph(g2_mapping[v] for v in components2[col]).copy()
+                if col < n
+                else empty,
+            )
+        )
+
+    results = _compare_pairs(pairs, component_config)
+
+    edit_cost = sum(result["edit_cost"] for result in results)
+
+    # The time budget is spent, so only the whole path found above is used
+    if whole_path[2] < edit_cost - _COST_EPSILON:
+        return calculate_graph_edit_distance(
+            g1, g2, dataclasses.replace(component_config, ged_engine="bipartite")
+        )
+
+    max_cost = _calculate_max_cost(g1, g2, config)
+    lower_bound = min(lower_bound, edit_cost)
+    top_edits = itertools.chain.from_iterable(result["top_edits"] for result in results)
+
+    return {
+        "similarity_score": _similarity_score(edit_cost, max_cost),
+        "edit_cost": edit_cost,
+        "max_possible_cost": max_cost,
+        "top_edits": sorted(top_edits, key=lambda x: x["cost"], reverse=True),
+        # Each pair may be optimal, yet a path pairing nodes across
+        # components could be cheaper
+        "is_approximate": edit_cost > lower_bound + _COST_EPSILON,
+        "edit_cost_lower_bound": lower_bound,
+        "fast_path": None,
+        "components": len(results),
+    }
+
+
+def _bipartite_cost(
+    c1: nx.DiGraph,
+    c2: nx.DiGraph,
+    node_costs: NodeCostMatrix,
+    edge_match: EdgeMatch,
+) -> float:
+    """Cost of the bipartite edit path between two relabeled components"""
+    node_cost_matrix = build_node_cost_matrix(
+        c1,
+        c2,
+        node_costs.substitution_cost,
+        node_costs.deletion_cost,
+        node_costs.insertion_cost,
+    )
+    return bipartite_edit_path(
+        c1,
+        c2,
+        node_cost_matrix,
+        node_costs.substitution_cost,
+        node_costs.deletion_cost,
+        node_costs.insertion_cost,
+        edge_match,
+    )[2]
+
+
+def _lower_bound(c1: nx.DiGraph, c2: nx.DiGraph, node_costs: NodeCostMatrix) -> float:
+    """Lower bound on the edit cost between two relabeled components"""
+    node_cost_matrix = build_node_cost_matrix(
+        c1,
+        c2,
+        node_costs.substitution_cost,
+        node_costs.deletion_cost,
+        node_costs.insertion_cost,
+    )
+    return edit_path_lower_bound(c1, c2, node_cost_matrix)
+
+
+def _compare_pairs(
+    pairs: List[tuple[nx.DiGraph, nx.DiGraph]], config: WorkflowComparisonConfig
+) -> List[Dict[str, Any]]:
+    """
+    Compare component pairs, in worker processes if there are several.
+
+    Each worker compares its pairs one after another, so the time budget is
+    split evenly between the pairs of the busiest worker. Batch and server
+    workers compare their pairs sequentially, they already run in parallel.
+    """
+    workers = max(1, min(config.ged_workers, len(pairs)))
+    if multiprocessing.parent_process() is not None:
+        workers = 1
+    if config.ged_timeout is not None:
+        config = dataclasses.replace(
+            config, ged_timeout=config.ged_timeout / math.ceil(len(pairs) / workers)
+        )
+
+    if workers == 1:
+        return [calculate_graph_edit_distance(c1, c2, config) for c1, c2 in pairs]
+
+    components1, components2 = zip(*pairs)
+    executor = _get_executor(config.ged_workers)
+    try:
+        return list(
+            executor.map(
+                calculate_graph_edit_distance,
+                components1,
+                components2,
+                itertools.repeat(config),
+            )
+        )
+    except BaseException:
+        # Also a KeyboardInterrupt, which must neither wait for the remaining
+        # comparisons nor leave them running
+        _discard_executor()
+        raise
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def _discard_executor() -> None:
+    global _executor
+    if _executor is None:
+        return
+
+    executor, _executor = _executor, None
+    # ProcessPoolExecutor has no public way to stop running calls before 3.14
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
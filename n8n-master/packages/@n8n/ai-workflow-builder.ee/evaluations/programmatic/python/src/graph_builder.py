@@ -2,6 +2,8 @@
 Build NetworkX graphs from n8n workflow JSON structures.
 """
 
+import hashlib
+import json
 import networkx as nx
 from typing import Dict, Any, Optional
 from src.config_loader import WorkflowComparisonConfig
@@ -220,3 +222,27 @@ def graph_stats(graph: nx.DiGraph) -> Dict[str, Any]:
         if graph.number_of_nodes() > 0
         else False,
     }
+
+
+def canonical_graph_hash(graph: nx.DiGraph) -> str:
+    """
+    Hash a workflow graph independently of node and edge insertion order.
+
+    Args:
+        graph: NetworkX graph
+
+    Returns:
+        Hex SHA-256 digest of the nodes, edges and their attributes
+    """
+    canonical = json.dumps(
+        {
+            "nodes": sorted(graph.nodes(data=True), key=lambda node: str(node[0])),
+            "edges": sorted(
+                graph.edges(data=True), key=lambda edge: (str(edge[0]), str(edge[1]))
+            ),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
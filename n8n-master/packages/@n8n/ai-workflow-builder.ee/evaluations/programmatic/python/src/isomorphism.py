@@ -0,0 +1,88 @@
+"""
+Edit paths for workflows that are isomorphic up to node names and parameters.
+
+A Weisfeiler-Lehman hash of node types and connection types cheaply rules out
+most non-isomorphic pairs. For the rest, a VF2 match of types and connections
+yields an edit path that only substitutes nodes and needs no edge edits.
+"""
+
+import itertools
+import warnings
+
+import networkx as nx
+from networkx.algorithms.isomorphism import DiGraphMatcher
+from typing import Any, Callable, Dict, List, Optional
+
+# Isomorphisms tried by VF2, each may pair nodes of the same type differently
+MAX_ISOMORPHISMS = 16
+WL_ITERATIONS = 3
+
+NodeSubstCost = Callable[[Dict[str, Any], Dict[str, Any]], float]
+EdgeMatch = Callable[[Dict[str, Any], Dict[str, Any]], bool]
+
+
+def weisfeiler_lehman_hash(graph: nx.DiGraph) -> str:
+    """Hash a graph by node types and connection types, ignoring names"""
+    # Hashes are only compared with each other, never stored, so the change of
+    # directed graph hashes between NetworkX versions does not matter
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="The hashes produced for directed")
+        return nx.weisfeiler_lehman_graph_hash(
+            graph,
+            node_attr="type",
+            edge_attr="connection_type",
+            iterations=WL_ITERATIONS,
+        )
+
+
+def isomorphic_edit_path(
+    g1: nx.DiGraph,
+    g2: nx.DiGraph,
+    node_subst_cost: NodeSubstCost,
+    edge_match: EdgeMatch,
+    target_cost: float = 0.0,
+) -> Optional[tuple[List[tuple], List[tuple], float]]:
+    """
+    Find the cheapest edit path among a few isomorphisms of two graphs.
+
+    Args:
+        g1, g2: Relabeled graphs
+        node_subst_cost: Node substitution cost function
+        edge_match: Edge equivalence function
+        target_cost: Stop at the first path this cheap, e.g. a lower bound
+
+    Returns:
+        Tuple of (node_edit_path, edge_edit_path, cost) in NetworkX format,
+        or None if the graphs are not isomorphic
+    """
+    if (
+        g1.number_of_nodes() != g2.number_of_nodes()
+        or g1.number_of_edges() != g2.number_of_edges()
+        or weisfeiler_lehman_hash(g1) != weisfeiler_lehman_hash(g2)
+    ):
+        return None
+
+    matcher = DiGraphMatcher(
+        g1,
+        g2,
+        node_match=lambda data1, data2: data1.get("type") == data2.get("type"),
+        edge_match=edge_match,
+    )
+
+    best_mapping = None
+    best_cost = float("inf")
+    for mapping in itertools.islice(matcher.isomorphisms_iter(), MAX_ISOMORPHISMS):
+        cost = sum(
+            node_subst_cost(g1.nodes[u], g2.nodes[v]) for u, v in mapping.items()
+        )
+        if cost < best_cost:
+            best_mapping, best_cost = mapping, cost
+        if best_cost <= target_cost:
+            break
+
+    if best_mapping is None:
+        return None
+
+    node_edit_path = list(best_mapping.items())
+    edge_edit_path = [((u, v), (best_mapping[u], best_mapping[v])) for u, v in g1.edges]
+    return node_edit_path, edge_edit_path, float(best_cost)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Long-lived workflow comparison server speaking JSON lines over stdin/stdout.
+
+Avoids paying interpreter startup, imports and configuration loading for
+every comparison. Requests are compared concurrently in worker processes,
+which keep loaded configurations, built graphs and results cached.
+
+Protocol, one JSON object per line:
+    request   {"id": "1", "generated": {...}, "ground_truth": {...},
+               "preset": "strict", "config": "path.yaml", "timeout": 30,
+               "verbose": false}
+    response  {"id": "1", "result": {...}}
+              {"id": "1", "error": "...", "error_type": "timeout"}
+
+Only "generated" and "ground_truth" are required. "result" has the same shape
+as the JSON output of compare_workflows. Responses are written in completion
+order, so clients match them to requests by id. The server exits once stdin
+is closed and all pending requests are answered.
+
+Options:
+    --workers N               Worker processes [default: CPU count]
+    --request-timeout SECONDS Default hard limit per request [default: 30]
+    --cache-size N            Graphs and results cached in memory per worker [default: 256]
+    --cache-dir PATH          Also cache graphs and results on disk, shared by workers
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+from src.batch import PairTimeoutError, time_limit
+from src.cache import ComparisonCache
+from src.compare_workflows import (
+    add_config_arguments,
+    build_metadata,
+    build_output,
+    resolve_config,
+)
+from src.config_loader import WorkflowComparisonConfig, load_config
+from src.cost_functions import reset_cost_function_calls
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+DEFAULT_CACHE_SIZE = 256
+CONFIG_CACHE_SIZE = 16
+
+# Workers are spawned, since forking a process with running threads may deadlock
+SERVER_CONTEXT = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class ServerOptions:
+    """Settings shared by all worker processes"""
+
+    default_config: WorkflowComparisonConfig
+    engine: Optional[str] = None
+    ged_timeout: Optional[float] = None
+    ged_decompose: bool = False
+    ged_workers: Optional[int] = None
+    cache_size: int = DEFAULT_CACHE_SIZE
+    cache_dir: Optional[Path] = None
+
+
+class RequestError(Exception):
+    """Raised for requests that cannot be compared"""
+
+    def __init__(self, message: str, error_type: str):
+        super().__init__(message)
+        self.error_type = error_type
+
+    def __reduce__(self):
+        # Travels back from worker processes, which pickle only `args` by default
+        return type(self), (str(self), self.error_type)
+
+
+# ========== Worker process ==========
+
+_options: Optional[ServerOptions] = None
+_configs: "OrderedDict[str, WorkflowComparisonConfig]" = OrderedDict()
+_cache: Optional[ComparisonCache] = None
+
+
+def _init_worker(options: ServerOptions) -> None:
+    global _options, _cache
+    # stdout carries the server's responses, keep anything printed while
+    # comparing out of it
+    sys.stdout = sys.stderr
+    _options = options
+    _configs.clear()
+    _cache = ComparisonCache(options.cache_dir, max_memory_entries=options.cache_size)
+
+
+def _get_config(config_source: Optional[str]) -> WorkflowComparisonConfig:
+    """Load a configuration once per worker, applying server-wide overrides"""
+    assert _options is not None
+    if config_source is None:
+        return _options.default_config
+
+    config = _configs.get(config_source)
+    if config is None:
+        config = load_config(config_source)
+        if _options.ged_timeout is not None:
+            config.ged_timeout = _options.ged_timeout
+        if _options.engine:
+            config.ged_engine = _options.engine
+        if _options.ged_decompose:
+            config.ged_decompose = True
+        if _options.ged_workers is not None:
+            config.ged_workers = _options.ged_workers
+
+        _configs[config_source] = config
+        if len(_configs) > CONFIG_CACHE_SIZE:
+            _configs.popitem(last=False)
+    else:
+        _configs.move_to_end(config_source)
+
+    return config
+
+
+def compare_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare the workflows of one validated request in a worker process.
+
+    Args:
+        request: Request with "generated", "ground_truth" and optional
+            "config_source", "timeout" and "verbose" keys
+
+    Returns:
+        Comparison output, as printed by compare_workflows
+
+    Raises:
+        RequestError: If the configuration cannot be loaded, the comparison
+            fails or exceeds the request timeout
+    """
+    try:
+        with time_limit(request.get("timeout")):
+            try:
+                config = _get_config(request.get("config_source"))
+            except Exception as e:
+                raise RequestError(f"Error loading configuration: {e}", "config")
+
+            assert _cache is not None
+            generated = request["generated"]
+            ground_truth = request["ground_truth"]
+            try:
+                reset_cost_function_calls()
+                result = _cache.compare(generated, ground_truth, config)
+                g1 = _cache.graph(generated, config)
+                g2 = _cache.graph(ground_truth, config)
+            except Exception as e:
+                raise RequestError(
+                    f"Error comparing workflows: {e}", "comparison_failed"
+                )
+
+            verbose = bool(request.get("verbose"))
+            metadata = build_metadata(generated, ground_truth, g1, g2, config, verbose)
+            return build_output(result, metadata, verbose)
+    except PairTimeoutError as e:
+        raise RequestError(str(e), "timeout")
+
+
+# ========== Server ==========
+
+
+def parse_request(
+    line: str, default_timeout: Optional[float]
+) -> tuple[Any, Dict[str, Any]]:
+    """
+    Parse and validate one request line.
+
+    Args:
+        line: JSON request line
+        default_timeout: Timeout for requests that do not set one
+
+    Returns:
+        Tuple of (request_id, worker_request)
+
+    Raises:
+        RequestError: If the request is malformed
+    """
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise RequestError(f"Invalid JSON: {e}", "invalid_request")
+
+    if not isinstance(request, dict):
+        raise RequestError("Request must be a JSON object", "invalid_request")
+
+    request_id = request.get("id")
+    for key in ("generated", "ground_truth"):
+        if not isinstance(request.get(key), dict):
+            raise RequestError(f"'{key}' must be a workflow object", "invalid_request")
+
+    config_source = None
+    if request.get("config"):
+        config_source = str(request["config"])
+    elif request.get("preset"):
+        config_source = f"preset:{request['preset']}"
+
+    timeout = request.get("timeout", default_timeout)
+    if timeout is not None and (
+        not isinstance(timeout, (int, float))
+        or isinstance(timeout, bool)
+        or timeout <= 0
+    ):
+        raise RequestError("'timeout' must be a positive number", "invalid_request")
+
+    return request_id, {
+        "generated": request["generated"],
+        "ground_truth": request["ground_truth"],
+        "config_source": config_source,
+        "timeout": timeout,
+        "verbose": request.get("verbose", False),
+    }
+
+
+class ComparisonServer:
+    """Dispatches JSON line requests to worker processes and writes responses."""
+
+    def __init__(
+        self,
+        options: ServerOptions,
+        output: TextIO,
+        workers: Optional[int] = None,
+        request_timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+    ):
+        self.options = options
+        self.output = output
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.output_lock = threading.Lock()
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=SERVER_CONTEXT,
+            initializer=_init_worker,
+            initargs=(self.options,),
+        )
+
+    def handle_line(self, line: str) -> None:
+        """Submit one request line, its response is written once it completes"""
+        if not line.strip():
+            return
+
+        try:
+            request_id, request = parse_request(line, self.request_timeout)
+        except RequestError as e:
+            request_id = _read_request_id(line)
+            self._respond(request_id, error=str(e), error_type=e.error_type)
+            return
+
+        try:
+            future = self.executor.submit(compare_request, request)
+        except BrokenProcessPool:
+            # A worker died, e.g. out of memory. Replace the pool and retry once.
+            self.executor.shutdown(wait=False)
+            self.executor = self._create_executor()
+            future = self.executor.submit(compare_request, request)
+
+        future.add_done_callback(lambda done: self._on_done(request_id, done))
+
+    def _on_done(self, request_id: Any, future: Future) -> None:
+        try:
+            result = future.result()
+        except RequestError as e:
+            self._respond(request_id, error=str(e), error_type=e.error_type)
+        except Exception as e:
+            self._respond(
+                request_id, error=f"{type(e).__name__}: {e}", error_type="internal"
+            )
+        else:
+            self._respond(request_id, result=result)
+
+    def _respond(self, request_id: Any, **fields: Any) -> None:
+        line = json.dumps({"id": request_id, **fields})
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def serve(self, input: TextIO) -> None:
+        """Handle request lines until input is closed, then drain pending requests"""
+        try:
+            for line in input:
+                self.handle_line(line)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def _read_request_id(line: str) -> Any:
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return request.get("id") if isinstance(request, dict) else None
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Serve n8n workflow comparisons over stdin/stdout JSON lines",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve with the standard configuration as default
+  python -m src.server
+
+  # Four workers, strict preset unless a request selects another, 60s per request
+  python -m src.server --workers 4 --preset strict --request-timeout 60
+
+  # One comparison
+  echo '{"id": 1, "generated": {...}, "ground_truth": {...}}' | python -m src.server
+        """,
+    )
+
+    add_config_arguments(parser)
+    parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=DEFAULT_REQUEST_TIMEOUT,
+        help="Default hard time limit in seconds per request (default: 30)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Number of graphs and of results cached in memory per worker "
+        "(default: 256)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Also cache graphs and results in this directory, shared by workers",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+
+    try:
+        config = resolve_config(args)
+    except Exception as e:
+        print(f"Error loading configuration: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.request_timeout <= 0:
+        print("Error: --request-timeout must be positive", file=sys.stderr)
+        sys.exit(1)
+
+    options = ServerOptions(
+        default_config=config,
+        engine=args.engine,
+        ged_timeout=args.timeout,
+        ged_decompose=args.decompose,
+        ged_workers=args.component_workers,
+        cache_size=args.cache_size,
+        cache_dir=args.cache_dir,
+    )
+    server = ComparisonServer(options, sys.stdout, args.workers, args.request_timeout)
+    server.serve(sys.stdin)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted by user", file=sys.stderr)
+        sys.exit(130)
@@ -2,10 +2,21 @@
 Calculate workflow similarity using graph edit distance.
 """
 
+import sys
+import time
+import weakref
 import networkx as nx
 from typing import Dict, List, Any, Optional
+from src.bipartite import (
+    bipartite_edit_path,
+    build_node_cost_matrix,
+    edit_path_lower_bound,
+)
 from src.config_loader import WorkflowComparisonConfig
+from src.graph_builder import canonical_graph_hash
+from src.isomorphism import isomorphic_edit_path
 from src.cost_functions import (
+    NodeCostMatrix,
     node_substitution_cost,
     node_deletion_cost,
     node_insertion_cost,
@@ -17,7 +28,10 @@ from src.cost_functions import (
 
 
 def calculate_graph_edit_distance(
-    g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
+    g1: nx.DiGraph,
+    g2: nx.DiGraph,
+    config: WorkflowComparisonConfig,
+    max_edit_cost: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Calculate graph edit distance with custom cost functions.
@@ -26,6 +40,10 @@ def calculate_graph_edit_distance(
         g1: First workflow graph (generated)
         g2: Second workflow graph (ground truth)
         config: Configuration with cost weights
+        max_edit_cost: Only decide whether the edit cost is within this
+            budget, e.g. for a similarity threshold. The search is skipped
+            once the answer is known and otherwise stops at the first path
+            within the budget, so the result may be approximate.
 
     Returns:
         Dictionary with:
@@ -33,6 +51,16 @@ def calculate_graph_edit_distance(
             - edit_cost: Total cost of edits
             - max_possible_cost: Theoretical maximum cost
             - top_edits: List of most important edit operations
+            - is_approximate: True if the edit path is not proven optimal,
+              because the search ran out of time or the bipartite engine
+              was used
+            - edit_cost_lower_bound: Lower bound on the optimal edit cost
+              (equal to edit_cost when the result is exact)
+            - fast_path: How the edit search was avoided, if it was:
+              "identical", "isomorphic", "lower_bound", "over_budget" or
+              "within_budget"
+            - components: With config.ged_decompose, see
+              calculate_component_distance
     """
     # Handle empty graphs
     if g1.number_of_nodes() == 0 and g2.number_of_nodes() == 0:
@@ -41,109 +69,220 @@ def calculate_graph_edit_distance(
             "edit_cost": 0.0,
             "max_possible_cost": 0.0,
             "top_edits": [],
+            "is_approximate": False,
+            "edit_cost_lower_bound": 0.0,
+            "fast_path": "identical",
         }
 
     # Relabel graphs to use structural IDs instead of node names
     # This ensures nodes are matched by type/position, not by name
-    g1_relabeled, g1_mapping = _relabel_graph_by_structure(g1)
-    g2_relabeled, g2_mapping = _relabel_graph_by_structure(g2)
-
-    # Create cost function closures with config
-    # NetworkX passes node ATTRIBUTE DICTS, not node names
-    def node_subst_cost(n1_attrs, n2_attrs):
-        return node_substitution_cost(n1_attrs, n2_attrs, config)
-
-    def node_del_cost(n_attrs):
-        return node_deletion_cost(n_attrs, config)
-
-    def node_ins_cost(n_attrs):
-        return node_insertion_cost(n_attrs, config)
+    g1_relabeled, g1_mapping = _relabeled(g1)
+    g2_relabeled, g2_mapping = _relabeled(g2)
+
+    # Identical graphs are relabeled identically and need no edits, unless
+    # exemptions put a price on substituting a node with itself
+    if canonical_graph_hash(g1) == canonical_graph_hash(g2) and all(
+        node_substitution_cost(g1_relabeled.nodes[n], g2_relabeled.nodes[n], config)
+        == 0
+        for n in g1_relabeled
+    ):
+        return {
+            "similarity_score": 1.0,
+            "edit_cost": 0.0,
+            "max_possible_cost": _calculate_max_cost(g1, g2, config),
+            "top_edits": [],
+            "is_approximate": False,
+            "edit_cost_lower_bound": 0.0,
+            "fast_path": "identical",
+        }
 
-    # Edge match function - returns True if edges are equivalent
-    # This is better than cost functions for preventing false positives
-    def edge_match(e1_attrs, e2_attrs):
-        """Check if two edges match (same connection type or equivalent)"""
-        conn_type1 = e1_attrs.get("connection_type", "main")
-        conn_type2 = e2_attrs.get("connection_type", "main")
+    # Workflows of several branches are compared branch by branch, threshold
+    # checks need no edit path and compare them whole
+    if config.ged_decompose and max_edit_cost is None:
+        # Imported here, decomposition compares components with this function
+        from src.decomposition import calculate_component_distance
 
-        # Exact match
-        if conn_type1 == conn_type2:
-            return True
+        return calculate_component_distance(g1, g2, config)
 
-        # Check for equivalent types in config
-        for equiv_group in config.equivalent_connection_types:
-            if conn_type1 in equiv_group and conn_type2 in equiv_group:
-                return True
+    edge_match = _edge_match_function(config)
 
-        return False
+    is_approximate = False
+    lower_bound = 0.0
+    fast_path = None
 
-    # Calculate GED using NetworkX
-    # Note: This can be slow for large graphs, but workflow graphs are typically small
+    # Both engines start from the bipartite (assignment-based) edit path,
+    # the exact engine then searches for cheaper paths using NetworkX
     try:
-        # Use optimize_edit_paths with edge_match instead of edge cost functions
-        # This prevents false positive edge insertions/deletions
-        edit_path_generator = nx.optimize_edit_paths(
+        # Compute all node costs once, the search and the edit extraction
+        # look them up by structural ID
+        # NetworkX passes node ATTRIBUTE DICTS, not node names
+        node_costs = NodeCostMatrix(g1_relabeled, g2_relabeled, config)
+        node_subst_cost = node_costs.substitution_cost
+        node_del_cost = node_costs.deletion_cost
+        node_ins_cost = node_costs.insertion_cost
+
+        node_cost_matrix = build_node_cost_matrix(
+            g1_relabeled, g2_relabeled, node_subst_cost, node_del_cost, node_ins_cost
+        )
+        best_edit_path = bipartite_edit_path(
             g1_relabeled,
             g2_relabeled,
-            node_subst_cost=node_subst_cost,
-            node_del_cost=node_del_cost,
-            node_ins_cost=node_ins_cost,
-            edge_match=edge_match,
-            upper_bound=None,  # Calculate exact
+            node_cost_matrix,
+            node_subst_cost,
+            node_del_cost,
+            node_ins_cost,
+            edge_match,
+        )
+        lower_bound = edit_path_lower_bound(
+            g1_relabeled, g2_relabeled, node_cost_matrix
         )
+        search_completed = False
 
-        # Get the best (first) edit path
-        best_edit_path = None
-        for node_edit_path, edge_edit_path, cost in edit_path_generator:
-            best_edit_path = (node_edit_path, edge_edit_path, cost)
-            break  # Take the first (best) path
-
-        if not best_edit_path:
-            # Fallback to basic calculation
-            edit_cost = _calculate_basic_edit_cost(g1, g2, config)
-            node_edit_path = []
-            edge_edit_path = []
+        # A path meeting the lower bound is optimal, there is nothing to search
+        if best_edit_path[2] <= lower_bound + _COST_EPSILON:
+            fast_path = "lower_bound"
         else:
-            node_edit_path, edge_edit_path, edit_cost = best_edit_path
-
-        # Extract and rank edit operations
-        # Use the actual edit path from NetworkX if available
-        if best_edit_path:
-            edit_ops = _extract_operations_from_path(
-                node_edit_path,
-                edge_edit_path,
+            # Workflows that only differ in names or parameters are isomorphic,
+            # their cheapest isomorphism usually meets the lower bound
+            isomorphic_path = isomorphic_edit_path(
                 g1_relabeled,
                 g2_relabeled,
-                config,
-                g1_mapping,
-                g2_mapping,
+                node_subst_cost,
+                edge_match,
+                target_cost=lower_bound + _COST_EPSILON,
             )
+            if isomorphic_path is not None and isomorphic_path[2] < best_edit_path[2]:
+                best_edit_path = isomorphic_path
+                if best_edit_path[2] <= lower_bound + _COST_EPSILON:
+                    fast_path = "isomorphic"
+
+        # The budget is decided if no path can be within it, or one already is
+        if fast_path is None and max_edit_cost is not None:
+            if lower_bound > max_edit_cost + _COST_EPSILON:
+                fast_path = "over_budget"
+            elif best_edit_path[2] <= max_edit_cost + _COST_EPSILON:
+                fast_path = "within_budget"
+
+        if config.ged_engine == "exact" and fast_path is None:
+            # Use optimize_edit_paths with edge_match instead of edge cost functions
+            # This prevents false positive edge insertions/deletions
+            # The search is exponential in the number of nodes, so it runs
+            # under the configured time budget
+            edit_path_generator = nx.optimize_edit_paths(
+                g1_relabeled,
+                g2_relabeled,
+                node_subst_cost=node_subst_cost,
+                node_del_cost=node_del_cost,
+                node_ins_cost=node_ins_cost,
+                edge_match=edge_match,
+                # Only paths at most as costly as the bipartite one, or within
+                # the budget, are explored
+                upper_bound=(
+                    best_edit_path[2] if max_edit_cost is None else max_edit_cost
+                )
+                + _COST_EPSILON,
+                timeout=config.ged_timeout,
+            )
+
+            # Each yielded path is cheaper than the previous one, so keep the last
+            started_at = time.perf_counter()
+            stopped_at_budget = False
+            for node_edit_path, edge_edit_path, cost in edit_path_generator:
+                if cost < best_edit_path[2]:
+                    best_edit_path = (node_edit_path, edge_edit_path, cost)
+                # Any path within the budget decides it
+                if max_edit_cost is not None:
+                    stopped_at_budget = True
+                    break
+
+            # The search otherwise only stops early when it runs out of time
+            search_completed = not stopped_at_budget and (
+                config.ged_timeout is None
+                or time.perf_counter() - started_at < config.ged_timeout
+            )
+
+        over_budget = False
+        if (
+            max_edit_cost is not None
+            and best_edit_path[2] > max_edit_cost + _COST_EPSILON
+        ):
+            over_budget = True
+            # A completed search limited to the budget proves that no path
+            # within the budget exists, even though it found none
+            if search_completed:
+                lower_bound = max(lower_bound, max_edit_cost)
+
+        # Otherwise the path is only known to be optimal if it meets the bound
+        meets_bound = best_edit_path[2] <= lower_bound + _COST_EPSILON
+        if (search_completed and not over_budget) or meets_bound:
+            lower_bound = best_edit_path[2]
         else:
-            edit_ops = []
+            is_approximate = True
+
+        node_edit_path, edge_edit_path, edit_cost = best_edit_path
+
+        # Extract and rank edit operations
+        edit_ops = _extract_operations_from_path(
+            node_edit_path,
+            edge_edit_path,
+            g1_relabeled,
+            g2_relabeled,
+            config,
+            g1_mapping,
+            g2_mapping,
+            node_costs,
+        )
     except Exception as e:
         # Fallback if NetworkX GED fails
-        print(f"Warning: GED calculation failed, using fallback: {e}")
+        print(f"Warning: GED calculation failed, using fallback: {e}", file=sys.stderr)
         edit_cost = _calculate_basic_edit_cost(g1, g2, config)
         edit_ops = []
+        is_approximate = True
+        lower_bound = 0.0
+        fast_path = None
 
     # Calculate theoretical maximum cost
     max_cost = _calculate_max_cost(g1, g2, config)
 
-    # Avoid division by zero
-    if max_cost == 0:
-        similarity_score = 1.0 if edit_cost == 0 else 0.0
-    else:
-        # Similarity score: 1 - (cost / max_cost)
-        similarity_score = max(0.0, min(1.0, 1.0 - (edit_cost / max_cost)))
-
     return {
-        "similarity_score": similarity_score,
+        "similarity_score": _similarity_score(edit_cost, max_cost),
         "edit_cost": edit_cost,
         "max_possible_cost": max_cost,
         "top_edits": sorted(edit_ops, key=lambda x: x["cost"], reverse=True),
+        "is_approximate": is_approximate,
+        "edit_cost_lower_bound": min(lower_bound, edit_cost),
+        "fast_path": fast_path,
     }
 
 
+# Tolerance when comparing path costs summed in different orders
+_COST_EPSILON = 1e-9
+
+
+def _edge_match_function(config: WorkflowComparisonConfig):
+    """Build the edge equivalence function of a configuration"""
+
+    # Edge match function - returns True if edges are equivalent
+    # This is better than cost functions for preventing false positives
+    def edge_match(e1_attrs, e2_attrs):
+        """Check if two edges match (same connection type or equivalent)"""
+        conn_type1 = e1_attrs.get("connection_type", "main")
+        conn_type2 = e2_attrs.get("connection_type", "main")
+
+        # Exact match
+        if conn_type1 == conn_type2:
+            return True
+
+        # Check for equivalent types in config
+        for equiv_group in config.equivalent_connection_types:
+            if conn_type1 in equiv_group and conn_type2 in equiv_group:
+                return True
+
+        return False
+
+    return edge_match
+
+
 def _calculate_basic_edit_cost(
     g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
 ) -> float:
@@ -220,6 +359,14 @@ def _calculate_max_cost(
     return delete_cost + insert_cost
 
 
+def _similarity_score(edit_cost: float, max_cost: float) -> float:
+    """Similarity score: 1 - (cost / max_cost), clamped to 0-1"""
+    # Avoid division by zero
+    if max_cost == 0:
+        return 1.0 if edit_cost == 0 else 0.0
+    return max(0.0, min(1.0, 1.0 - (edit_cost / max_cost)))
+
+
 def _extract_operations_from_path(
     node_edit_path: List[tuple],
     edge_edit_path: List[tuple],
@@ -228,6 +375,7 @@ def _extract_operations_from_path(
     config: WorkflowComparisonConfig,
     g1_name_mapping: Dict[str, str],
     g2_name_mapping: Dict[str, str],
+    node_costs: Optional[NodeCostMatrix] = None,
 ) -> List[Dict[str, Any]]:
     """
     Extract edit operations from NetworkX's edit path.
@@ -241,12 +389,28 @@ def _extract_operations_from_path(
         g1, g2: Relabeled graphs
         config: Configuration
         g1_name_mapping, g2_name_mapping: Mappings to original names
+        node_costs: Precomputed node costs of the comparison, if available
 
     Returns:
         List of edit operations with descriptions and costs
     """
     operations = []
 
+    if node_costs is not None:
+        subst_cost = node_costs.substitution_cost
+        del_cost = node_costs.deletion_cost
+        ins_cost = node_costs.insertion_cost
+    else:
+
+        def subst_cost(node1_data, node2_data):
+            return node_substitution_cost(node1_data, node2_data, config)
+
+        def del_cost(node_data):
+            return node_deletion_cost(node_data, config)
+
+        def ins_cost(node_data):
+            return node_insertion_cost(node_data, config)
+
     # Helper to get display name
     def get_display_name(
         node_id: str, mapping: Dict[str, str], graph: nx.DiGraph
@@ -261,7 +425,7 @@ def _extract_operations_from_path(
             # Node insertion (v in g2 is inserted)
             node_data = g2.nodes[v]
             display_name = get_display_name(v, g2_name_mapping, g2)
-            cost = node_insertion_cost(node_data, config)
+            cost = ins_cost(node_data)
             if cost > 0:
                 operations.append(
                     {
@@ -278,7 +442,7 @@ def _extract_operations_from_path(
             # Node deletion (u in g1 is deleted)
             node_data = g1.nodes[u]
             display_name = get_display_name(u, g1_name_mapping, g1)
-            cost = node_deletion_cost(node_data, config)
+            cost = del_cost(node_data)
             if cost > 0:
                 operations.append(
                     {
@@ -296,7 +460,7 @@ def _extract_operations_from_path(
             node1_data = g1.nodes[u]
             node2_data = g2.nodes[v]
             display_name = get_display_name(u, g1_name_mapping, g1)
-            cost = node_substitution_cost(node1_data, node2_data, config)
+            cost = subst_cost(node1_data, node2_data)
             if cost > 0:
                 type1 = node1_data.get("type", "unknown")
                 type2 = node2_data.get("type", "unknown")
@@ -418,6 +582,19 @@ def _determine_priority(
         return "minor"
 
 
+# Relabelings of the graphs compared so far. Cached graphs are compared many
+# times, and graphs are not modified once built.
+_relabelings: "weakref.WeakKeyDictionary[nx.DiGraph, tuple[nx.DiGraph, Dict[str, str]]]" = weakref.WeakKeyDictionary()
+
+
+def _relabeled(graph: nx.DiGraph) -> tuple[nx.DiGraph, Dict[str, str]]:
+    """Relabel a graph by structure once per graph object"""
+    relabeling = _relabelings.get(graph)
+    if relabeling is None:
+        relabeling = _relabelings[graph] = _relabel_graph_by_structure(graph)
+    return relabeling
+
+
 def _relabel_graph_by_structure(graph: nx.DiGraph) -> tuple[nx.DiGraph, Dict[str, str]]:
     """
     Relabel graph nodes using structural IDs instead of names.
@@ -486,6 +663,8 @@ def _relabel_graph_by_structure(graph: nx.DiGraph) -> tuple[nx.DiGraph, Dict[str
     for new_label, original_name in reverse_mapping.items():
         if new_label in relabeled.nodes:
             relabeled.nodes[new_label]["_original_name"] = original_name
+            # Lets cost lookups identify nodes from their attribute dicts
+            relabeled.nodes[new_label]["_structural_id"] = new_label
             # Add a normalized name hash to help with matching nodes of the same type
             # Normalize by replacing smart quotes with regular quotes for comparison
             # U+2018 (') -> U+0027 ('), U+2019 (') -> U+0027 (')
@@ -0,0 +1,177 @@
+"""
+Similarity threshold checks for ranking workloads.
+
+Best-of-N selection only needs to know whether a candidate reaches a
+similarity threshold. A threshold is an edit cost budget, and a cheap lower
+bound on the edit cost rules out most hopeless candidates before any
+parameters are compared or edit paths searched.
+"""
+
+import networkx as nx
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from src.config_loader import WorkflowComparisonConfig
+from src.cost_functions import node_deletion_cost, node_insertion_cost
+from src.similarity import _calculate_max_cost, calculate_graph_edit_distance
+
+# Tolerance when comparing costs with the budget
+_COST_EPSILON = 1e-9
+
+
+def edit_cost_lower_bound(
+    g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
+) -> float:
+    """
+    Calculate a cheap admissible lower bound on the edit cost.
+
+    Runs in O(n log n), without comparing parameters:
+    - Nodes of a type that outnumber that type in the other graph must be
+      deleted, inserted or substituted with another type, at the configured
+      costs (trigger mismatches included).
+    - Every edge edit changes one out-degree and one in-degree, so edge edits
+      cost at least the distance between the sorted degree sequences.
+
+    Args:
+        g1: First workflow graph (generated)
+        g2: Second workflow graph (ground truth)
+        config: Configuration with cost weights
+
+    Returns:
+        Lower bound on the edit_cost of calculate_graph_edit_distance
+    """
+    return _node_cost_lower_bound(g1, g2, config) + _edge_cost_lower_bound(g1, g2)
+
+
+def compare_with_threshold(
+    g1: nx.DiGraph,
+    g2: nx.DiGraph,
+    config: WorkflowComparisonConfig,
+    min_similarity: float,
+) -> Dict[str, Any]:
+    """
+    Decide whether two workflows reach a similarity threshold.
+
+    Candidates whose lower bound exceeds the edit cost budget are rejected
+    without an edit distance calculation. Others are compared, with the
+    search limited to edit paths within the budget.
+
+    Args:
+        g1: First workflow graph (generated)
+        g2: Second workflow graph (ground truth)
+        config: Configuration with cost weights
+        min_similarity: Similarity threshold, 0-1
+
+    Returns:
+        Dictionary with:
+            - meets_threshold: True if the similarity reaches min_similarity
+            - pruned: True if the candidate was rejected by the lower bound
+            - similarity_upper_bound: Highest similarity the pair could have
+            - edit_cost_lower_bound, max_possible_cost
+            - result: Result of calculate_graph_edit_distance, None if pruned
+    """
+    max_cost = _calculate_max_cost(g1, g2, config)
+    budget = (1.0 - min_similarity) * max_cost
+    lower_bound = edit_cost_lower_bound(g1, g2, config)
+
+    if max_cost > 0 and lower_bound > budget + _COST_EPSILON:
+        return {
+            "meets_threshold": False,
+            "pruned": True,
+            "similarity_upper_bound": max(0.0, 1.0 - lower_bound / max_cost),
+            "edit_cost_lower_bound": lower_bound,
+            "max_possible_cost": max_cost,
+            "result": None,
+        }
+
+    result = calculate_graph_edit_distance(g1, g2, config, max_edit_cost=budget)
+    lower_bound = max(lower_bound, result["edit_cost_lower_bound"])
+
+    return {
+        "meets_threshold": result["similarity_score"] >= min_similarity - _COST_EPSILON,
+        "pruned": False,
+        "similarity_upper_bound": (
+            max(0.0, 1.0 - lower_bound / max_cost) if max_cost > 0 else 1.0
+        ),
+        "edit_cost_lower_bound": lower_bound,
+        "max_possible_cost": max_cost,
+        "result": result,
+    }
+
+
+def _node_cost_lower_bound(
+    g1: nx.DiGraph, g2: nx.DiGraph, config: WorkflowComparisonConfig
+) -> float:
+    """
+    Price the nodes that cannot be substituted with a node of the same type.
+
+    A substitution across types is charged half to each node, so every node
+    is charged at most what its own edit costs: deletion or half a cross-type
+    substitution in g1, insertion or half the cheapest cross-type
+    substitution in g2.
+    """
+    cross_costs = [_cross_type_cost(data, config) for _, data in g1.nodes(data=True)]
+    min_cross_cost = min(cross_costs, default=float("inf"))
+
+    charges1: Dict[str, List[float]] = defaultdict(list)
+    for (_, data), cross_cost in zip(g1.nodes(data=True), cross_costs):
+        charges1[data.get("type", "")].append(
+            min(node_deletion_cost(data, config), cross_cost / 2)
+        )
+
+    charges2: Dict[str, List[float]] = defaultdict(list)
+    for _, data in g2.nodes(data=True):
+        charges2[data.get("type", "")].append(
+            min(node_insertion_cost(data, config), min_cross_cost / 2)
+        )
+
+    bound = 0.0
+    for charges, other in ((charges1, charges2), (charges2, charges1)):
+        for node_type, type_charges in charges.items():
+            excess = len(type_charges) - len(other.get(node_type, []))
+            if excess > 0:
+                bound += sum(sorted(type_charges)[:excess])
+
+    return bound
+
+
+def _cross_type_cost(data: Dict[str, Any], config: WorkflowComparisonConfig) -> float:
+    """Cheapest cost of substituting a g1 node with a node of another type"""
+    exemption_penalty = config.get_exemption_penalty(
+        data.get("parameters", "{}"), "generated"
+    )
+    if exemption_penalty is not None:
+        return exemption_penalty
+
+    if data.get("is_trigger", False):
+        return config.node_substitution_trigger
+
+    node_type = data.get("type", "")
+    costs = [config.node_substitution_different_type, config.node_substitution_trigger]
+    if any(node_type in types for types in config.similarity_groups.values()):
+        costs.append(config.node_substitution_similar_type)
+    return min(costs)
+
+
+def _edge_cost_lower_bound(g1: nx.DiGraph, g2: nx.DiGraph) -> float:
+    """Count the edge edits needed to match out-degrees, or in-degrees"""
+    return float(
+        max(
+            _degree_sequence_distance(
+                [degree for _, degree in g1.out_degree()],
+                [degree for _, degree in g2.out_degree()],
+            ),
+            _degree_sequence_distance(
+                [degree for _, degree in g1.in_degree()],
+                [degree for _, degree in g2.in_degree()],
+            ),
+        )
+    )
+
+
+def _degree_sequence_distance(degrees1: List[int], degrees2: List[int]) -> int:
+    """L1 distance of the sorted sequences, deleted or inserted nodes count as 0"""
+    length = max(len(degrees1), len(degrees2))
+    padded1 = sorted(degrees1 + [0] * (length - len(degrees1)))
+    padded2 = sorted(degrees2 + [0] * (length - len(degrees2)))
+    return sum(abs(d1 - d2) for d1, d2 in zip(padded1, padded2))
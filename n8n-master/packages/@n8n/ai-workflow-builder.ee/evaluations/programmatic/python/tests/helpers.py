@@ -0,0 +1,56 @@
+"""
+Workflows shared by tests.
+"""
+
+import json
+from pathlib import Path
+
+EXAMPLES = Path(__file__).parent.parent / "example_workflows"
+
+
+def load_example(name: str) -> dict:
+    """Load a workflow from the example_workflows directory"""
+    return json.loads((EXAMPLES / name).read_text())
+
+
+def large_workflow(node_count: int, types: list) -> dict:
+    """Build a binary tree of nodes below a trigger, cycling through `types`"""
+    nodes = [{"name": "Trigger", "type": "n8n-nodes-base.webhook", "parameters": {}}]
+    connections = {}
+    for i in range(node_count):
+        nodes.append(
+            {"name": f"Node {i}", "type": types[i % len(types)], "parameters": {}}
+        )
+        source = "Trigger" if i == 0 else f"Node {i // 2}"
+        connections.setdefault(source, {"main": [[]]})["main"][0].append(
+            {"node": f"Node {i}", "type": "main", "index": 0}
+        )
+    return {"nodes": nodes, "connections": connections}
+
+
+def chain_workflow(node_count: int, types: list) -> dict:
+    """Build a linear workflow of `node_count` nodes cycling through `types`"""
+    nodes = [
+        {
+            "id": "0",
+            "name": "Trigger",
+            "type": "n8n-nodes-base.webhook",
+            "parameters": {},
+        }
+    ]
+    connections = {}
+    previous = "Trigger"
+    for i in range(node_count):
+        name = f"Node {i}"
+        nodes.append(
+            {
+                "id": str(i + 1),
+                "name": name,
+                "type": types[i % len(types)],
+                "parameters": {"value": i % 3},
+            }
+        )
+        connections[previous] = {"main": [[{"node": name, "type": "main", "index": 0}]]}
+        previous = name
+
+    return {"name": "Chain", "nodes": nodes, "connections": connections}
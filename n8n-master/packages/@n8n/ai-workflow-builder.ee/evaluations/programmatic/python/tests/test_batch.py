@@ -0,0 +1,148 @@
+"""
+Tests for batch module.
+"""
+
+import json
+import shutil
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.batch import (
+    WorkflowPair,
+    _evaluate_in_worker,
+    _init_worker,
+    aggregate_results,
+    evaluate_pair,
+    evaluate_pairs,
+    load_pairs,
+)
+from src.config_loader import WorkflowComparisonConfig
+from tests.helpers import EXAMPLES, large_workflow
+
+
+def test_load_pairs_from_directory(tmp_path):
+    """Test that each subdirectory with a generated workflow is a pair"""
+    for pair_id in ("b", "a"):
+        pair_dir = tmp_path / pair_id
+        pair_dir.mkdir()
+        shutil.copy(EXAMPLES / "generated.json", pair_dir / "generated.json")
+        shutil.copy(EXAMPLES / "simple_workflow.json", pair_dir / "ground_truth.json")
+    (tmp_path / "not-a-pair").mkdir()
+
+    pairs = load_pairs(tmp_path)
+
+    assert [pair.id for pair in pairs] == ["a", "b"]
+    assert pairs[0].ground_truth == tmp_path / "a" / "ground_truth.json"
+
+
+def test_load_pairs_from_manifest(tmp_path):
+    """Test that manifest paths are resolved relative to the manifest"""
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text(
+        json.dumps({"id": "x", "generated": "g.json", "ground_truth": "t.json"}) + "\n"
+    )
+
+    pairs = load_pairs(manifest)
+
+    assert pairs == [WorkflowPair("x", tmp_path / "g.json", tmp_path / "t.json")]
+
+
+def test_load_pairs_rejects_incomplete_entries(tmp_path):
+    """Test that manifest entries without both paths are rejected"""
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([{"generated": "g.json"}]))
+
+    with pytest.raises(ValueError):
+        load_pairs(manifest)
+
+
+def test_evaluate_pairs_streams_results_and_aggregates(tmp_path):
+    """Test that pairs are compared in workers and failures are reported"""
+    pairs = [
+        WorkflowPair(
+            "same", EXAMPLES / "generated.json", EXAMPLES / "simple_workflow.json"
+        ),
+        WorkflowPair(
+            "different",
+            EXAMPLES / "generated.json",
+            EXAMPLES / "multi_trigger.json",
+        ),
+        WorkflowPair("missing", tmp_path / "missing.json", EXAMPLES / "generated.json"),
+    ]
+
+    records = {
+        record["id"]: record
+        for record in evaluate_pairs(pairs, WorkflowComparisonConfig(), workers=2)
+    }
+
+    assert records["same"]["status"] == "ok"
+    assert records["same"]["similarity_score"] == 1.0
+    assert records["different"]["similarity_score"] < 1.0
+    assert records["missing"]["status"] == "error"
+
+    stats = aggregate_results(records.values())
+    assert stats["pairs"] == 3
+    assert stats["ok"] == 2
+    assert stats["errors"] == 1
+    assert stats["pass_rate"] == 0.5
+
+
+def test_evaluate_pair_reports_timeout(tmp_path):
+    """Test that pairs exceeding the hard limit are reported as timeouts"""
+    generated = tmp_path / "generated.json"
+    ground_truth = tmp_path / "ground_truth.json"
+    generated.write_text(json.dumps(large_workflow(40, ["test.a", "test.b"])))
+    ground_truth.write_text(json.dumps(large_workflow(40, ["test.b", "test.a"])))
+
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None  # exhaustive search, far too slow for 40 nodes
+
+    record = evaluate_pair(
+        WorkflowPair("large", generated, ground_truth), config, pair_timeout=0.5
+    )
+
+    assert record["status"] == "timeout"
+    assert record["elapsed"] < 5
+
+
+def test_evaluate_pairs_reuses_disk_cache(tmp_path):
+    """Test that a second run reads results from the cache directory"""
+    pairs = [
+        WorkflowPair(
+            "pair", EXAMPLES / "generated.json", EXAMPLES / "multi_trigger.json"
+        ),
+    ]
+    cache_dir = tmp_path / "cache"
+    config = WorkflowComparisonConfig()
+
+    first = list(evaluate_pairs(pairs, config, workers=1, cache_dir=cache_dir))
+    second = list(evaluate_pairs(pairs, config, workers=1, cache_dir=cache_dir))
+
+    assert len(list((cache_dir / "results").iterdir())) == 1
+    assert second[0]["similarity_score"] == first[0]["similarity_score"]
+    assert second[0]["top_edits"] == first[0]["top_edits"]
+
+
+def test_worker_keeps_failure_warnings_out_of_records(capsys, monkeypatch):
+    """Test that a failing comparison warns on stderr, not on the record stream"""
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setattr("src.batch._worker_config", None)
+    monkeypatch.setattr("src.batch._worker_pair_timeout", None)
+    monkeypatch.setattr("src.batch._worker_cache", None)
+    _init_worker(WorkflowComparisonConfig(), None, None)
+
+    with patch(
+        "src.similarity.bipartite_edit_path", side_effect=RuntimeError("failed")
+    ):
+        record = _evaluate_in_worker(
+            WorkflowPair(
+                "pair", EXAMPLES / "generated.json", EXAMPLES / "multi_trigger.json"
+            )
+        )
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "GED calculation failed" in captured.err
+    assert record["status"] == "ok"
@@ -0,0 +1,158 @@
+"""
+Tests for cache module.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.batch import PairTimeoutError
+from src.cache import (
+    STALE_TEMP_SECONDS,
+    ComparisonCache,
+    canonical_hash,
+    config_fingerprint,
+)
+from src.config_loader import WorkflowComparisonConfig, load_config
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+from tests.helpers import load_example
+
+
+def test_canonical_hash_ignores_key_order():
+    """Test that equal JSON content has the same hash"""
+    assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash(
+        {"b": [1, 2], "a": 1}
+    )
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+
+def test_config_fingerprint_covers_settings():
+    """Test that fingerprints change with settings but not with compiled state"""
+    config = load_config("preset:standard")
+    fingerprint = config_fingerprint(config)
+
+    config.should_ignore_parameter("n8n-nodes-base.code", "jsCode")
+    assert config_fingerprint(config) == fingerprint
+    assert config_fingerprint(load_config("preset:standard")) == fingerprint
+
+    config.ignored_global_parameters.add("options")
+    assert config_fingerprint(config) != fingerprint
+    assert config_fingerprint(load_config("preset:strict")) != fingerprint
+
+
+def test_compare_matches_uncached_result():
+    """Test that cached results equal a direct comparison"""
+    config = WorkflowComparisonConfig()
+    generated = load_example("generated.json")
+    ground_truth = load_example("multi_trigger.json")
+    expected = calculate_graph_edit_distance(
+        build_workflow_graph(generated, config),
+        build_workflow_graph(ground_truth, config),
+        config,
+    )
+    cache = ComparisonCache()
+
+    assert cache.compare(generated, ground_truth, config) == expected
+    assert cache.compare(generated, ground_truth, config) == expected
+    assert cache.stats["result_hits"] == 1
+    assert cache.stats["graph_misses"] == 2
+
+
+def test_ground_truth_graph_is_built_once():
+    """Test that a ground truth compared against many candidates is reused"""
+    config = WorkflowComparisonConfig()
+    ground_truth = load_example("simple_workflow.json")
+    cache = ComparisonCache()
+
+    for name in (
+        "multi_trigger.json",
+        "multi_trigger_missing_node.json",
+        "generated_wrong.json",
+    ):
+        cache.compare(load_example(name), ground_truth, config)
+
+    assert cache.stats["graph_misses"] == 4
+    assert cache.stats["graph_hits"] == 2
+
+
+def test_disk_cache_is_shared(tmp_path):
+    """Test that a new cache instance reads entries written by another"""
+    config = WorkflowComparisonConfig()
+    generated = load_example("generated.json")
+    ground_truth = load_example("simple_workflow.json")
+    expected = ComparisonCache(tmp_path).compare(generated, ground_truth, config)
+
+    cache = ComparisonCache(tmp_path)
+
+    assert cache.compare(generated, ground_truth, config) == expected
+    assert cache.stats["disk_hits"] == 1
+    assert cache.stats["result_misses"] == 0
+
+
+def test_disk_cache_ignores_entries_of_other_versions(tmp_path):
+    """Test that entries written by another cache version are not reused"""
+    config = WorkflowComparisonConfig()
+    generated = load_example("generated.json")
+    ground_truth = load_example("simple_workflow.json")
+    with patch("src.cache.CACHE_VERSION", 0):
+        ComparisonCache(tmp_path).compare(generated, ground_truth, config)
+
+    cache = ComparisonCache(tmp_path)
+    cache.compare(generated, ground_truth, config)
+
+    assert cache.stats["disk_hits"] == 0
+    assert cache.stats["result_misses"] == 1
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    """Test that the disk cache stays within its size limit"""
+    config = WorkflowComparisonConfig()
+    cache = ComparisonCache(tmp_path, max_disk_bytes=5_000)
+    workflows = [
+        {
+            "nodes": [
+                {"name": f"Node {i}", "type": "n8n-nodes-base.set", "parameters": {}}
+            ],
+            "connections": {},
+        }
+        for i in range(50)
+    ]
+
+    for workflow in workflows:
+        cache.graph(workflow, config)
+
+    sizes = [path.stat().st_size for path in tmp_path.rglob("*") if path.is_file()]
+    assert sum(sizes) <= 5_000
+    assert cache.stats["disk_evictions"] > 0
+
+
+def test_interrupted_disk_write_leaves_no_temp_file(tmp_path):
+    """Test that a pair timeout during a write removes the temporary file"""
+    config = WorkflowComparisonConfig()
+    cache = ComparisonCache(tmp_path)
+
+    with patch("src.cache.os.replace", side_effect=PairTimeoutError):
+        with pytest.raises(PairTimeoutError):
+            cache.graph(load_example("simple_workflow.json"), config)
+
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+def test_disk_eviction_removes_stale_temp_files(tmp_path):
+    """Test that temporary files of killed writers are swept, fresh ones kept"""
+    config = WorkflowComparisonConfig()
+    cache = ComparisonCache(tmp_path, max_disk_bytes=1)
+    stale = tmp_path / "graphs" / "stale.tmp"
+    fresh = tmp_path / "graphs" / "fresh.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    stale_time = time.time() - STALE_TEMP_SECONDS - 1
+    os.utime(stale, (stale_time, stale_time))
+
+    cache.graph(load_example("simple_workflow.json"), config)
+
+    assert not stale.exists()
+    assert fresh.exists()
@@ -0,0 +1,75 @@
+"""
+Tests for config_loader module.
+"""
+
+import pickle
+
+from src.config_loader import WorkflowComparisonConfig
+
+
+def _config_with_rules() -> WorkflowComparisonConfig:
+    return WorkflowComparisonConfig._from_dict(
+        {
+            "ignore": {
+                "global_parameters": ["position"],
+                "node_type_parameters": {
+                    "test.node": ["options.*", "exact.path"],
+                },
+                "parameter_paths": ["**.credentials", "headers.*.id"],
+            },
+            "parameter_comparison": {
+                "fuzzy_match": [
+                    {"parameter": "options.text", "type": "semantic"},
+                    {"parameter": "options.*", "type": "normalized"},
+                    {"parameter": "**.prompt", "type": "semantic"},
+                ],
+            },
+        }
+    )
+
+
+def test_should_ignore_parameter_matches_patterns():
+    """Test that global, node type and path patterns are all applied"""
+    config = _config_with_rules()
+
+    assert config.should_ignore_parameter("other.node", "nested.position")
+    assert config.should_ignore_parameter("test.node", "options.timeout")
+    assert config.should_ignore_parameter("test.node", "exact.path")
+    assert config.should_ignore_parameter("other.node", "auth.api.credentials")
+    assert config.should_ignore_parameter("other.node", "headers.x.id")
+
+    assert not config.should_ignore_parameter("other.node", "options.timeout")
+    assert not config.should_ignore_parameter("test.node", "options.nested.timeout")
+    assert not config.should_ignore_parameter("other.node", "headers.x.y.id")
+
+
+def test_get_parameter_rule_returns_first_matching_rule():
+    """Test that rule order decides between overlapping patterns"""
+    config = _config_with_rules()
+
+    assert config.get_parameter_rule("options.text").type == "semantic"
+    assert config.get_parameter_rule("options.mode").type == "normalized"
+    assert config.get_parameter_rule("agent.system.prompt").type == "semantic"
+    assert config.get_parameter_rule("mode") is None
+
+
+def test_compile_rules_picks_up_changed_rules():
+    """Test that recompiling applies rules added after first use"""
+    config = WorkflowComparisonConfig()
+    assert not config.should_ignore_parameter("test.node", "notes")
+
+    config.ignored_parameter_paths.append("notes")
+    config.compile_rules()
+
+    assert config.should_ignore_parameter("test.node", "notes")
+
+
+def test_compiled_config_can_be_pickled():
+    """Test that configs with compiled matchers can be sent to other processes"""
+    config = _config_with_rules()
+    config.should_ignore_parameter("test.node", "options.timeout")
+
+    restored = pickle.loads(pickle.dumps(config))
+
+    assert restored.should_ignore_parameter("test.node", "options.timeout")
+    assert restored.get_parameter_rule("options.text").type == "semantic"
@@ -0,0 +1,217 @@
+"""
+Tests for decomposition module.
+"""
+
+import dataclasses
+import time
+from unittest.mock import patch
+
+from src import decomposition
+from src.config_loader import WorkflowComparisonConfig
+from src.decomposition import weakly_connected_components
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+
+
+def _branches_workflow(branch_count: int, length: int, shifted=()) -> dict:
+    """Build `branch_count` independent chains, shifting node types in `shifted`"""
+    types = ["test.a", "test.b", "test.c"]
+    nodes = []
+    connections = {}
+    for branch in range(branch_count):
+        previous = f"Trigger {branch}"
+        nodes.append(
+            {
+                "id": f"t{branch}",
+                "name": previous,
+                "type": "n8n-nodes-base.webhook",
+                "parameters": {"path": f"/branch-{branch}"},
+            }
+        )
+        shift = 1 if branch in shifted else 0
+        for i in range(length):
+            name = f"Branch {branch} Node {i}"
+            nodes.append(
+                {
+                    "id": f"{branch}-{i}",
+                    "name": name,
+                    "type": types[(i + shift) % len(types)],
+                    "parameters": {"value": (i + branch) % 3},
+                }
+            )
+            connections[previous] = {
+                "main": [[{"node": name, "type": "main", "index": 0}]]
+            }
+            previous = name
+
+    return {"name": "Branches", "nodes": nodes, "connections": connections}
+
+
+def _decomposed(config: WorkflowComparisonConfig, **changes):
+    return dataclasses.replace(config, ged_decompose=True, **changes)
+
+
+def test_sub_agents_stay_in_their_component():
+    """Test that ai_* connections join sub-nodes to their agent"""
+    workflow = _branches_workflow(1, 2)
+    workflow["nodes"] += [
+        {"id": "a", "name": "Agent", "type": "test.agent", "parameters": {}},
+        {"id": "m", "name": "Model", "type": "test.model", "parameters": {}},
+        {"id": "t", "name": "Tool", "type": "test.tool", "parameters": {}},
+    ]
+    workflow["connections"]["Model"] = {
+        "ai_languageModel": [
+            [{"node": "Agent", "type": "ai_languageModel", "index": 0}]
+        ]
+    }
+    workflow["connections"]["Tool"] = {
+        "ai_tool": [[{"node": "Agent", "type": "ai_tool", "index": 0}]]
+    }
+
+    config = WorkflowComparisonConfig()
+    components = weakly_connected_components(build_workflow_graph(workflow, config))
+
+    assert [sorted(component.nodes) for component in components] == [
+        ["Agent", "Model", "Tool"],
+        ["Branch 0 Node 0", "Branch 0 Node 1", "Trigger 0"],
+    ]
+
+
+def test_decomposed_cost_matches_whole_comparison():
+    """Test that comparing matching branches separately finds the optimal cost"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(_branches_workflow(3, 4, shifted=(1,)), config)
+
+    whole = calculate_graph_edit_distance(g1, g2, config)
+    decomposed = calculate_graph_edit_distance(g1, g2, _decomposed(config))
+
+    assert decomposed["components"] == 3
+    assert decomposed["edit_cost"] == whole["edit_cost"]
+    assert decomposed["max_possible_cost"] == whole["max_possible_cost"]
+    assert decomposed["edit_cost_lower_bound"] <= decomposed["edit_cost"]
+    assert all(
+        edit["node_name"].startswith("Branch 1")
+        for edit in decomposed["top_edits"]
+        if "node_name" in edit
+    )
+
+
+def test_unmatched_component_is_deleted_whole():
+    """Test that a branch missing from the ground truth is deleted with its edges"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(_branches_workflow(3, 3), config)
+    g2 = build_workflow_graph(_branches_workflow(2, 3), config)
+
+    whole = calculate_graph_edit_distance(g1, g2, config)
+    result = calculate_graph_edit_distance(g1, g2, _decomposed(config))
+
+    deleted = {
+        edit["node_name"]
+        for edit in result["top_edits"]
+        if edit["type"] == "node_delete"
+    }
+    assert result["components"] == 3
+    assert deleted == {
+        "Trigger 2",
+        "Branch 2 Node 0",
+        "Branch 2 Node 1",
+        "Branch 2 Node 2",
+    }
+    assert result["edit_cost"] == whole["edit_cost"]
+    assert result["is_approximate"] is False
+
+
+def test_pairs_share_the_time_budget():
+    """Test that the pairs together are searched within the configured timeout"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = 6.0
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(_branches_workflow(3, 4, shifted=(1,)), config)
+
+    with patch(
+        "src.decomposition.calculate_graph_edit_distance",
+        wraps=calculate_graph_edit_distance,
+    ) as compare:
+        calculate_graph_edit_distance(g1, g2, _decomposed(config))
+
+    assert [call.args[2].ged_timeout for call in compare.call_args_list] == [2.0] * 3
+
+
+def test_joined_components_are_compared_whole_without_pair_searches():
+    """Test that workflows whose branches are joined differently skip the pairs"""
+    config = WorkflowComparisonConfig()
+    joined = _branches_workflow(3, 4)
+    joined["connections"]["Branch 0 Node 3"] = {
+        "main": [[{"node": "Branch 1 Node 0", "type": "main", "index": 0}]]
+    }
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(joined, config)
+
+    with patch("src.decomposition._compare_pairs") as compare_pairs:
+        result = calculate_graph_edit_distance(g1, g2, _decomposed(config))
+
+    compare_pairs.assert_not_called()
+    assert result == calculate_graph_edit_distance(g1, g2, config)
+
+
+def test_components_compared_in_parallel_match_sequential():
+    """Test that worker processes give the same result as a sequential comparison"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(_branches_workflow(3, 4, shifted=(0, 2)), config)
+
+    sequential = calculate_graph_edit_distance(g1, g2, _decomposed(config))
+    parallel = calculate_graph_edit_distance(g1, g2, _decomposed(config, ged_workers=2))
+
+    assert parallel == sequential
+
+
+def test_worker_pool_is_reused_between_comparisons():
+    """Test that parallel comparisons share one pool instead of starting their own"""
+    config = _decomposed(WorkflowComparisonConfig(), ged_workers=2)
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(_branches_workflow(3, 4, shifted=(0, 2)), config)
+
+    calculate_graph_edit_distance(g1, g2, config)
+    executor = decomposition._executor
+    calculate_graph_edit_distance(g2, g1, config)
+
+    assert executor is not None
+    assert decomposition._executor is executor
+
+
+def test_components_are_compared_sequentially_inside_worker_processes():
+    """Test that batch and server workers do not start a nested pool"""
+    config = _decomposed(WorkflowComparisonConfig(), ged_workers=2)
+    g1 = build_workflow_graph(_branches_workflow(3, 4), config)
+    g2 = build_workflow_graph(_branches_workflow(3, 4, shifted=(0, 2)), config)
+
+    with (
+        patch("src.decomposition.multiprocessing.parent_process") as parent_process,
+        patch("src.decomposition._get_executor") as get_executor,
+    ):
+        result = calculate_graph_edit_distance(g1, g2, config)
+
+    parent_process.assert_called()
+    get_executor.assert_not_called()
+    assert result == calculate_graph_edit_distance(
+        g1, g2, _decomposed(config, ged_workers=1)
+    )
+
+
+def test_large_multi_branch_workflows_are_tractable():
+    """Test that many branches are searched exhaustively in little time"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None
+    g1 = build_workflow_graph(_branches_workflow(6, 10), config)
+    g2 = build_workflow_graph(_branches_workflow(6, 10, shifted=(0, 2, 4)), config)
+
+    started_at = time.perf_counter()
+    result = calculate_graph_edit_distance(g1, g2, _decomposed(config))
+
+    assert time.perf_counter() - started_at < 10
+    assert result["components"] == 6
+    assert result["edit_cost_lower_bound"] <= result["edit_cost"]
+    assert result["edit_cost"] < result["max_possible_cost"]
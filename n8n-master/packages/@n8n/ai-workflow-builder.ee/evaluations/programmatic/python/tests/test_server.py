@@ -0,0 +1,164 @@
+"""
+Tests for server module.
+"""
+
+import io
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.config_loader import WorkflowComparisonConfig
+from src.server import (
+    ComparisonServer,
+    RequestError,
+    ServerOptions,
+    _get_config,
+    _init_worker,
+    compare_request,
+    parse_request,
+)
+from tests.helpers import large_workflow, load_example
+
+
+def _serve(requests: list, config: WorkflowComparisonConfig) -> dict:
+    output = io.StringIO()
+    server = ComparisonServer(ServerOptions(default_config=config), output, workers=2)
+    server.serve(io.StringIO("".join(json.dumps(r) + "\n" for r in requests)))
+
+    return {
+        response["id"]: response
+        for response in map(json.loads, output.getvalue().splitlines())
+    }
+
+
+def test_parse_request_selects_config_source():
+    """Test that a config path takes precedence over a preset"""
+    workflow = {"nodes": [], "connections": {}}
+    line = json.dumps(
+        {
+            "id": "a",
+            "generated": workflow,
+            "ground_truth": workflow,
+            "preset": "strict",
+            "config": "my.yaml",
+        }
+    )
+
+    request_id, request = parse_request(line, default_timeout=30)
+
+    assert request_id == "a"
+    assert request["config_source"] == "my.yaml"
+    assert request["timeout"] == 30
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "not json",
+        "[]",
+        json.dumps({"generated": {}}),
+        json.dumps({"generated": {}, "ground_truth": {}, "timeout": -1}),
+    ],
+)
+def test_parse_request_rejects_invalid_requests(line):
+    """Test that malformed requests are rejected before reaching a worker"""
+    with pytest.raises(RequestError) as exc_info:
+        parse_request(line, default_timeout=None)
+
+    assert exc_info.value.error_type == "invalid_request"
+
+
+def test_server_answers_concurrent_requests_by_id():
+    """Test that every request gets a response carrying its id"""
+    generated = load_example("generated.json")
+    responses = _serve(
+        [
+            {"id": 1, "generated": generated, "ground_truth": generated},
+            {
+                "id": 2,
+                "generated": generated,
+                "ground_truth": load_example("multi_trigger.json"),
+                "preset": "strict",
+            },
+            {"id": 3, "generated": generated, "ground_truth": generated},
+            {"id": 4, "generated": generated, "ground_truth": generated, "preset": "x"},
+            {"id": 5, "generated": generated},
+        ],
+        WorkflowComparisonConfig(),
+    )
+
+    assert responses[1]["result"]["similarity_score"] == 1.0
+    assert responses[3]["result"] == responses[1]["result"]
+    assert responses[2]["result"]["metadata"]["config_name"] == "strict"
+    assert responses[2]["result"]["similarity_score"] < 1.0
+    assert responses[4]["error_type"] == "config"
+    assert responses[5]["error_type"] == "invalid_request"
+
+
+def test_server_reports_request_timeout():
+    """Test that requests exceeding their timeout fail without blocking others"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None  # exhaustive search, far too slow for 40 nodes
+    generated = load_example("generated.json")
+
+    responses = _serve(
+        [
+            {
+                "id": "slow",
+                "generated": large_workflow(40, ["test.a", "test.b"]),
+                "ground_truth": large_workflow(40, ["test.b", "test.a"]),
+                "timeout": 0.5,
+            },
+            {"id": "fast", "generated": generated, "ground_truth": generated},
+        ],
+        config,
+    )
+
+    assert responses["slow"]["error_type"] == "timeout"
+    assert responses["fast"]["result"]["similarity_score"] == 1.0
+
+
+def test_worker_keeps_failure_warnings_out_of_responses(capsys, monkeypatch):
+    """Test that a failing comparison warns on stderr, not on the response stream"""
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setattr("src.server._options", None)
+    monkeypatch.setattr("src.server._cache", None)
+    _init_worker(ServerOptions(default_config=WorkflowComparisonConfig()))
+
+    with patch(
+        "src.similarity.bipartite_edit_path", side_effect=RuntimeError("failed")
+    ):
+        output = compare_request(
+            {
+                "generated": load_example("generated.json"),
+                "ground_truth": load_example("multi_trigger.json"),
+            }
+        )
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "GED calculation failed" in captured.err
+    assert output["similarity_score"] < 1.0
+
+
+def test_request_configs_get_server_overrides(monkeypatch):
+    """Test that configs selected by requests get the server's command line overrides"""
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setattr("src.server._options", None)
+    monkeypatch.setattr("src.server._cache", None)
+    _init_worker(
+        ServerOptions(
+            default_config=WorkflowComparisonConfig(),
+            engine="bipartite",
+            ged_decompose=True,
+            ged_workers=2,
+        )
+    )
+
+    config = _get_config("preset:strict")
+
+    assert config.ged_engine == "bipartite"
+    assert config.ged_decompose is True
+    assert config.ged_workers == 2
@@ -2,9 +2,12 @@
 Tests for similarity module.
 """
 
+from unittest.mock import patch
+
 from src.graph_builder import build_workflow_graph
 from src.similarity import calculate_graph_edit_distance
 from src.config_loader import WorkflowComparisonConfig
+from tests.helpers import chain_workflow
 
 
 def test_identical_workflows():
@@ -326,3 +329,194 @@ def test_trigger_insertion_is_critical():
         edit["priority"] == "critical" and edit["type"] == "node_insert"
         for edit in result["top_edits"]
     )
+
+
+def test_exact_search_reports_exact_result():
+    """Test that small comparisons are exact, with the lower bound equal to the cost"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(chain_workflow(4, ["test.a", "test.b"]), config)
+    g2 = build_workflow_graph(chain_workflow(5, ["test.a", "test.c"]), config)
+
+    result = calculate_graph_edit_distance(g1, g2, config)
+
+    assert result["is_approximate"] is False
+    assert result["edit_cost_lower_bound"] == result["edit_cost"]
+
+
+def test_failed_search_falls_back_and_warns_on_stderr(capsys):
+    """Test that a failing search warns on stderr, which callers do not parse"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(chain_workflow(4, ["test.a", "test.b"]), config)
+    g2 = build_workflow_graph(chain_workflow(5, ["test.a", "test.c"]), config)
+
+    with patch(
+        "src.similarity.bipartite_edit_path", side_effect=RuntimeError("failed")
+    ):
+        result = calculate_graph_edit_distance(g1, g2, config)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "GED calculation failed" in captured.err
+    assert result["is_approximate"] is True
+
+
+def test_search_time_budget_returns_best_path_so_far():
+    """Test that large comparisons stop at the time budget with a bounded result"""
+    import time
+
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = 0.2
+    g1 = build_workflow_graph(
+        chain_workflow(30, ["test.a", "test.b", "test.c"]), config
+    )
+    g2 = build_workflow_graph(
+        chain_workflow(30, ["test.c", "test.b", "test.a"]), config
+    )
+
+    started_at = time.perf_counter()
+    result = calculate_graph_edit_distance(g1, g2, config)
+    elapsed = time.perf_counter() - started_at
+
+    assert elapsed < 5
+    assert result["is_approximate"] is True
+    assert 0 < result["edit_cost_lower_bound"] < result["edit_cost"]
+    assert result["edit_cost"] < result["max_possible_cost"]
+    assert len(result["top_edits"]) > 0
+
+
+def test_bipartite_engine_brackets_exact_cost():
+    """Test that the bipartite engine's cost and lower bound bracket the exact cost"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(chain_workflow(4, ["test.a", "test.b"]), config)
+    g2 = build_workflow_graph(chain_workflow(5, ["test.a", "test.c"]), config)
+
+    exact = calculate_graph_edit_distance(g1, g2, config)
+    config.ged_engine = "bipartite"
+    bipartite = calculate_graph_edit_distance(g1, g2, config)
+
+    assert (
+        bipartite["edit_cost_lower_bound"]
+        <= exact["edit_cost"]
+        <= bipartite["edit_cost"]
+    )
+    assert bipartite["similarity_score"] <= exact["similarity_score"]
+    assert any(edit["type"] == "node_insert" for edit in bipartite["top_edits"])
+
+
+def test_bipartite_engine_finds_parameter_updates():
+    """Test that the bipartite engine matches nodes exactly when only parameters differ"""
+    workflow1 = chain_workflow(6, ["test.a", "test.b"])
+    workflow2 = chain_workflow(6, ["test.a", "test.b"])
+    workflow2["nodes"][3]["parameters"]["value"] = "changed"
+
+    config = WorkflowComparisonConfig()
+    config.ged_engine = "bipartite"
+    g1 = build_workflow_graph(workflow1, config)
+    g2 = build_workflow_graph(workflow2, config)
+
+    result = calculate_graph_edit_distance(g1, g2, config)
+
+    assert result["is_approximate"] is False
+    assert [edit["type"] for edit in result["top_edits"]] == ["node_substitute"]
+    assert result["top_edits"][0]["node_name"] == "Node 2"
+
+
+def test_bipartite_engine_is_bounded_on_large_workflows():
+    """Test that the bipartite engine handles large workflows with a valid bound"""
+    config = WorkflowComparisonConfig()
+    config.ged_engine = "bipartite"
+    g1 = build_workflow_graph(
+        chain_workflow(60, ["test.a", "test.b", "test.c"]), config
+    )
+    g2 = build_workflow_graph(
+        chain_workflow(60, ["test.c", "test.b", "test.a"]), config
+    )
+
+    result = calculate_graph_edit_distance(g1, g2, config)
+
+    assert result["edit_cost_lower_bound"] <= result["edit_cost"]
+    assert result["edit_cost"] < result["max_possible_cost"]
+    assert any(edit["type"] == "node_substitute" for edit in result["top_edits"])
+
+
+def test_node_costs_are_computed_once_per_comparison():
+    """Test that each node pair's substitution cost is computed only once"""
+    from src.cost_functions import cost_function_calls, reset_cost_function_calls
+
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(chain_workflow(6, ["test.a", "test.b"]), config)
+    g2 = build_workflow_graph(chain_workflow(8, ["test.a", "test.c"]), config)
+
+    reset_cost_function_calls()
+    calculate_graph_edit_distance(g1, g2, config)
+
+    assert cost_function_calls["node_substitution_cost"] == 7 * 9
+    assert cost_function_calls["node_deletion_cost"] == 7
+    assert cost_function_calls["node_insertion_cost"] == 9
+
+
+def test_identical_workflows_skip_the_search():
+    """Test that identical workflows are recognized without an edit search"""
+    config = WorkflowComparisonConfig()
+    workflow = chain_workflow(30, ["test.a", "test.b", "test.c"])
+    g1 = build_workflow_graph(workflow, config)
+    g2 = build_workflow_graph(workflow, config)
+
+    result = calculate_graph_edit_distance(g1, g2, config)
+
+    assert result["fast_path"] == "identical"
+    assert result["similarity_score"] == 1.0
+    assert result["max_possible_cost"] > 0
+
+
+def test_renamed_workflows_skip_the_search():
+    """Test that workflows differing only in node names are matched node by node"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None
+    workflow1 = chain_workflow(30, ["test.a", "test.b", "test.c"])
+    workflow2 = chain_workflow(30, ["test.a", "test.b", "test.c"])
+    renames = {"Node 3": "Renamed 3", "Node 17": "Renamed 17"}
+    for node in workflow2["nodes"]:
+        node["name"] = renames.get(node["name"], node["name"])
+    workflow2["connections"] = {
+        renames.get(source, source): {
+            "main": [
+                [
+                    dict(conn, node=renames.get(conn["node"], conn["node"]))
+                    for conn in outputs["main"][0]
+                ]
+            ]
+        }
+        for source, outputs in workflow2["connections"].items()
+    }
+    g1 = build_workflow_graph(workflow1, config)
+    g2 = build_workflow_graph(workflow2, config)
+
+    result = calculate_graph_edit_distance(g1, g2, config)
+
+    assert result["fast_path"] in ("isomorphic", "lower_bound")
+    assert result["is_approximate"] is False
+    assert [edit["node_name"] for edit in result["top_edits"]] == ["Node 3", "Node 17"]
+
+
+def test_isomorphic_edit_path_substitutes_nodes_only():
+    """Test that isomorphic graphs are matched without edge edits"""
+    from src.isomorphism import isomorphic_edit_path
+
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(chain_workflow(6, ["test.a", "test.b"]), config)
+    g2 = build_workflow_graph(chain_workflow(6, ["test.a", "test.b"]), config)
+    g3 = build_workflow_graph(chain_workflow(6, ["test.b", "test.a"]), config)
+
+    def subst_cost(data1, data2):
+        return 0.0 if data1["parameters"] == data2["parameters"] else 1.0
+
+    def edge_match(data1, data2):
+        return data1["connection_type"] == data2["connection_type"]
+
+    node_path, edge_path, cost = isomorphic_edit_path(g1, g2, subst_cost, edge_match)
+
+    assert cost == 0.0
+    assert all(u == v for u, v in node_path)
+    assert len(edge_path) == g1.number_of_edges()
+    assert isomorphic_edit_path(g1, g3, subst_cost, edge_match) is None
@@ -0,0 +1,85 @@
+"""
+Tests for threshold module.
+"""
+
+import itertools
+import time
+
+from src.config_loader import WorkflowComparisonConfig, load_config
+from src.cost_functions import cost_function_calls, reset_cost_function_calls
+from src.graph_builder import build_workflow_graph
+from src.similarity import calculate_graph_edit_distance
+from src.threshold import compare_with_threshold, edit_cost_lower_bound
+from tests.helpers import EXAMPLES, chain_workflow, load_example
+
+
+def _example_graphs(config: WorkflowComparisonConfig) -> dict:
+    return {
+        path.stem: build_workflow_graph(load_example(path.name), config)
+        for path in sorted(EXAMPLES.glob("*.json"))
+    }
+
+
+def test_lower_bound_is_admissible():
+    """Test that the lower bound never exceeds the edit cost"""
+    for preset in ("strict", "standard", "lenient"):
+        config = load_config(f"preset:{preset}")
+        config.ged_timeout = None
+        graphs = _example_graphs(config)
+
+        for g1, g2 in itertools.product(graphs.values(), repeat=2):
+            result = calculate_graph_edit_distance(g1, g2, config)
+            assert edit_cost_lower_bound(g1, g2, config) <= result["edit_cost"] + 1e-9
+
+
+def test_threshold_decisions_match_full_comparison():
+    """Test that threshold checks decide like a full comparison"""
+    config = load_config("preset:standard")
+    config.ged_timeout = None
+    graphs = _example_graphs(config)
+
+    for g1, g2 in itertools.product(graphs.values(), repeat=2):
+        similarity = calculate_graph_edit_distance(g1, g2, config)["similarity_score"]
+        for min_similarity in (0.3, 0.5, 0.7, 0.9):
+            decision = compare_with_threshold(g1, g2, config, min_similarity)
+            assert decision["meets_threshold"] == (similarity >= min_similarity)
+            assert decision["similarity_upper_bound"] >= similarity - 1e-9
+
+
+def test_hopeless_candidate_is_pruned_without_comparing_parameters():
+    """Test that a candidate far below the threshold is rejected by the bound"""
+    config = WorkflowComparisonConfig()
+    g1 = build_workflow_graph(
+        chain_workflow(30, ["test.a", "test.b", "test.c"]), config
+    )
+    g2 = build_workflow_graph(chain_workflow(12, ["test.a", "test.d"]), config)
+
+    reset_cost_function_calls()
+    decision = compare_with_threshold(g1, g2, config, 0.7)
+
+    assert decision["pruned"] is True
+    assert decision["meets_threshold"] is False
+    assert decision["result"] is None
+    assert decision["similarity_upper_bound"] < 0.7
+    assert cost_function_calls["compare_parameters"] == 0
+
+
+def test_budget_search_stops_once_decided():
+    """Test that large comparisons against a threshold finish without a time budget"""
+    config = WorkflowComparisonConfig()
+    config.ged_timeout = None
+    g1 = build_workflow_graph(
+        chain_workflow(30, ["test.a", "test.b", "test.c"]), config
+    )
+    g2 = build_workflow_graph(
+        chain_workflow(30, ["test.c", "test.b", "test.a"]), config
+    )
+
+    for min_similarity, meets_threshold in ((0.9, False), (0.7, True)):
+        started_at = time.perf_counter()
+        decision = compare_with_threshold(g1, g2, config, min_similarity)
+
+        assert time.perf_counter() - started_at < 5
+        assert decision["pruned"] is False
+        assert decision["meets_threshold"] is meets_threshold
+        assert decision["result"]["fast_path"] in ("over_budget", "within_budget")
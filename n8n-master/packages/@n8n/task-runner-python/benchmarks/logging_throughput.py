@@ -0,0 +1,115 @@
+"""Benchmark of task completion logging as seen from the event loop thread.
+
+Compares writing records synchronously with the stream handler against
+enqueuing them for the listener thread, for the text and JSON formats.
+
+Usage: uv run python -m benchmarks.logging_throughput [--records N] [--sink-delay-us N]
+"""
+
+import argparse
+import io
+import logging
+import logging.handlers
+import queue
+import time
+
+from src.constants import LOG_FORMAT, LOG_TASK_COMPLETE, LOG_TIMESTAMP_FORMAT
+from src.logs import ColorFormatter, JsonFormatter
+
+
+class SlowSink(io.TextIOBase):
+    """Stands in for a stdout pipe whose reader, e.g. a log collector, is lagging."""
+
+    def __init__(self, delay: float):
+        self.delay = delay  # seconds per write
+
+    def write(self, s: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return len(s)
+
+
+def create_logger(formatter: logging.Formatter, sink: SlowSink, queued: bool):
+    logger = logging.getLogger(f"benchmark.{id(formatter)}.{queued}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    stream_handler = logging.StreamHandler(sink)
+    stream_handler.setFormatter(formatter)
+
+    if not queued:
+        logger.addHandler(stream_handler)
+        return logger, None
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return logger, listener
+
+
+def log_task_completions(logger: logging.Logger, records: int) -> None:
+    for index in range(records):
+        logger.info(
+            LOG_TASK_COMPLETE.format(
+                task_id=f"task-{index}",
+                duration="12ms",
+                result_size="1.2 KB",
+                node_name="Code",
+                node_id="node-id",
+                workflow_name="Workflow",
+                workflow_id="workflow-id",
+            ),
+            extra={
+                "task": {
+                    "task_id": f"task-{index}",
+                    "node_name": "Code",
+                    "node_id": "node-id",
+                    "workflow_name": "Workflow",
+                    "workflow_id": "workflow-id",
+                    "duration_ms": 12,
+                    "result_size_bytes": 1234,
+                }
+            },
+        )
+
+
+def main(records: int, sink_delay_us: int) -> None:
+    text_formatter = ColorFormatter(LOG_FORMAT, LOG_TIMESTAMP_FORMAT)
+    text_formatter.short_form = False  # full format, as on a terminal
+
+    variants = [
+        ("text, sync", text_formatter, False),
+        ("text, queued", text_formatter, True),
+        ("json, sync", JsonFormatter(), False),
+        ("json, queued", JsonFormatter(), True),
+    ]
+
+    print(
+        f"{'variant':<14} {'loop records/s':>15} {'loop us/record':>15} {'drained':>9}"
+    )
+    for name, formatter, queued in variants:
+        logger, listener = create_logger(
+            formatter, SlowSink(sink_delay_us / 1e6), queued
+        )
+
+        start_time = time.perf_counter()
+        log_task_completions(logger, records)
+        loop_elapsed = time.perf_counter() - start_time
+
+        if listener:
+            listener.stop()  # waits until every queued record is written
+        drained = time.perf_counter() - start_time
+
+        print(
+            f"{name:<14} {records / loop_elapsed:>15,.0f} {loop_elapsed / records * 1e6:>15.1f} {drained:>8.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--sink-delay-us", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.records, args.sink_delay_us)
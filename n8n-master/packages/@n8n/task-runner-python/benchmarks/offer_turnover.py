@@ -0,0 +1,83 @@
+"""Microbenchmark of offer and accept turnover in TaskRunner bookkeeping.
+
+Usage: uv run python -m benchmarks.offer_turnover [--concurrency N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from src.config.task_runner_config import TaskRunnerConfig
+from src.message_types import BrokerTaskOfferAccept
+from src.task_runner import TaskRunner
+
+
+def create_runner(concurrency: int) -> TaskRunner:
+    config = TaskRunnerConfig(
+        grant_token="benchmark",
+        task_broker_uri="http://127.0.0.1:5679",
+        max_concurrency=concurrency,
+        max_payload_size=1024 * 1024,
+        task_timeout=60,
+        auto_shutdown_timeout=0,
+        graceful_shutdown_timeout=10,
+        stdlib_allow=set(),
+        external_allow=set(),
+        builtins_deny=set(),
+        env_deny=False,
+    )
+    runner = TaskRunner(config)
+    runner.can_send_offers = True
+
+    async def discard(_message):
+        pass
+
+    runner._send_message = discard
+    return runner
+
+
+async def run_rounds(runner: TaskRunner, rounds: int) -> int:
+    """Each round refills all slots with offers, accepts every offer and completes every task."""
+
+    turnovers = 0
+    for round_number in range(rounds):
+        await runner._send_offers()
+
+        for offer_id in list(runner.open_offers):
+            task_id = f"task-{round_number}-{offer_id}"
+            await runner._handle_task_offer_accept(
+                BrokerTaskOfferAccept(task_id=task_id, offer_id=offer_id)
+            )
+            runner._remove_task(task_id)
+            turnovers += 1
+
+    return turnovers
+
+
+async def main(concurrency: int, rounds: int) -> None:
+    runner = create_runner(concurrency)
+    await run_rounds(runner, 10)  # warm up
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    turnovers = await run_rounds(runner, rounds)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"concurrency:      {concurrency}")
+    print(f"turnovers:        {turnovers}")
+    print(f"turnovers/s:      {turnovers / elapsed:,.0f}")
+    print(f"per turnover:     {elapsed / turnovers * 1e6:.1f} us")
+    print(f"peak traced mem:  {peak / 1024:.1f} KiB")
+    print(f"pending expiries: {len(runner.offer_expiries)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency, args.rounds))
@@ -0,0 +1,108 @@
+"""Benchmark of peak memory while reading a large task result from the subprocess pipe.
+
+Usage: uv run python -m benchmarks.pipe_read [--sizes-mb 10,100,500]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+from src.message_types.pipe import PIPE_FRAME_HEADER, PipeFrameType
+from src.pipe_reader import PipeReader
+from src.task_executor import TaskExecutor
+
+ITEM_TEXT_SIZE = 1024  # bytes
+
+
+def encode_result(size_mb: int) -> bytes:
+    items_count = size_mb * 1024 * 1024 // ITEM_TEXT_SIZE
+    result = [{"json": {"text": "x" * ITEM_TEXT_SIZE}}] * items_count
+    return json.dumps(result).encode("utf-8")
+
+
+def write_result(write_fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    TaskExecutor._write_frame(write_fd, PipeFrameType.RESULT_CHUNK, view)
+    TaskExecutor._write_frame(write_fd, PipeFrameType.END, b"")
+    os.close(write_fd)
+
+
+def copying_read_exact_bytes(fd: int, n: int) -> bytes:
+    """Previous approach: copy each read into a buffer, then copy the buffer into bytes."""
+
+    result = bytearray(n)
+    offset = 0
+    while offset < n:
+        chunk = os.read(fd, n - offset)
+        if not chunk:
+            raise EOFError("Pipe closed before reading all data")
+        result[offset : offset + len(chunk)] = chunk
+        offset += len(chunk)
+    return bytes(result)
+
+
+def read_copying(read_fd: int):
+    result_data = bytearray()
+    while True:
+        header = copying_read_exact_bytes(read_fd, PIPE_FRAME_HEADER.size)
+        _, frame_type, _, length = PIPE_FRAME_HEADER.unpack(header)
+        if frame_type == PipeFrameType.END:
+            break
+        result_data += copying_read_exact_bytes(read_fd, length)
+    return json.loads(result_data.decode("utf-8"))
+
+
+def read_in_place(read_fd: int):
+    reader = PipeReader(read_fd, MagicMock())
+    reader.run()
+    if reader.error:
+        raise reader.error
+    assert reader.pipe_message is not None
+    return reader.pipe_message["result"]  # type: ignore[typeddict-item]
+
+
+def measure(read, data: bytes) -> tuple[float, int]:
+    read_fd, write_fd = os.pipe()
+    TaskExecutor._enlarge_pipe(write_fd)
+    writer = threading.Thread(target=write_result, args=(write_fd, data))
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    writer.start()
+    result = read(read_fd)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    writer.join()
+    os.close(read_fd)
+    del result
+    return elapsed, peak
+
+
+def main(sizes_mb: list[int]) -> None:
+    variants = [
+        ("copying reader", read_copying),
+        ("in-place reader", read_in_place),
+    ]
+
+    print(f"{'size':>8}  {'variant':<16} {'time':>9}  {'peak':>10}  {'peak/size':>9}")
+    for size_mb in sizes_mb:
+        data = encode_result(size_mb)
+        for name, read in variants:
+            elapsed, peak = measure(read, data)
+            print(
+                f"{size_mb:>6}MB  {name:<16} {elapsed * 1000:>7.1f}ms  {peak / 1024**2:>8.1f}MB  {peak / len(data):>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", default="10,100,500")
+    args = parser.parse_args()
+
+    main([int(size) for size in args.sizes_mb.split(",")])
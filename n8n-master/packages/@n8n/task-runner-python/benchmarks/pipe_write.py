@@ -0,0 +1,97 @@
+"""Benchmark of writing large task results through the subprocess pipe.
+
+Usage: uv run python -m benchmarks.pipe_write [--sizes-mb 10,100,1000]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from src.constants import PIPE_FRAME_MAX_CHUNK_SIZE, PIPE_FRAME_VERSION
+from src.message_types.pipe import PIPE_FRAME_HEADER, PipeFrameType
+from src.task_executor import TaskExecutor
+
+READ_SIZE = 1024 * 1024  # bytes
+
+
+def drain(read_fd: int) -> None:
+    while os.read(read_fd, READ_SIZE):
+        pass
+
+
+def sliced_write(fd: int, data: bytes) -> None:
+    """Previous approach: one write per buffer, re-slicing the remainder after partial writes."""
+
+    total_written = 0
+    while total_written < len(data):
+        written = os.write(fd, data[total_written:])
+        if written == 0:
+            raise OSError("Write failed")
+        total_written += written
+
+
+def write_sliced(fd: int, payload: bytes) -> None:
+    for offset in range(0, len(payload), PIPE_FRAME_MAX_CHUNK_SIZE):
+        chunk = payload[offset : offset + PIPE_FRAME_MAX_CHUNK_SIZE]
+        sliced_write(
+            fd,
+            PIPE_FRAME_HEADER.pack(
+                PIPE_FRAME_VERSION, PipeFrameType.RESULT_CHUNK, 0, len(chunk)
+            ),
+        )
+        sliced_write(fd, chunk)
+
+
+def write_vectored(fd: int, payload: bytes) -> None:
+    view = memoryview(payload)
+    for offset in range(0, len(view), PIPE_FRAME_MAX_CHUNK_SIZE):
+        TaskExecutor._write_frame(
+            fd,
+            PipeFrameType.RESULT_CHUNK,
+            view[offset : offset + PIPE_FRAME_MAX_CHUNK_SIZE],
+        )
+
+
+def measure(write, payload: bytes, enlarge_pipe: bool) -> float:
+    read_fd, write_fd = os.pipe()
+    if enlarge_pipe:
+        TaskExecutor._enlarge_pipe(write_fd)
+
+    reader = threading.Thread(target=drain, args=(read_fd,))
+    reader.start()
+
+    start_time = time.perf_counter()
+    write(write_fd, payload)
+    os.close(write_fd)
+    reader.join()
+    elapsed = time.perf_counter() - start_time
+
+    os.close(read_fd)
+    return elapsed
+
+
+def main(sizes_mb: list[int]) -> None:
+    variants = [
+        ("sliced, default pipe", write_sliced, False),
+        ("writev, default pipe", write_vectored, False),
+        ("writev, enlarged pipe", write_vectored, True),
+    ]
+
+    print(f"{'size':>8}  {'variant':<22} {'time':>9}  {'throughput':>12}")
+    for size_mb in sizes_mb:
+        payload = b"x" * (size_mb * 1024 * 1024)
+        for name, write, enlarge_pipe in variants:
+            elapsed = measure(write, payload, enlarge_pipe)
+            throughput = size_mb / elapsed
+            print(
+                f"{size_mb:>6}MB  {name:<22} {elapsed * 1000:>7.1f}ms  {throughput:>8,.0f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", default="10,100,1000")
+    args = parser.parse_args()
+
+    main([int(size) for size in args.sizes_mb.split(",")])
@@ -0,0 +1,136 @@
+import math
+import time
+
+from src.constants import (
+    CONCURRENCY_ADJUSTMENT_INTERVAL,
+    CONCURRENCY_CPU_SATURATION_THRESHOLD,
+    CONCURRENCY_CPU_PRESSURE_THRESHOLD,
+    CONCURRENCY_MEMORY_HEADROOM_THRESHOLD,
+    CONCURRENCY_MEMORY_PRESSURE_THRESHOLD,
+    CONCURRENCY_LATENCY_DEGRADATION_FACTOR,
+    CONCURRENCY_DECREASE_FACTOR,
+    CONCURRENCY_LATENCY_EWMA_ALPHA,
+    CONCURRENCY_LATENCY_BASELINE_ALPHA,
+)
+from src.host_load import HostLoad, HostLoadSampler
+from src.runner_metrics import RunnerMetrics
+
+
+class ConcurrencyController:
+    """Responsible for adjusting the number of offered slots to observed host load.
+
+    Follows AIMD: the limit grows by one slot per interval while all slots are in
+    use and the host is healthy, and is cut multiplicatively as soon as CPU is
+    saturated, memory headroom runs low or task latency degrades.
+
+    Latency alone says more about the code being run than about the host, as a
+    workflow with slower nodes degrades it just as well, so it only counts while
+    CPU or memory is under pressure. After a cut for latency, the current latency
+    becomes the new baseline, so a lasting change is cut for only once.
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int,
+        max_concurrency: int,
+        metrics: RunnerMetrics,
+        sampler: HostLoadSampler | None = None,
+    ):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.metrics = metrics
+        self.sampler = sampler or HostLoadSampler()
+
+        self.latency_ewma: float | None = None  # seconds
+        self.latency_baseline: float | None = None  # seconds
+        self.next_adjustment_at = time.monotonic()  # monotonic clock
+
+        self.metrics.concurrency_limit = self.limit
+
+    def record_task_latency(self, latency: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += CONCURRENCY_LATENCY_EWMA_ALPHA * (
+                latency - self.latency_ewma
+            )
+
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+        else:
+            # drift up slowly, so a lasting change in workload becomes the new normal
+            self.latency_baseline += CONCURRENCY_LATENCY_BASELINE_ALPHA * (
+                self.latency_ewma - self.latency_baseline
+            )
+
+    def update(self, running_tasks_count: int) -> int:
+        """Adjust the limit at most once per interval and return the current limit."""
+
+        now = time.monotonic()
+        if now < self.next_adjustment_at:
+            return self.limit
+        self.next_adjustment_at = now + CONCURRENCY_ADJUSTMENT_INTERVAL
+
+        overload_reason = self._overload_reason(self.sampler.sample())
+
+        if overload_reason == "latency":
+            self.latency_baseline = self.latency_ewma
+
+        if overload_reason:
+            self._set_limit(
+                max(
+                    self.min_concurrency,
+                    math.floor(self.limit * CONCURRENCY_DECREASE_FACTOR),
+                ),
+                overload_reason,
+            )
+        elif running_tasks_count >= self.limit:
+            self._set_limit(min(self.max_concurrency, self.limit + 1), "saturated")
+
+        return self.limit
+
+    def _overload_reason(self, load: HostLoad) -> str | None:
+        if (
+            load.cpu_saturation is not None
+            and load.cpu_saturation >= CONCURRENCY_CPU_SATURATION_THRESHOLD
+        ):
+            return "cpu"
+
+        if (
+            load.memory_headroom is not None
+            and load.memory_headroom <= CONCURRENCY_MEMORY_HEADROOM_THRESHOLD
+        ):
+            return "memory"
+
+        under_pressure = (
+            load.cpu_saturation is not None
+            and load.cpu_saturation >= CONCURRENCY_CPU_PRESSURE_THRESHOLD
+        ) or (
+            load.memory_headroom is not None
+            and load.memory_headroom <= CONCURRENCY_MEMORY_PRESSURE_THRESHOLD
+        )
+
+        if (
+            under_pressure
+            and self.latency_ewma is not None
+            and self.latency_baseline is not None
+            and self.latency_ewma
+            > self.latency_baseline * CONCURRENCY_LATENCY_DEGRADATION_FACTOR
+        ):
+            return "latency"
+
+        return None
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        if limit == self.limit:
+            return
+
+        if limit > self.limit:
+            self.metrics.concurrency_increases += 1
+        else:
+            self.metrics.concurrency_decreases += 1
+
+        self.limit = limit
+        self.metrics.concurrency_limit = limit
+        self.metrics.concurrency_last_reason = reason
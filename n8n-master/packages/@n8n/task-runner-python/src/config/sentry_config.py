@@ -1,20 +1,54 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from src.env import read_str_env
+from src.env import read_int_env, read_str_env
+from src.errors import ConfigurationError
 from src.constants import (
+    DEFAULT_SENTRY_DEDUP_WINDOW,
+    DEFAULT_SENTRY_RATE_LIMIT,
     ENV_DEPLOYMENT_NAME,
     ENV_ENVIRONMENT,
     ENV_N8N_VERSION,
+    ENV_SENTRY_DEDUP_WINDOW,
     ENV_SENTRY_DSN,
+    ENV_SENTRY_RATE_LIMIT,
+    ENV_SENTRY_SAMPLE_RATES,
 )
 
 
+def parse_sample_rates(sample_rates_str: str) -> dict[str, float]:
+    """Parse `ErrorType=rate` pairs, e.g. `TaskResultReadError=0.1,*=0.5`."""
+
+    sample_rates: dict[str, float] = {}
+
+    for raw_entry in sample_rates_str.split(","):
+        if not (entry := raw_entry.strip()):
+            continue
+
+        error_type, separator, raw_rate = entry.partition("=")
+        try:
+            rate = float(raw_rate)
+        except ValueError:
+            rate = -1.0
+
+        if not separator or not error_type.strip() or not 0 <= rate <= 1:
+            raise ConfigurationError(
+                f"Invalid entry '{entry}' in {ENV_SENTRY_SAMPLE_RATES}, expected ErrorType=rate with rate between 0 and 1"
+            )
+
+        sample_rates[error_type.strip()] = rate
+
+    return sample_rates
+
+
 @dataclass
 class SentryConfig:
     dsn: str
     n8n_version: str
     environment: str
     deployment_name: str
+    sample_rates: dict[str, float] = field(default_factory=dict)  # by error type
+    rate_limit: int = DEFAULT_SENTRY_RATE_LIMIT
+    dedup_window: int = DEFAULT_SENTRY_DEDUP_WINDOW
 
     @property
     def enabled(self) -> bool:
@@ -22,9 +56,26 @@ class SentryConfig:
 
     @classmethod
     def from_env(cls):
+        rate_limit = read_int_env(ENV_SENTRY_RATE_LIMIT, DEFAULT_SENTRY_RATE_LIMIT)
+        if rate_limit < 0:
+            raise ConfigurationError(
+                f"Sentry rate limit must be non-negative, got {rate_limit}"
+            )
+
+        dedup_window = read_int_env(
+            ENV_SENTRY_DEDUP_WINDOW, DEFAULT_SENTRY_DEDUP_WINDOW
+        )
+        if dedup_window < 0:
+            raise ConfigurationError(
+                f"Sentry dedup window must be non-negative, got {dedup_window}"
+            )
+
         return cls(
             dsn=read_str_env(ENV_SENTRY_DSN, ""),
             n8n_version=read_str_env(ENV_N8N_VERSION, ""),
             environment=read_str_env(ENV_ENVIRONMENT, ""),
             deployment_name=read_str_env(ENV_DEPLOYMENT_NAME, ""),
+            sample_rates=parse_sample_rates(read_str_env(ENV_SENTRY_SAMPLE_RATES, "")),
+            rate_limit=rate_limit,
+            dedup_window=dedup_window,
         )
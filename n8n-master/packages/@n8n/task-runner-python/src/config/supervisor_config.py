@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from src.env import read_int_env, read_str_env
+from src.errors import ConfigurationError
+from src.constants import (
+    DEFAULT_SUPERVISOR_PROCESSES,
+    ENV_AUTH_TOKEN,
+    ENV_SUPERVISOR_PROCESSES,
+)
+
+
+@dataclass
+class SupervisorConfig:
+    processes: int
+    auth_token: str
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 1
+
+    @classmethod
+    def from_env(cls):
+        processes = read_int_env(ENV_SUPERVISOR_PROCESSES, DEFAULT_SUPERVISOR_PROCESSES)
+        if processes < 1:
+            raise ConfigurationError(
+                f"Supervisor processes must be at least 1, got {processes}"
+            )
+
+        # The broker consumes a grant token on first use, so every runner process
+        # the supervisor starts needs its own, exchanged for the auth token.
+        auth_token = read_str_env(ENV_AUTH_TOKEN, "")
+        if processes > 1 and not auth_token:
+            raise ConfigurationError(
+                "Environment variable N8N_RUNNERS_AUTH_TOKEN is required when running multiple runner processes"
+            )
+
+        return cls(processes=processes, auth_token=auth_token)
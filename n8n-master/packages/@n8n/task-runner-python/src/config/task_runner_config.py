@@ -5,22 +5,35 @@ from src.errors import ConfigurationError
 from src.constants import (
     BUILTINS_DENY_DEFAULT,
     DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MIN_CONCURRENCY,
+    DEFAULT_MEMORY_BUDGET,
     DEFAULT_MAX_PAYLOAD_SIZE,
     DEFAULT_TASK_BROKER_URI,
     DEFAULT_TASK_TIMEOUT,
     DEFAULT_AUTO_SHUTDOWN_TIMEOUT,
     DEFAULT_SHUTDOWN_TIMEOUT,
+    DEFAULT_PIPE_COMPRESSION_THRESHOLD,
+    DEFAULT_RESULT_CACHE_TTL,
+    DEFAULT_RESULT_CACHE_MAX_SIZE,
     ENV_BLOCK_RUNNER_ENV_ACCESS,
     ENV_BUILTINS_DENY,
     ENV_EXTERNAL_ALLOW,
     ENV_GRANT_TOKEN,
     ENV_MAX_CONCURRENCY,
+    ENV_MIN_CONCURRENCY,
+    ENV_ADAPTIVE_CONCURRENCY_ENABLED,
+    ENV_MEMORY_BUDGET,
     ENV_MAX_PAYLOAD_SIZE,
     ENV_STDLIB_ALLOW,
     ENV_TASK_BROKER_URI,
     ENV_TASK_TIMEOUT,
     ENV_AUTO_SHUTDOWN_TIMEOUT,
     ENV_GRACEFUL_SHUTDOWN_TIMEOUT,
+    ENV_WARM_UP_ENABLED,
+    ENV_PIPE_COMPRESSION_THRESHOLD,
+    ENV_RESULT_CACHE_ENABLED,
+    ENV_RESULT_CACHE_TTL,
+    ENV_RESULT_CACHE_MAX_SIZE,
     PIPE_MSG_MAX_SIZE,
 )
 
@@ -57,6 +70,14 @@ class TaskRunnerConfig:
     external_allow: set[str]
     builtins_deny: set[str]
     env_deny: bool
+    warm_up_enabled: bool = False
+    pipe_compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD
+    result_cache_enabled: bool = False
+    result_cache_ttl: int = DEFAULT_RESULT_CACHE_TTL
+    result_cache_max_size: int = DEFAULT_RESULT_CACHE_MAX_SIZE
+    adaptive_concurrency_enabled: bool = False
+    min_concurrency: int = DEFAULT_MIN_CONCURRENCY
+    memory_budget: int = DEFAULT_MEMORY_BUDGET
 
     @property
     def is_auto_shutdown_enabled(self) -> bool:
@@ -98,10 +119,45 @@ class TaskRunnerConfig:
                 f"Max payload size of {max_payload_size} bytes exceeds pipe message limit of {PIPE_MSG_MAX_SIZE} bytes. Reduce {ENV_MAX_PAYLOAD_SIZE}."
             )
 
+        pipe_compression_threshold = read_int_env(
+            ENV_PIPE_COMPRESSION_THRESHOLD, DEFAULT_PIPE_COMPRESSION_THRESHOLD
+        )
+        if pipe_compression_threshold < 0:
+            raise ConfigurationError(
+                f"Pipe compression threshold must be non-negative, got {pipe_compression_threshold}"
+            )
+
+        result_cache_ttl = read_int_env(ENV_RESULT_CACHE_TTL, DEFAULT_RESULT_CACHE_TTL)
+        if result_cache_ttl <= 0:
+            raise ConfigurationError(
+                f"Result cache TTL must be positive, got {result_cache_ttl}"
+            )
+
+        result_cache_max_size = read_int_env(
+            ENV_RESULT_CACHE_MAX_SIZE, DEFAULT_RESULT_CACHE_MAX_SIZE
+        )
+        if result_cache_max_size <= 0:
+            raise ConfigurationError(
+                f"Result cache max size must be positive, got {result_cache_max_size}"
+            )
+
+        max_concurrency = read_int_env(ENV_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        min_concurrency = read_int_env(ENV_MIN_CONCURRENCY, DEFAULT_MIN_CONCURRENCY)
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ConfigurationError(
+                f"Min concurrency must be between 1 and max concurrency ({max_concurrency}), got {min_concurrency}"
+            )
+
+        memory_budget = read_int_env(ENV_MEMORY_BUDGET, DEFAULT_MEMORY_BUDGET)
+        if memory_budget < 0:
+            raise ConfigurationError(
+                f"Memory budget must be non-negative, got {memory_budget}"
+            )
+
         return cls(
             grant_token=grant_token,
             task_broker_uri=read_str_env(ENV_TASK_BROKER_URI, DEFAULT_TASK_BROKER_URI),
-            max_concurrency=read_int_env(ENV_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            max_concurrency=max_concurrency,
             max_payload_size=max_payload_size,
             task_timeout=task_timeout,
             auto_shutdown_timeout=auto_shutdown_timeout,
@@ -119,4 +175,14 @@ class TaskRunnerConfig:
                 ).split(",")
             ),
             env_deny=read_bool_env(ENV_BLOCK_RUNNER_ENV_ACCESS, True),
+            warm_up_enabled=read_bool_env(ENV_WARM_UP_ENABLED, False),
+            pipe_compression_threshold=pipe_compression_threshold,
+            result_cache_enabled=read_bool_env(ENV_RESULT_CACHE_ENABLED, False),
+            result_cache_ttl=result_cache_ttl,
+            result_cache_max_size=result_cache_max_size,
+            adaptive_concurrency_enabled=read_bool_env(
+                ENV_ADAPTIVE_CONCURRENCY_ENABLED, False
+            ),
+            min_concurrency=min_concurrency,
+            memory_budget=memory_budget,
         )
@@ -35,6 +35,30 @@ OFFER_VALIDITY = 5000  # ms
 OFFER_VALIDITY_MAX_JITTER = 500  # ms
 OFFER_VALIDITY_LATENCY_BUFFER = 0.1  # 100ms
 MAX_VALIDATION_CACHE_SIZE = 500  # cached validation results
+CANCEL_GRACE_PERIOD = 1  # seconds before SIGTERM escalates to SIGKILL
+WARM_UP_TASK_CODE = "return []"
+RESULT_CACHE_MARKER = (
+    "# n8n: cacheable"  # line in task code that opts into the result cache
+)
+DEFAULT_RESULT_CACHE_TTL = 300  # seconds
+DEFAULT_RESULT_CACHE_MAX_SIZE = 64 * 1024 * 1024  # 64 MiB of cached results
+DEFAULT_MEMORY_BUDGET = 0  # bytes, 0 disables memory-pressure admission
+MEMORY_TASK_BASELINE = (
+    32 * 1024 * 1024
+)  # bytes, RSS of a subprocess before user code runs
+MEMORY_PAYLOAD_FACTOR = (
+    4  # parsed items in runner, pickled copy, unpickled copy in subprocess, result
+)
+DEFAULT_MIN_CONCURRENCY = 1  # tasks, lower bound for adaptive concurrency
+CONCURRENCY_ADJUSTMENT_INTERVAL = 1  # seconds between adaptive concurrency decisions
+CONCURRENCY_CPU_SATURATION_THRESHOLD = 0.9  # busy fraction of all CPUs
+CONCURRENCY_MEMORY_HEADROOM_THRESHOLD = 0.1  # available fraction of memory
+CONCURRENCY_LATENCY_DEGRADATION_FACTOR = 2.0  # task latency relative to baseline
+CONCURRENCY_CPU_PRESSURE_THRESHOLD = 0.7  # busy fraction at which latency counts
+CONCURRENCY_MEMORY_PRESSURE_THRESHOLD = 0.25  # headroom at which latency counts
+CONCURRENCY_DECREASE_FACTOR = 0.5  # multiplicative decrease on overload
+CONCURRENCY_LATENCY_EWMA_ALPHA = 0.2
+CONCURRENCY_LATENCY_BASELINE_ALPHA = 0.01
 
 # Executor
 EXECUTOR_USER_OUTPUT_KEY = "__n8n_internal_user_output__"
@@ -44,22 +68,46 @@ EXECUTOR_PER_ITEM_FILENAME = "<per_item_task_execution>"
 EXECUTOR_FILENAMES = {EXECUTOR_ALL_ITEMS_FILENAME, EXECUTOR_PER_ITEM_FILENAME}
 SIGTERM_EXIT_CODE = -15
 SIGKILL_EXIT_CODE = -9
-PIPE_MSG_PREFIX_LENGTH = 4  # bytes
+PIPE_FRAME_VERSION = 1
+PIPE_FRAME_HEADER_FORMAT = ">BBBQ"  # version, frame type, flags, payload length
+PIPE_FRAME_FLAG_COMPRESSED = 0x01
+PIPE_FRAME_MAX_CHUNK_SIZE = 256 * 1024 * 1024  # bytes per result chunk frame
+PIPE_FRAME_MAX_SIZE = (
+    PIPE_FRAME_MAX_CHUNK_SIZE  # bytes per frame, before and after decompression
+)
+PIPE_BUFFER_SIZE = 1024 * 1024  # bytes, Linux default of /proc/sys/fs/pipe-max-size
+PIPE_DEFAULT_BUFFER_SIZE = 64 * 1024  # bytes, Linux default pipe capacity
+PIPE_FRAME_COMPRESSION_LEVEL = 1  # zlib, favouring speed over ratio
+DEFAULT_PIPE_COMPRESSION_THRESHOLD = 0  # bytes, 0 disables compression
 PIPE_MSG_MAX_SIZE = (
-    2 ** (PIPE_MSG_PREFIX_LENGTH * 8) - 1
-)  # bytes (~4 GiB with 4-byte prefix)
+    16 * 1024 * 1024 * 1024
+)  # bytes, all frames of a message decompressed
+
+# Supervisor
+DEFAULT_SUPERVISOR_PROCESSES = 1  # runner processes, 1 means no supervisor
+SUPERVISOR_RESTART_DELAY = 1  # seconds
+SUPERVISOR_REPORT_INTERVAL = 1  # seconds
+SUPERVISOR_GRANT_TOKEN_TIMEOUT = 5  # seconds
+PR_SET_PDEATHSIG = 1  # prctl option from linux/prctl.h
 
 # Broker
 DEFAULT_TASK_BROKER_URI = "http://127.0.0.1:5679"
 TASK_BROKER_WS_PATH = "/runners/_ws"
+TASK_BROKER_AUTH_PATH = "/runners/auth"
 
 # Health check
 DEFAULT_HEALTH_CHECK_SERVER_HOST = "127.0.0.1"
 DEFAULT_HEALTH_CHECK_SERVER_PORT = 5681
+READINESS_MAX_START_FAILURES = (
+    3  # consecutive subprocess start failures before not ready
+)
+READINESS_MAX_LATENCY_FRACTION = 0.5  # of the task timeout, for recent task latency
+TASK_LATENCY_EWMA_ALPHA = 0.2
 
 # Env vars
 ENV_TASK_BROKER_URI = "N8N_RUNNERS_TASK_BROKER_URI"
 ENV_GRANT_TOKEN = "N8N_RUNNERS_GRANT_TOKEN"
+ENV_AUTH_TOKEN = "N8N_RUNNERS_AUTH_TOKEN"
 ENV_MAX_CONCURRENCY = "N8N_RUNNERS_MAX_CONCURRENCY"
 ENV_MAX_PAYLOAD_SIZE = "N8N_RUNNERS_MAX_PAYLOAD"
 ENV_TASK_TIMEOUT = "N8N_RUNNERS_TASK_TIMEOUT"
@@ -71,9 +119,22 @@ ENV_BUILTINS_DENY = "N8N_RUNNERS_BUILTINS_DENY"
 ENV_HEALTH_CHECK_SERVER_ENABLED = "N8N_RUNNERS_HEALTH_CHECK_SERVER_ENABLED"
 ENV_HEALTH_CHECK_SERVER_HOST = "N8N_RUNNERS_HEALTH_CHECK_SERVER_HOST"
 ENV_HEALTH_CHECK_SERVER_PORT = "N8N_RUNNERS_HEALTH_CHECK_SERVER_PORT"
+ENV_PIPE_COMPRESSION_THRESHOLD = "N8N_RUNNERS_PIPE_COMPRESSION_THRESHOLD"
+ENV_WARM_UP_ENABLED = "N8N_RUNNERS_WARM_UP_ENABLED"
+ENV_ADAPTIVE_CONCURRENCY_ENABLED = "N8N_RUNNERS_ADAPTIVE_CONCURRENCY_ENABLED"
+ENV_MIN_CONCURRENCY = "N8N_RUNNERS_MIN_CONCURRENCY"
+ENV_MEMORY_BUDGET = "N8N_RUNNERS_MEMORY_BUDGET"
+ENV_RESULT_CACHE_ENABLED = "N8N_RUNNERS_RESULT_CACHE_ENABLED"
+ENV_RESULT_CACHE_TTL = "N8N_RUNNERS_RESULT_CACHE_TTL"
+ENV_RESULT_CACHE_MAX_SIZE = "N8N_RUNNERS_RESULT_CACHE_MAX_SIZE"
+ENV_SUPERVISOR_PROCESSES = "N8N_RUNNERS_SUPERVISOR_PROCESSES"
 ENV_LAUNCHER_LOG_LEVEL = "N8N_RUNNERS_LAUNCHER_LOG_LEVEL"
+ENV_LOG_FORMAT = "N8N_RUNNERS_LOG_FORMAT"
 ENV_BLOCK_RUNNER_ENV_ACCESS = "N8N_BLOCK_RUNNER_ENV_ACCESS"
 ENV_SENTRY_DSN = "N8N_SENTRY_DSN"
+ENV_SENTRY_SAMPLE_RATES = "N8N_RUNNERS_SENTRY_SAMPLE_RATES"
+ENV_SENTRY_RATE_LIMIT = "N8N_RUNNERS_SENTRY_RATE_LIMIT"
+ENV_SENTRY_DEDUP_WINDOW = "N8N_RUNNERS_SENTRY_DEDUP_WINDOW"
 ENV_N8N_VERSION = "N8N_VERSION"
 ENV_ENVIRONMENT = "ENVIRONMENT"
 ENV_DEPLOYMENT_NAME = "DEPLOYMENT_NAME"
@@ -81,6 +142,15 @@ ENV_DEPLOYMENT_NAME = "DEPLOYMENT_NAME"
 # Sentry
 SENTRY_TAG_SERVER_TYPE_KEY = "server_type"
 SENTRY_TAG_SERVER_TYPE_VALUE = "task_runner_python"
+SENTRY_SAMPLE_RATE_WILDCARD = "*"  # sample rate key matching all other error types
+DEFAULT_SENTRY_RATE_LIMIT = 60  # events per window, 0 disables
+SENTRY_RATE_LIMIT_WINDOW = 60  # seconds
+DEFAULT_SENTRY_DEDUP_WINDOW = (
+    300  # seconds to drop repeats of a fingerprint, 0 disables
+)
+SENTRY_FINGERPRINT_FRAMES = 5  # innermost frames per exception in a fingerprint
+SENTRY_CAPTURE_QUEUE_SIZE = 1000  # error records waiting for the capture thread
+SENTRY_SHUTDOWN_TIMEOUT = 2.0  # seconds
 IGNORED_ERROR_TYPES = (
     ConfigurationError,
     TaskRuntimeError,
@@ -94,11 +164,13 @@ IGNORED_ERROR_TYPES = (
 # Logging
 LOG_FORMAT = "%(asctime)s.%(msecs)03d\t%(levelname)s\t%(message)s"
 LOG_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FORMAT_JSON = "json"
 LOG_TASK_COMPLETE = 'Completed task {task_id} in {duration} ({result_size}) for node "{node_name}" ({node_id}) in workflow "{workflow_name}" ({workflow_id})'
-LOG_TASK_CANCEL = 'Cancelled task {task_id} for node "{node_name}" ({node_id}) in workflow "{workflow_name}" ({workflow_id})'
+LOG_TASK_CANCEL = 'Cancelled task {task_id} in {duration} for node "{node_name}" ({node_id}) in workflow "{workflow_name}" ({workflow_id})'
 LOG_TASK_CANCEL_UNKNOWN = (
     "Received cancel for unknown task: {task_id}. Discarding message."
 )
+LOG_WARM_UP_COMPLETE = "Warm-up completed in {duration} (forkserver: {forkserver}, validation: {validation}, task: {task})"
 LOG_TASK_CANCEL_WAITING = "Cancelled task {task_id} (waiting for settings)"
 LOG_SENTRY_MISSING = "Sentry is enabled but sentry-sdk is not installed. Install with: uv sync --all-extras"
 
@@ -110,6 +182,12 @@ TASK_REJECTED_REASON_OFFER_EXPIRED = (
     "Offer expired - not accepted within validity window"
 )
 TASK_REJECTED_REASON_AT_CAPACITY = "No open task slots - runner already at capacity"
+TASK_REJECTED_REASON_SHUTTING_DOWN = (
+    "Runner is shutting down - no longer accepting tasks"
+)
+TASK_REJECTED_REASON_MEMORY_PRESSURE = (
+    "Not enough memory - task would exceed the runner's memory budget"
+)
 
 # Security
 BUILTINS_DENY_DEFAULT = "eval,exec,compile,open,input,breakpoint,getattr,object,type,vars,setattr,delattr,hasattr,dir,memoryview,__build_class__,globals,locals,license,help,credits,copyright"
@@ -1,17 +1,33 @@
 import asyncio
 import errno
+import json
 import logging
+from typing import Any, Callable
 
 from src.config.health_check_config import HealthCheckConfig
 
 HEALTH_CHECK_RESPONSE = (
     b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 2\r\n\r\nOK"
 )
+HEALTH_CHECK_LIVENESS_PATH = "/healthz"
+HEALTH_CHECK_READINESS_PATH = "/readyz"
+HEALTH_CHECK_METRICS_PATH = "/metrics"
+HEALTH_CHECK_REQUEST_TIMEOUT = 1  # seconds
+HTTP_STATUS_LINES = {200: "200 OK", 503: "503 Service Unavailable"}
+
+type MetricsProvider = Callable[[], dict[str, Any]]
+type ReadinessProvider = Callable[[], dict[str, Any]]  # with a boolean "ready" key
 
 
 class HealthCheckServer:
-    def __init__(self):
+    def __init__(
+        self,
+        metrics_provider: MetricsProvider | None = None,
+        readiness_provider: ReadinessProvider | None = None,
+    ):
         self.server: asyncio.Server | None = None
+        self.metrics_provider = metrics_provider
+        self.readiness_provider = readiness_provider
         self.logger = logging.getLogger(__name__)
 
     async def start(self, config: HealthCheckConfig) -> None:
@@ -38,13 +54,49 @@ class HealthCheckServer:
             self.logger.info("Health check server stopped")
 
     async def _handle_request(
-        self, _reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
         try:
-            writer.write(HEALTH_CHECK_RESPONSE)
+            path = await self._read_request_path(reader)
+            response = self._route(path)
+
+            writer.write(response)
             await writer.drain()
         except Exception:
             pass
         finally:
             writer.close()
             await writer.wait_closed()
+
+    async def _read_request_path(self, reader: asyncio.StreamReader) -> str | None:
+        try:
+            request_line = await asyncio.wait_for(
+                reader.readline(), timeout=HEALTH_CHECK_REQUEST_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return None
+
+        parts = request_line.decode("latin-1").split()
+        return parts[1] if len(parts) >= 2 else None
+
+    def _route(self, path: str | None) -> bytes:
+        if path == HEALTH_CHECK_LIVENESS_PATH:
+            return self._json_response(200, {"status": "ok"})
+
+        if path == HEALTH_CHECK_READINESS_PATH and self.readiness_provider:
+            readiness = self.readiness_provider()
+            return self._json_response(200 if readiness["ready"] else 503, readiness)
+
+        if path == HEALTH_CHECK_METRICS_PATH and self.metrics_provider:
+            return self._json_response(200, self.metrics_provider())
+
+        return HEALTH_CHECK_RESPONSE
+
+    def _json_response(self, status: int, payload: dict[str, Any]) -> bytes:
+        body = json.dumps(payload).encode("utf-8")
+        headers = (
+            f"HTTP/1.1 {HTTP_STATUS_LINES[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        return headers.encode("latin-1") + body
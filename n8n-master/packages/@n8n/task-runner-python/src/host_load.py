@@ -0,0 +1,112 @@
+import os
+from dataclasses import dataclass
+
+PROC_STAT_PATH = "/proc/stat"
+PROC_MEMINFO_PATH = "/proc/meminfo"
+CGROUP_MEMORY_MAX_PATH = "/sys/fs/cgroup/memory.max"
+CGROUP_MEMORY_CURRENT_PATH = "/sys/fs/cgroup/memory.current"
+PROC_STATM_PATH = "/proc/{pid}/statm"
+
+
+@dataclass(slots=True)
+class HostLoad:
+    cpu_saturation: float | None  # busy fraction of all CPUs since the last sample
+    memory_headroom: float | None  # available fraction of the memory limit
+
+
+class HostLoadSampler:
+    """Responsible for sampling CPU saturation and memory headroom of the host or container.
+
+    Signals that cannot be read on this platform are reported as None.
+    """
+
+    def __init__(self):
+        self._last_cpu_times: tuple[int, int] | None = None  # (busy, total) jiffies
+
+    def sample(self) -> HostLoad:
+        return HostLoad(
+            cpu_saturation=self._cpu_saturation(),
+            memory_headroom=read_memory_headroom(),
+        )
+
+    def _cpu_saturation(self) -> float | None:
+        cpu_times = read_cpu_times()
+
+        if cpu_times is None:
+            return load_average_saturation()
+
+        last_cpu_times, self._last_cpu_times = self._last_cpu_times, cpu_times
+
+        if last_cpu_times is None:
+            return None  # need two samples for a delta
+
+        busy = cpu_times[0] - last_cpu_times[0]
+        total = cpu_times[1] - last_cpu_times[1]
+        return busy / total if total > 0 else None
+
+
+def read_cpu_times() -> tuple[int, int] | None:
+    """Busy and total jiffies across all CPUs, from the aggregate line of /proc/stat."""
+
+    try:
+        with open(PROC_STAT_PATH) as f:
+            fields = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+    total = sum(fields[:8])  # guest time is already included in user time
+    return total - idle, total
+
+
+def load_average_saturation() -> float | None:
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+def read_memory_limit() -> tuple[int, int] | None:
+    """Used and total bytes of memory, preferring the cgroup limit over host memory."""
+
+    try:
+        with open(CGROUP_MEMORY_MAX_PATH) as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open(CGROUP_MEMORY_CURRENT_PATH) as f:
+                return int(f.read().strip()), int(limit)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        meminfo = {}
+        with open(PROC_MEMINFO_PATH) as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0]) * 1024  # kB
+        total = meminfo["MemTotal"]
+        return total - meminfo["MemAvailable"], total
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def read_rss(pid: int) -> int | None:
+    """Resident set size of a process in bytes, or None if it cannot be read, e.g. it has exited."""
+
+    try:
+        with open(PROC_STATM_PATH.format(pid=pid)) as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def read_memory_headroom() -> float | None:
+    memory = read_memory_limit()
+
+    if memory is None:
+        return None
+
+    used, total = memory
+    return max(0.0, (total - used) / total)
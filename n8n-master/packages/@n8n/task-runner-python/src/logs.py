@@ -1,7 +1,18 @@
+import atexit
+import copy
+import json
+import queue
 import sys
 import logging
+import logging.handlers
 import os
-from src.constants import LOG_FORMAT, LOG_TIMESTAMP_FORMAT, ENV_LAUNCHER_LOG_LEVEL
+from src.constants import (
+    LOG_FORMAT,
+    LOG_FORMAT_JSON,
+    LOG_TIMESTAMP_FORMAT,
+    ENV_LAUNCHER_LOG_LEVEL,
+    ENV_LOG_FORMAT,
+)
 
 COLORS = {
     "DEBUG": "\033[34m",  # blue
@@ -27,38 +38,99 @@ class ColorFormatter(logging.Formatter):
         if self.short_form:
             return record.getMessage()
 
-        formatted = super().format(record)
-
         if not self.use_colors:
-            return formatted
+            return super().format(record)
+
+        timestamp = f"{self.formatTime(record, self.datefmt)}.{int(record.msecs):03d}"
+        level = record.levelname
+        message = record.getMessage()
+
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+
+        level_color = COLORS.get(record.levelname, "")
+        if level_color:
+            level = level_color + level + RESET
+            message = level_color + message + RESET
+
+        return f"{timestamp}  {level}  {message}"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with task context passed as `extra={"task": {...}}` kept as structured fields.
+
+    Context fields never replace the core fields of the entry.
+    """
+
+    def format(self, record):
+        entry = {
+            "timestamp": f"{self.formatTime(record, LOG_TIMESTAMP_FORMAT)}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
 
-        parts = formatted.split("\t")
+        task_context = getattr(record, "task", None)
+        if task_context:
+            for key, value in task_context.items():
+                entry.setdefault(key, value)
 
-        if len(parts) >= 3:
-            timestamp = parts[0]
-            level = parts[1]
-            message = " ".join(parts[2:])
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
 
-            level_color = COLORS.get(record.levelname, "")
-            if level_color:
-                level = level_color + level + RESET
-                message = level_color + message + RESET
+        return json.dumps(entry, default=str, ensure_ascii=False)
 
-            formatted = f"{timestamp}  {level}  {message}"
 
-        return formatted
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records for a listener in the same process, keeping `exc_info`
+    so that the listener's formatter renders the exception itself."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: logging.handlers.QueueListener | None = None
 
 
 def setup_logging():
+    """Log through a queue, so that the event loop only enqueues records and a
+    listener thread formats and writes them to stdout.
+
+    Calling it again replaces the queue handler and listener of the previous call.
+    """
+
+    global _listener
+
     logger = logging.getLogger()
 
+    for handler in logger.handlers[:]:
+        if isinstance(handler, LocalQueueHandler):
+            logger.removeHandler(handler)
+
+    if _listener is not None:
+        atexit.unregister(_listener.stop)
+        _listener.stop()
+        _listener = None
+
     log_level_str = os.getenv(ENV_LAUNCHER_LOG_LEVEL, "INFO").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
     logger.setLevel(log_level)
 
     stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(ColorFormatter(LOG_FORMAT, LOG_TIMESTAMP_FORMAT))
-    logger.addHandler(stream_handler)
+    if os.getenv(ENV_LOG_FORMAT, "").lower() == LOG_FORMAT_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(ColorFormatter(LOG_FORMAT, LOG_TIMESTAMP_FORMAT))
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(LocalQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)  # flushes queued records on exit
 
     # Hardcoded to INFO as websocket logs are too verbose
     logging.getLogger("websockets.client").setLevel(logging.INFO)
@@ -2,23 +2,41 @@ import asyncio
 import logging
 import sys
 import platform
+from typing import TYPE_CHECKING
 
 from src.constants import ERROR_WINDOWS_NOT_SUPPORTED
 from src.config.health_check_config import HealthCheckConfig
 from src.config.sentry_config import SentryConfig
+from src.config.supervisor_config import SupervisorConfig
 from src.config.task_runner_config import TaskRunnerConfig
 from src.errors import ConfigurationError
 from src.logs import setup_logging
-from src.task_runner import TaskRunner
 from src.shutdown import Shutdown
 
+if TYPE_CHECKING:
+    from src.health_check_server import (
+        HealthCheckServer,
+        MetricsProvider,
+        ReadinessProvider,
+    )
+    from src.supervisor import Supervisor
+    from src.task_runner import TaskRunner
+
+# Heavy modules (websockets, message types, analyzer, executor) are imported only
+# once needed, because the forkserver preloads this module and every task
+# subprocess would otherwise inherit them.
+
 
 async def main():
     setup_logging()
     logger = logging.getLogger(__name__)
 
     sentry = None
-    sentry_config = SentryConfig.from_env()
+    try:
+        sentry_config = SentryConfig.from_env()
+    except ConfigurationError as e:
+        logger.error(f"Invalid Sentry configuration: {e}")
+        sys.exit(1)
 
     if sentry_config.enabled:
         from src.sentry import setup_sentry
@@ -31,24 +49,40 @@ async def main():
         logger.error(f"Invalid health check configuration: {e}")
         sys.exit(1)
 
+    try:
+        task_runner_config = TaskRunnerConfig.from_env()
+        supervisor_config = SupervisorConfig.from_env()
+    except ConfigurationError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    task_runner: "TaskRunner | Supervisor"
+    metrics_provider: "MetricsProvider"
+    readiness_provider: "ReadinessProvider"
+    if supervisor_config.enabled:
+        from src.supervisor import Supervisor
+
+        task_runner = Supervisor(task_runner_config, supervisor_config)
+        metrics_provider = task_runner.metrics
+        readiness_provider = task_runner.readiness
+    else:
+        from src.task_runner import TaskRunner
+
+        task_runner = TaskRunner(task_runner_config)
+        metrics_provider = task_runner.metrics.to_dict
+        readiness_provider = task_runner.readiness
+
     health_check_server: "HealthCheckServer | None" = None
     if health_check_config.enabled:
         from src.health_check_server import HealthCheckServer
 
-        health_check_server = HealthCheckServer()
+        health_check_server = HealthCheckServer(metrics_provider, readiness_provider)
         try:
             await health_check_server.start(health_check_config)
         except OSError as e:
             logger.error(f"Failed to start health check server: {e}")
             sys.exit(1)
 
-    try:
-        task_runner_config = TaskRunnerConfig.from_env()
-    except ConfigurationError as e:
-        logger.error(str(e))
-        sys.exit(1)
-
-    task_runner = TaskRunner(task_runner_config)
     logger.info("Starting runner...")
 
     shutdown = Shutdown(task_runner, health_check_server, sentry)
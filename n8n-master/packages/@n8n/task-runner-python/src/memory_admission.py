@@ -0,0 +1,48 @@
+import os
+from typing import Iterable
+
+from src.constants import MEMORY_PAYLOAD_FACTOR, MEMORY_TASK_BASELINE
+from src.host_load import read_rss
+from src.runner_metrics import RunnerMetrics
+from src.task_state import TaskState
+
+
+class MemoryAdmission:
+    """Responsible for admitting tasks only while projected memory use stays within budget.
+
+    Projected use is the runner's own RSS plus, per task, the larger of the
+    subprocess RSS and an estimate derived from the size of the task payload.
+    """
+
+    def __init__(self, budget: int, metrics: RunnerMetrics):
+        self.budget = budget  # bytes
+        self.metrics = metrics
+
+    @staticmethod
+    def estimate(payload_size: int) -> int:
+        return MEMORY_TASK_BASELINE + payload_size * MEMORY_PAYLOAD_FACTOR
+
+    def projected_usage(self, tasks: Iterable[TaskState]) -> int:
+        usage = read_rss(os.getpid()) or 0
+
+        for task_state in tasks:
+            process = task_state.process
+            rss = read_rss(process.pid) if process and process.pid else None
+            usage += max(MEMORY_TASK_BASELINE, task_state.memory_estimate, rss or 0)
+
+        self.metrics.memory_projected_usage = usage
+        return usage
+
+    def can_admit(self, tasks: Iterable[TaskState]) -> bool:
+        return self.free_slots(tasks) > 0
+
+    def fits(self, tasks: Iterable[TaskState], memory_estimate: int) -> bool:
+        """Whether a task of known size fits in the budget alongside `tasks`."""
+
+        return self.projected_usage(tasks) + memory_estimate <= self.budget
+
+    def free_slots(self, tasks: Iterable[TaskState]) -> int:
+        """Number of further tasks of baseline size that fit in the budget."""
+
+        headroom = self.budget - self.projected_usage(tasks)
+        return max(0, headroom // MEMORY_TASK_BASELINE)
@@ -122,7 +122,12 @@ class MessageSerde:
         if message_type not in MESSAGE_TYPE_MAP:
             raise ValueError(f"Unknown message type: {message_type}")
 
-        return MESSAGE_TYPE_MAP[message_type](message_dict)
+        message = MESSAGE_TYPE_MAP[message_type](message_dict)
+
+        if isinstance(message, BrokerTaskSettings):
+            message.settings.payload_size = len(data)
+
+        return message
 
     @staticmethod
     def serialize_runner_message(message: RunnerMessage) -> str:
@@ -1,6 +1,9 @@
+import struct
+from enum import IntEnum
 from typing import Any, TypedDict
 
 from src.message_types.broker import Items
+from src.constants import PIPE_FRAME_HEADER_FORMAT
 
 PrintArgs = list[list[Any]]  # Args to all `print()` calls in a Python code task
 
@@ -23,3 +26,21 @@ class PipeErrorMessage(TypedDict):
 
 
 PipeMessage = PipeResultMessage | PipeErrorMessage
+
+
+class PipeFrameType(IntEnum):
+    """Frames written by a task subprocess, terminated by an END frame."""
+
+    RESULT_CHUNK = 1  # consecutive slices of the JSON-encoded result items
+    ERROR = 2  # JSON-encoded TaskErrorInfo
+    PRINT = 3  # JSON-encoded args of one `print()` call
+    METRICS = 4  # JSON-encoded PipeMetrics
+    END = 6  # empty, marks a complete message
+
+
+class PipeMetrics(TypedDict):
+    max_rss_kb: int
+    cpu_time: float  # seconds
+
+
+PIPE_FRAME_HEADER = struct.Struct(PIPE_FRAME_HEADER_FORMAT)
@@ -5,6 +5,7 @@ import string
 NANOID_CHARSET = string.ascii_uppercase + string.ascii_lowercase + string.digits
 TARGET_NANOID_LEN = 22
 CHARSET_LEN = len(NANOID_CHARSET)
+RANDOM_BYTES_PER_BATCH = 32  # 62/64 acceptance, so one batch nearly always suffices
 
 # Collision probability is roughly k^2/(2n) where k=IDs generated, n=possibilities
 # At 10^12 IDs generated with 62^22 possibilities -> ~1.8e-16 chance of collision
@@ -14,8 +15,13 @@ def nanoid() -> str:
     chars = []
 
     while len(chars) < TARGET_NANOID_LEN:
-        index = secrets.randbits(6)
-        if index < CHARSET_LEN:
-            chars.append(NANOID_CHARSET[index])
+        # one urandom call per batch instead of one per char; 6 low bits per byte,
+        # rejecting indexes past the charset to keep the distribution uniform
+        for byte in secrets.token_bytes(RANDOM_BYTES_PER_BATCH):
+            index = byte & 63
+            if index < CHARSET_LEN:
+                chars.append(NANOID_CHARSET[index])
+                if len(chars) == TARGET_NANOID_LEN:
+                    break
 
     return "".join(chars)
@@ -1,6 +1,7 @@
 import json
 import os
 import threading
+import zlib
 from typing import cast
 
 from multiprocessing.connection import Connection
@@ -9,11 +10,28 @@ from src.errors import (
     InvalidPipeMsgContentError,
     InvalidPipeMsgLengthError,
 )
-from src.message_types.pipe import PipeMessage
-from src.constants import PIPE_MSG_PREFIX_LENGTH
+from src.message_types.pipe import (
+    PIPE_FRAME_HEADER,
+    PipeFrameType,
+    PipeMessage,
+    PipeMetrics,
+)
+from src.constants import (
+    PIPE_FRAME_VERSION,
+    PIPE_FRAME_FLAG_COMPRESSED,
+    PIPE_FRAME_MAX_SIZE,
+    PIPE_MSG_MAX_SIZE,
+)
 
 type PipeConnection = Connection
 
+PAYLOAD_FRAME_TYPES = {
+    PipeFrameType.RESULT_CHUNK,
+    PipeFrameType.ERROR,
+    PipeFrameType.PRINT,
+    PipeFrameType.METRICS,
+}
+
 
 class PipeReader(threading.Thread):
     """Background thread that reads result from pipe."""
@@ -24,41 +42,120 @@ class PipeReader(threading.Thread):
         self.read_conn = read_conn
         self.pipe_message: PipeMessage | None = None
         self.message_size: int | None = None  # bytes
+        self.metrics: PipeMetrics | None = None
         self.error: Exception | None = None
 
     def run(self):
         try:
-            length_bytes = PipeReader._read_exact_bytes(
-                self.read_fd, PIPE_MSG_PREFIX_LENGTH
-            )
-            length_int = int.from_bytes(length_bytes, "big")
-            if length_int <= 0:
-                raise InvalidPipeMsgLengthError(length_int)
-            self.message_size = length_int
-            data = PipeReader._read_exact_bytes(self.read_fd, length_int)
-            parsed_msg = json.loads(data.decode("utf-8"))
+            result_chunks: list[bytearray] = []
+            error = None
+            print_args = []
+            message_size = 0
+
+            while True:
+                frame_type, payload = self._read_frame()
+
+                if frame_type == PipeFrameType.END:
+                    break
+
+                message_size += len(payload)
+                if message_size > PIPE_MSG_MAX_SIZE:
+                    raise InvalidPipeMsgLengthError(message_size)
+
+                if frame_type == PipeFrameType.RESULT_CHUNK:
+                    result_chunks.append(payload)
+                elif frame_type == PipeFrameType.ERROR:
+                    error = json.loads(payload)
+                elif frame_type == PipeFrameType.PRINT:
+                    print_args.append(json.loads(payload))
+                elif frame_type == PipeFrameType.METRICS:
+                    self.metrics = json.loads(payload)
+
+            parsed_msg: dict = {"print_args": print_args}
+            if result_chunks:
+                parsed_msg["result"] = PipeReader._parse_result(result_chunks)
+            if error is not None:
+                parsed_msg["error"] = error
+
+            self.message_size = message_size
             self.pipe_message = self._validate_pipe_message(parsed_msg)
         except Exception as e:
             self.error = e
         finally:
             self.read_conn.close()
 
+    def _read_frame(self) -> tuple[PipeFrameType, bytearray]:
+        header = PipeReader._read_exact_bytes(self.read_fd, PIPE_FRAME_HEADER.size)
+        version, frame_type, flags, length = PIPE_FRAME_HEADER.unpack(header)
+
+        if version != PIPE_FRAME_VERSION:
+            raise InvalidPipeMsgContentError(f"Unsupported frame version {version}")
+
+        try:
+            frame_type = PipeFrameType(frame_type)
+        except ValueError:
+            raise InvalidPipeMsgContentError(f"Unknown frame type {frame_type}")
+
+        if frame_type in PAYLOAD_FRAME_TYPES and length == 0:
+            raise InvalidPipeMsgLengthError(length)
+
+        if length > PIPE_FRAME_MAX_SIZE:
+            raise InvalidPipeMsgLengthError(length)
+
+        payload = PipeReader._read_exact_bytes(self.read_fd, length)
+
+        if flags & PIPE_FRAME_FLAG_COMPRESSED:
+            payload = PipeReader._decompress(payload)
+
+        return frame_type, payload
+
+    @staticmethod
+    def _decompress(payload: bytearray) -> bytearray:
+        """Decompress a frame payload, refusing to expand it beyond the frame size limit."""
+
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(payload, PIPE_FRAME_MAX_SIZE)
+
+        if decompressor.unconsumed_tail:
+            raise InvalidPipeMsgContentError(
+                f"Compressed frame expands beyond {PIPE_FRAME_MAX_SIZE} bytes"
+            )
+
+        if not decompressor.eof:
+            raise InvalidPipeMsgContentError("Compressed frame is truncated")
+
+        return bytearray(data)
+
+    @staticmethod
+    def _parse_result(chunks: list[bytearray]):
+        """Decode the result and release the raw bytes before parsing, so that at
+        most the text and the parsed items are alive together.
+
+        Passing bytes to json.loads() would decode them internally while keeping
+        the buffer alive for the whole parse.
+        """
+        data = chunks[0] if len(chunks) == 1 else bytearray().join(chunks)
+        chunks.clear()
+        text = data.decode("utf-8")
+        del data
+        return json.loads(text)
+
     @staticmethod
-    def _read_exact_bytes(fd: int, n: int) -> bytes:
+    def _read_exact_bytes(fd: int, n: int) -> bytearray:
         """Read exactly n bytes from file descriptor.
 
-        Uses os.read() instead of Connection.recv() because recv() pickles.
-        Preallocates bytearray to avoid repeated reallocation.
+        Uses os.readv() instead of Connection.recv() because recv() pickles.
+        Reads straight into a single preallocated buffer and returns it without copying.
         """
         result = bytearray(n)
-        offset = 0
-        while offset < n:
-            chunk = os.read(fd, n - offset)
-            if not chunk:
-                raise EOFError("Pipe closed before reading all data")
-            result[offset : offset + len(chunk)] = chunk
-            offset += len(chunk)
-        return bytes(result)
+        with memoryview(result) as view:
+            offset = 0
+            while offset < n:
+                read = os.readv(fd, [view[offset:]])
+                if read == 0:
+                    raise EOFError("Pipe closed before reading all data")
+                offset += read
+        return result
 
     def _validate_pipe_message(self, msg) -> PipeMessage:
         if not isinstance(msg, dict):
@@ -0,0 +1,30 @@
+import asyncio
+
+from multiprocessing.process import BaseProcess
+
+
+async def wait_for_process_exit(process: BaseProcess) -> None:
+    """Wait for a subprocess to exit without blocking the event loop or reaping it.
+
+    The process sentinel becomes readable once the process has exited, so the
+    event loop is notified instead of a thread blocking on `join()`.
+    """
+
+    try:
+        sentinel = process.sentinel
+    except ValueError:
+        return  # not started or already closed
+
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+
+    def on_sentinel_ready():
+        loop.remove_reader(sentinel)
+        if not exited.done():
+            exited.set_result(None)
+
+    loop.add_reader(sentinel, on_sentinel_ready)
+    try:
+        await exited
+    finally:
+        loop.remove_reader(sentinel)
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.config.security_config import SecurityConfig
+from src.constants import RESULT_CACHE_MARKER
+from src.message_types.broker import Items, TaskSettings
+from src.message_types.pipe import PrintArgs
+from src.runner_metrics import RunnerMetrics
+
+CacheKey = str  # sha256 over code, node mode, inputs and security config
+
+
+@dataclass(slots=True)
+class CachedResult:
+    result: Items
+    print_args: PrintArgs
+    size: int  # bytes
+    expires_at: float  # monotonic clock
+
+
+class ResultCache:
+    """Responsible for caching results of tasks whose code declares itself cacheable.
+
+    Entries expire after a TTL and are evicted least recently used first once
+    the total size of cached results exceeds the size budget.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        max_size: int,
+        security_config: SecurityConfig,
+        metrics: RunnerMetrics,
+    ):
+        self.ttl = ttl  # seconds
+        self.max_size = max_size  # bytes
+        self.size = 0  # bytes
+        self.metrics = metrics
+        self._entries: OrderedDict[CacheKey, CachedResult] = OrderedDict()
+        self._security_fingerprint = ResultCache._fingerprint(security_config)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def is_cacheable(code: str) -> bool:
+        return any(line.strip() == RESULT_CACHE_MARKER for line in code.splitlines())
+
+    def key(self, task_settings: TaskSettings) -> CacheKey:
+        inputs = json.dumps(
+            [task_settings.items, task_settings.query],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+
+        digest = hashlib.sha256()
+        for part in (
+            hashlib.sha256(task_settings.code.encode()).hexdigest(),
+            hashlib.sha256(inputs.encode()).hexdigest(),
+            task_settings.node_mode,
+            self._security_fingerprint,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        entry = self._entries.get(key)
+
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.metrics.result_cache_misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.metrics.result_cache_hits += 1
+        return entry
+
+    def put(
+        self, key: CacheKey, result: Items, print_args: PrintArgs, size: int
+    ) -> None:
+        if size > self.max_size:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        while self._entries and self.size + size > self.max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.metrics.result_cache_evictions += 1
+
+        self._entries[key] = CachedResult(
+            result=result,
+            print_args=print_args,
+            size=size,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self.size += size
+        self.metrics.result_cache_size = self.size
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        self.metrics.result_cache_size = self.size
+
+    @staticmethod
+    def _fingerprint(security_config: SecurityConfig) -> str:
+        config = json.dumps(
+            [
+                sorted(security_config.stdlib_allow),
+                sorted(security_config.external_allow),
+                sorted(security_config.builtins_deny),
+                security_config.runner_env_deny,
+            ]
+        )
+        return hashlib.sha256(config.encode()).hexdigest()
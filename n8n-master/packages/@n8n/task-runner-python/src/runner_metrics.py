@@ -0,0 +1,42 @@
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.constants import TASK_LATENCY_EWMA_ALPHA
+
+
+@dataclass(slots=True)
+class RunnerMetrics:
+    """Counters maintained incrementally by the task runner."""
+
+    warm_up_duration: float | None = None  # seconds
+    tasks_cancelled: int = 0
+    cancel_latency_total: float = 0.0  # seconds from cancel request to freed slot
+    cancel_latency_max: float = 0.0  # seconds
+    result_cache_hits: int = 0
+    result_cache_misses: int = 0
+    result_cache_evictions: int = 0
+    result_cache_size: int = 0  # bytes
+    concurrency_limit: int | None = None  # offered slots, if adaptive
+    concurrency_increases: int = 0
+    concurrency_decreases: int = 0
+    concurrency_last_reason: str | None = None
+    memory_projected_usage: int | None = None  # bytes, if memory admission is enabled
+    tasks_rejected_memory: int = 0
+    task_latency_ewma: float | None = None  # seconds, of completed tasks
+    subprocess_start_failures: int = 0  # consecutive, reset by any started subprocess
+
+    def record_cancel(self, latency: float) -> None:
+        self.tasks_cancelled += 1
+        self.cancel_latency_total += latency
+        self.cancel_latency_max = max(self.cancel_latency_max, latency)
+
+    def record_task_latency(self, latency: float) -> None:
+        if self.task_latency_ewma is None:
+            self.task_latency_ewma = latency
+        else:
+            self.task_latency_ewma += TASK_LATENCY_EWMA_ALPHA * (
+                latency - self.task_latency_ewma
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
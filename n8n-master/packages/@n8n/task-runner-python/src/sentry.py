@@ -1,45 +1,273 @@
+import contextvars
 import logging
-from typing import Any
+import random
+import threading
+import time
+from queue import Full, Queue
+from typing import Any, Callable
 
 from src.config.sentry_config import SentryConfig
 from src.constants import (
     EXECUTOR_FILENAMES,
     IGNORED_ERROR_TYPES,
     LOG_SENTRY_MISSING,
+    SENTRY_CAPTURE_QUEUE_SIZE,
+    SENTRY_FINGERPRINT_FRAMES,
+    SENTRY_RATE_LIMIT_WINDOW,
+    SENTRY_SAMPLE_RATE_WILDCARD,
+    SENTRY_SHUTDOWN_TIMEOUT,
     SENTRY_TAG_SERVER_TYPE_KEY,
     SENTRY_TAG_SERVER_TYPE_VALUE,
 )
 
 
+CapturedRecord = tuple[logging.LogRecord, dict[str, Any] | None]
+
+
+class CaptureQueueHandler(logging.Handler):
+    """Responsible for handing error records over to the capture thread without blocking the caller.
+
+    Records without an exception carry no traceback, so their stack is taken
+    here, in the thread that logged them, before they are queued. Records
+    arriving while the queue is full are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        queue: Queue,
+        stacktrace: Callable[[], dict[str, Any]],
+        level: int = logging.ERROR,
+    ):
+        super().__init__(level=level)
+        self.queue = queue
+        self.stacktrace = stacktrace
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        __tracebackhide__ = True  # read by sentry_sdk to skip this frame
+        has_exception = record.exc_info is not None and record.exc_info[0] is not None
+        stacktrace = None if has_exception else self.stacktrace()
+        try:
+            self.queue.put_nowait((record, stacktrace))
+        except Full:
+            self.dropped += 1
+
+
 class TaskRunnerSentry:
-    def __init__(self, config: SentryConfig):
+    """Responsible for reporting runner errors to Sentry, sampled, deduplicated and rate-limited."""
+
+    def __init__(
+        self,
+        config: SentryConfig,
+        transport: Any = None,
+        random_source: Callable[[], float] = random.random,
+    ):
         self.config = config
+        self.transport = transport
+        self.random_source = random_source
         self.logger = logging.getLogger(__name__)
 
+        self._lock = threading.Lock()
+        self._last_seen: dict[str, float] = {}  # fingerprint -> monotonic time
+        self._window_started_at = 0.0
+        self._window_count = 0
+
+        self._queue: Queue[CapturedRecord | None] = Queue(
+            maxsize=SENTRY_CAPTURE_QUEUE_SIZE
+        )
+        self._handler = CaptureQueueHandler(self._queue, self._caller_stacktrace)
+        self._worker: threading.Thread | None = None
+        self._capturing: CapturedRecord | None = None  # only touched by the worker
+
+        self.events_sent = 0
+        self.dropped_sampled = 0
+        self.dropped_duplicate = 0
+        self.dropped_rate_limited = 0
+
+    @property
+    def dropped_queue_full(self) -> int:
+        return self._handler.dropped
+
     def init(self) -> None:
         import sentry_sdk
-        from sentry_sdk.integrations.logging import LoggingIntegration
+        from sentry_sdk.integrations.logging import EventHandler, LoggingIntegration
 
         sentry_sdk.init(
             dsn=self.config.dsn,
             release=f"n8n@{self.config.n8n_version}",
             environment=self.config.environment,
             server_name=self.config.deployment_name,
-            before_send=self._filter_out_ignored_errors,
+            before_send=self._before_send,
             attach_stacktrace=True,
             send_default_pii=False,
             auto_enabling_integrations=False,
             default_integrations=True,
-            integrations=[LoggingIntegration(level=logging.ERROR)],
+            # Events are captured by our own handler on a background thread,
+            # so that building and filtering them never runs on the event loop.
+            integrations=[LoggingIntegration(level=logging.ERROR, event_level=None)],
+            transport=self.transport,
         )
         sentry_sdk.set_tag(SENTRY_TAG_SERVER_TYPE_KEY, SENTRY_TAG_SERVER_TYPE_VALUE)
+
+        event_handler = EventHandler(level=logging.ERROR)
+        context = contextvars.copy_context()  # carries the scope holding our tags
+        self._worker = threading.Thread(
+            target=context.run,
+            args=(self._capture_records, event_handler),
+            name="sentry-capture",
+            daemon=True,
+        )
+        self._worker.start()
+        logging.getLogger().addHandler(self._handler)
+
         self.logger.info("Sentry ready")
 
     def shutdown(self) -> None:
         import sentry_sdk
 
-        sentry_sdk.flush(timeout=2.0)
-        self.logger.info("Sentry stopped")
+        logging.getLogger().removeHandler(self._handler)
+        if self._worker is not None:
+            try:
+                self._queue.put(None, timeout=SENTRY_SHUTDOWN_TIMEOUT)
+            except Full:
+                pass  # worker is stuck, the join below gives up on it
+            self._worker.join(timeout=SENTRY_SHUTDOWN_TIMEOUT)
+            self._worker = None
+
+        sentry_sdk.flush(timeout=SENTRY_SHUTDOWN_TIMEOUT)
+        self.logger.info(
+            f"Sentry stopped (sent: {self.events_sent}, dropped: sampled {self.dropped_sampled}, "
+            f"duplicate {self.dropped_duplicate}, rate limited {self.dropped_rate_limited}, "
+            f"queue full {self.dropped_queue_full})"
+        )
+
+    def _capture_records(self, event_handler: logging.Handler) -> None:
+        while (captured := self._queue.get()) is not None:
+            self._capturing = captured
+            try:
+                event_handler.handle(captured[0])
+            finally:
+                self._capturing = None
+
+    def _caller_stacktrace(self) -> dict[str, Any]:
+        from sentry_sdk.utils import current_stacktrace
+
+        __tracebackhide__ = True  # read by sentry_sdk to skip this frame
+        # Locals stay out, the caller keeps changing them after the record is queued.
+        return current_stacktrace(include_local_variables=False)
+
+    def _attach_caller_stack(self, event: Any, hint: Any) -> None:
+        """Replace the capture thread's stack that sentry_sdk attached with the logging caller's."""
+        captured = self._capturing
+        if captured is None or captured[1] is None:
+            return
+        record, stacktrace = captured
+        if hint.get("log_record") is not record:
+            return
+
+        from sentry_sdk import get_client
+        from sentry_sdk.utils import handle_in_app
+
+        event["threads"] = {
+            "values": [{"stacktrace": stacktrace, "crashed": False, "current": True}]
+        }
+        options = get_client().options
+        handle_in_app(
+            event,
+            options["in_app_exclude"],
+            options["in_app_include"],
+            options["project_root"],
+        )
+
+    # ========== Event filtering ==========
+
+    def _before_send(self, event: Any, hint: Any) -> Any | None:
+        if self._filter_out_ignored_errors(event, hint) is None:
+            return None
+
+        with self._lock:
+            if not self._is_sampled(event):
+                self.dropped_sampled += 1
+                return None
+
+            now = time.monotonic()
+
+            if self._is_duplicate(event, now):
+                self.dropped_duplicate += 1
+                return None
+
+            if self._is_rate_limited(now):
+                self.dropped_rate_limited += 1
+                return None
+
+            self.events_sent += 1
+
+        self._attach_caller_stack(event, hint)
+        return event
+
+    def _is_sampled(self, event: Any) -> bool:
+        rates = self.config.sample_rates
+        if not rates:
+            return True
+
+        exceptions = event.get("exception", {}).get("values", [])
+        exc_type_name = exceptions[-1].get("type", "") if exceptions else ""
+        rate = rates.get(exc_type_name, rates.get(SENTRY_SAMPLE_RATE_WILDCARD, 1.0))
+
+        return rate >= 1.0 or (rate > 0 and self.random_source() < rate)
+
+    def _is_duplicate(self, event: Any, now: float) -> bool:
+        window = self.config.dedup_window
+        if window == 0:
+            return False
+
+        cutoff = now - window
+        if len(self._last_seen) > 0 and next(iter(self._last_seen.values())) < cutoff:
+            self._last_seen = {
+                key: seen_at
+                for key, seen_at in self._last_seen.items()
+                if seen_at >= cutoff
+            }
+
+        fingerprint = self._fingerprint(event)
+        last_seen_at = self._last_seen.get(fingerprint)
+        if last_seen_at is not None and last_seen_at >= cutoff:
+            return True
+
+        self._last_seen.pop(fingerprint, None)
+        self._last_seen[fingerprint] = now  # insertion order == time order
+        return False
+
+    def _is_rate_limited(self, now: float) -> bool:
+        limit = self.config.rate_limit
+        if limit == 0:
+            return False
+
+        if now - self._window_started_at >= SENTRY_RATE_LIMIT_WINDOW:
+            self._window_started_at = now
+            self._window_count = 0
+
+        if self._window_count >= limit:
+            return True
+
+        self._window_count += 1
+        return False
+
+    def _fingerprint(self, event: Any) -> str:
+        parts: list[str] = []
+
+        for exception in event.get("exception", {}).get("values", []):
+            parts.append(exception.get("type", ""))
+            frames = exception.get("stacktrace", {}).get("frames", [])
+            for frame in frames[-SENTRY_FINGERPRINT_FRAMES:]:
+                parts.append(
+                    f"{frame.get('filename', '')}:{frame.get('function', '')}:{frame.get('lineno', '')}"
+                )
+
+        if not parts:  # plain log message without exception
+            parts.append(str(event.get("logentry", {}).get("message", "")))
+
+        return "|".join(parts)
 
     def _filter_out_ignored_errors(self, event: Any, hint: Any) -> Any | None:
         if "exc_info" in hint:
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from src.task_runner import TaskRunner
     from src.health_check_server import HealthCheckServer
     from src.sentry import TaskRunnerSentry
+    from src.supervisor import Supervisor
 
 
 class Shutdown:
@@ -14,7 +15,7 @@ class Shutdown:
 
     def __init__(
         self,
-        task_runner: "TaskRunner",
+        task_runner: "TaskRunner | Supervisor",
         health_check_server: "HealthCheckServer | None" = None,
         sentry: "TaskRunnerSentry | None" = None,
     ):
@@ -0,0 +1,304 @@
+import asyncio
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlparse
+
+from multiprocessing.context import SpawnProcess
+
+from src.config.sentry_config import SentryConfig
+from src.config.supervisor_config import SupervisorConfig
+from src.config.task_runner_config import TaskRunnerConfig
+from src.constants import (
+    PR_SET_PDEATHSIG,
+    SUPERVISOR_GRANT_TOKEN_TIMEOUT,
+    SUPERVISOR_REPORT_INTERVAL,
+    SUPERVISOR_RESTART_DELAY,
+    TASK_BROKER_AUTH_PATH,
+)
+from src.process_exit import wait_for_process_exit
+
+# Spawn instead of fork, so children do not inherit the supervisor's running event loop.
+SUPERVISOR_CONTEXT = multiprocessing.get_context("spawn")
+
+type RunningTasksCounts = Any  # shared ctypes array of ints, one slot per runner
+
+
+def split_concurrency(max_concurrency: int, processes: int) -> list[int]:
+    """Spread max concurrency across runner processes, as evenly as possible."""
+
+    base, remainder = divmod(max_concurrency, processes)
+    return [base + (1 if i < remainder else 0) for i in range(processes)]
+
+
+def fetch_grant_token(auth_url: str, auth_token: str) -> str:
+    """Exchange the auth token for a single-use grant token, as the n8n launcher does for each runner."""
+
+    request = urllib.request.Request(
+        auth_url,
+        data=json.dumps({"token": auth_token}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(
+        request, timeout=SUPERVISOR_GRANT_TOKEN_TIMEOUT
+    ) as response:
+        return json.load(response)["data"]["token"]
+
+
+@dataclass
+class RunnerProcess:
+    index: int
+    config: TaskRunnerConfig
+    process: SpawnProcess | None = None
+    restarts: int = 0
+
+
+class Supervisor:
+    """Responsible for launching, restarting and stopping multiple task runner processes."""
+
+    def __init__(self, config: TaskRunnerConfig, supervisor_config: SupervisorConfig):
+        self.config = config
+        self.auth_token = supervisor_config.auth_token
+        self.auth_url = (
+            f"http://{urlparse(config.task_broker_uri).netloc}{TASK_BROKER_AUTH_PATH}"
+        )
+        self.logger = logging.getLogger(__name__)
+
+        processes = supervisor_config.processes
+        if processes > config.max_concurrency:
+            self.logger.warning(
+                f"Reducing runner processes from {processes} to {config.max_concurrency} to match max concurrency"
+            )
+            processes = config.max_concurrency
+
+        self.runners = [
+            RunnerProcess(
+                index=index,
+                config=dataclasses.replace(config, max_concurrency=share),
+            )
+            for index, share in enumerate(
+                split_concurrency(config.max_concurrency, processes)
+            )
+        ]
+        self.running_tasks_counts: RunningTasksCounts = SUPERVISOR_CONTEXT.Array(
+            "i", processes, lock=False
+        )
+
+        self.supervise_coroutines: list[asyncio.Task] = []
+        self.on_idle_timeout: Callable[[], Awaitable[None]] | None = None
+        self.is_shutting_down = False
+
+    @property
+    def running_tasks_count(self) -> int:
+        return sum(self.running_tasks_counts)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "processes": len(self.runners),
+            "processes_alive": sum(
+                1
+                for runner in self.runners
+                if runner.process is not None and runner.process.is_alive()
+            ),
+            "restarts": sum(runner.restarts for runner in self.runners),
+            "max_concurrency": self.config.max_concurrency,
+            "running_tasks": self.running_tasks_count,
+        }
+
+    def readiness(self) -> dict[str, Any]:
+        processes_alive = sum(
+            1
+            for runner in self.runners
+            if runner.process is not None and runner.process.is_alive()
+        )
+        free_slots = max(0, self.config.max_concurrency - self.running_tasks_count)
+        checks = {
+            "processes_alive": processes_alive > 0,
+            "free_slots": free_slots > 0,
+        }
+        return {
+            "ready": not self.is_shutting_down and all(checks.values()),
+            "checks": checks,
+            "free_slots": free_slots,
+            "running_tasks": self.running_tasks_count,
+        }
+
+    async def start(self) -> None:
+        self.logger.info(f"Starting {len(self.runners)} runner processes...")
+
+        self.supervise_coroutines = [
+            asyncio.create_task(self._supervise(runner)) for runner in self.runners
+        ]
+        await asyncio.gather(*self.supervise_coroutines)
+
+        if not self.is_shutting_down and self.on_idle_timeout:
+            await self.on_idle_timeout()
+
+    # ========== Shutdown ==========
+
+    async def stop(self) -> None:
+        self.is_shutting_down = True
+
+        alive = [
+            runner.process
+            for runner in self.runners
+            if runner.process is not None and runner.process.is_alive()
+        ]
+
+        try:
+            for process in alive:
+                process.terminate()  # runners drain their tasks on SIGTERM
+
+            await asyncio.gather(*self.supervise_coroutines, return_exceptions=True)
+        finally:
+            for process in alive:
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+
+        self.logger.info("Supervisor stopped")
+
+    # ========== Supervision ==========
+
+    async def _supervise(self, runner: RunnerProcess) -> None:
+        while not self.is_shutting_down:
+            try:
+                grant_token = await asyncio.to_thread(
+                    fetch_grant_token, self.auth_url, self.auth_token
+                )
+            except (OSError, ValueError, KeyError) as e:
+                if isinstance(e, urllib.error.HTTPError) and e.code == 403:
+                    self.logger.error(
+                        f"Broker rejected the auth token, not starting runner process {runner.index}"
+                    )
+                    return
+                self.logger.warning(
+                    f"Failed to fetch grant token for runner process {runner.index}: {e} - retrying..."
+                )
+                await asyncio.sleep(SUPERVISOR_RESTART_DELAY)
+                continue
+
+            if self.is_shutting_down:
+                return
+
+            runner.process = self._spawn(runner, grant_token)
+            await wait_for_process_exit(runner.process)
+            runner.process.join()  # already exited, only reaps
+            self.running_tasks_counts[runner.index] = 0
+
+            exit_code = runner.process.exitcode
+
+            if self.is_shutting_down:
+                return
+
+            if exit_code == 0 and self.config.is_auto_shutdown_enabled:
+                self.logger.info(f"Runner process {runner.index} exited after idling")
+                return
+
+            runner.restarts += 1
+            self.logger.warning(
+                f"Runner process {runner.index} exited with code {exit_code}, restarting in {SUPERVISOR_RESTART_DELAY}s..."
+            )
+            await asyncio.sleep(SUPERVISOR_RESTART_DELAY)
+
+    def _spawn(self, runner: RunnerProcess, grant_token: str) -> SpawnProcess:
+        config = dataclasses.replace(runner.config, grant_token=grant_token)
+        process = SUPERVISOR_CONTEXT.Process(
+            target=run_runner_process,
+            args=(config, runner.index, self.running_tasks_counts),
+            name=f"task-runner-{runner.index}",
+        )
+        process.start()
+        self.logger.info(
+            f"Started runner process {runner.index} (pid {process.pid}, max concurrency {runner.config.max_concurrency})"
+        )
+        return process
+
+
+# ========== Runner process ==========
+
+
+def run_runner_process(
+    config: TaskRunnerConfig, index: int, running_tasks_counts: RunningTasksCounts
+) -> None:
+    """Entry point of a runner process launched by the supervisor."""
+
+    # Leave the supervisor's process group, so that a terminal SIGINT reaches only
+    # the supervisor, which then coordinates shutdown by sending SIGTERM to children.
+    os.setpgrp()
+    _exit_with_supervisor()
+
+    exit_code = asyncio.run(_run_task_runner(config, index, running_tasks_counts))
+    sys.exit(exit_code)
+
+
+def _exit_with_supervisor() -> None:
+    """Have the kernel send SIGTERM to this process when the supervisor dies.
+
+    Outside the supervisor's process group, nothing else would stop a runner whose
+    supervisor was killed before it could terminate its children. Linux only.
+    """
+
+    if sys.platform != "linux":
+        return
+
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM) != 0:
+        return
+
+    # The supervisor may have died before the signal was armed.
+    parent = multiprocessing.parent_process()
+    if parent is not None and os.getppid() != parent.pid:
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+async def _run_task_runner(
+    config: TaskRunnerConfig, index: int, running_tasks_counts: RunningTasksCounts
+) -> int:
+    from src.logs import setup_logging
+    from src.shutdown import Shutdown
+    from src.task_runner import TaskRunner
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    sentry = None
+    sentry_config = SentryConfig.from_env()
+
+    if sentry_config.enabled:
+        from src.sentry import setup_sentry
+
+        sentry = setup_sentry(sentry_config)
+
+    task_runner = TaskRunner(config)
+    shutdown = Shutdown(task_runner, sentry=sentry)
+    task_runner.on_idle_timeout = shutdown.start_auto_shutdown
+
+    async def report_running_tasks():
+        while True:
+            running_tasks_counts[index] = task_runner.running_tasks_count
+            await asyncio.sleep(SUPERVISOR_REPORT_INTERVAL)
+
+    report_coroutine = asyncio.create_task(report_running_tasks())
+
+    try:
+        await task_runner.start()
+    except Exception:
+        logger.error("Unexpected error", exc_info=True)
+        await shutdown.start_shutdown()
+
+    exit_code = await shutdown.wait_for_shutdown()
+    report_coroutine.cancel()
+
+    return exit_code
@@ -1,3 +1,4 @@
+import fcntl
 import multiprocessing
 import traceback
 import textwrap
@@ -6,7 +7,9 @@ import io
 import os
 import sys
 import logging
-from typing import cast
+import resource
+import zlib
+from typing import Callable, cast
 
 from src.errors import (
     TaskCancelledError,
@@ -23,6 +26,9 @@ from src.config.security_config import SecurityConfig
 
 from src.message_types.broker import NodeMode, Items, Query
 from src.message_types.pipe import (
+    PIPE_FRAME_HEADER,
+    PipeFrameType,
+    PipeMetrics,
     PipeResultMessage,
     PipeErrorMessage,
     TaskErrorInfo,
@@ -36,15 +42,26 @@ from src.constants import (
     EXECUTOR_PER_ITEM_FILENAME,
     SIGTERM_EXIT_CODE,
     SIGKILL_EXIT_CODE,
-    PIPE_MSG_PREFIX_LENGTH,
+    PIPE_FRAME_VERSION,
+    PIPE_FRAME_FLAG_COMPRESSED,
+    PIPE_FRAME_MAX_CHUNK_SIZE,
+    PIPE_FRAME_COMPRESSION_LEVEL,
+    PIPE_BUFFER_SIZE,
+    PIPE_DEFAULT_BUFFER_SIZE,
+    DEFAULT_PIPE_COMPRESSION_THRESHOLD,
 )
 
+from multiprocessing import forkserver
 from multiprocessing.context import ForkServerProcess
 from multiprocessing.connection import Connection
 
 logger = logging.getLogger(__name__)
 
 MULTIPROCESSING_CONTEXT = multiprocessing.get_context("forkserver")
+# Import the executor (not the runner) into the forkserver, so that subprocesses
+# inherit only the modules they need to unpickle and run a task.
+FORKSERVER_PRELOAD = ["__main__", __name__]
+MULTIPROCESSING_CONTEXT.set_forkserver_preload(FORKSERVER_PRELOAD)
 MAX_PRINT_ARGS_ALLOWED = 100
 
 type PipeConnection = Connection
@@ -60,8 +77,13 @@ class TaskExecutor:
         items: Items,
         security_config: SecurityConfig,
         query: Query = None,
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
+        payload_size: int = 0,
     ) -> tuple[ForkServerProcess, PipeConnection, PipeConnection]:
-        """Create a subprocess for executing a Python code task and a pipe for communication."""
+        """Create a subprocess for executing a Python code task and a pipe for communication.
+
+        The size of the task payload, in bytes, stands in for the size of the result, to decide whether the pipe needs enlarging.
+        """
 
         fn = (
             TaskExecutor._all_items
@@ -71,6 +93,8 @@ class TaskExecutor:
 
         # thread in runner process reads, subprocess writes
         read_conn, write_conn = MULTIPROCESSING_CONTEXT.Pipe(duplex=False)
+        if payload_size > PIPE_DEFAULT_BUFFER_SIZE:
+            TaskExecutor._enlarge_pipe(write_conn.fileno())
 
         process = MULTIPROCESSING_CONTEXT.Process(
             target=fn,
@@ -80,11 +104,21 @@ class TaskExecutor:
                 write_conn,
                 security_config,
                 query,
+                compression_threshold,
             ),
         )
 
         return process, read_conn, write_conn
 
+    @staticmethod
+    def start_forkserver(preload_modules: list[str]):
+        """Start the forkserver ahead of the first task, with modules imported once in the server so every subprocess inherits them."""
+
+        MULTIPROCESSING_CONTEXT.set_forkserver_preload(
+            [*FORKSERVER_PRELOAD, *preload_modules]
+        )
+        forkserver.ensure_running()
+
     @staticmethod
     def execute_process(
         process: ForkServerProcess,
@@ -92,8 +126,13 @@ class TaskExecutor:
         write_conn: PipeConnection,
         task_timeout: int,
         continue_on_fail: bool,
+        is_cancelled: Callable[[], bool] | None = None,
     ) -> tuple[Items, PrintArgs, int]:
-        """Execute a subprocess for a Python code task."""
+        """Execute a subprocess for a Python code task.
+
+        `is_cancelled` is checked once the process has started, since a cancel
+        arriving while it starts finds no live process to signal.
+        """
 
         print_args: PrintArgs = []
 
@@ -108,6 +147,11 @@ class TaskExecutor:
             finally:
                 write_conn.close()
 
+            if is_cancelled is not None and is_cancelled():
+                TaskExecutor.kill_process(process)
+                process.join()
+                raise TaskCancelledError()
+
             process.join(timeout=task_timeout)
 
             if process.is_alive():
@@ -181,6 +225,30 @@ class TaskExecutor:
             # subprocess is dead or unreachable
             pass
 
+    @staticmethod
+    def terminate_process(process: ForkServerProcess | None):
+        """Send SIGTERM to a running subprocess without waiting for it to exit."""
+
+        if process is None or not process.is_alive():
+            return
+
+        try:
+            process.terminate()
+        except (ProcessLookupError, ConnectionError, BrokenPipeError):
+            pass
+
+    @staticmethod
+    def kill_process(process: ForkServerProcess | None):
+        """Send SIGKILL to a running subprocess without waiting for it to exit."""
+
+        if process is None or not process.is_alive():
+            return
+
+        try:
+            process.kill()
+        except (ProcessLookupError, ConnectionError, BrokenPipeError):
+            pass
+
     @staticmethod
     def _all_items(
         raw_code: str,
@@ -188,6 +256,7 @@ class TaskExecutor:
         write_conn,
         security_config: SecurityConfig,
         query: Query = None,
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
     ):
         """Execute a Python code task in all-items mode."""
 
@@ -213,11 +282,17 @@ class TaskExecutor:
             exec(compiled_code, globals)
 
             result = cast(Items, globals[EXECUTOR_USER_OUTPUT_KEY])
-            TaskExecutor._put_result(write_conn.fileno(), result, print_args)
+            TaskExecutor._put_result(
+                write_conn.fileno(), result, print_args, compression_threshold
+            )
 
         except BaseException as e:
             TaskExecutor._put_error(
-                write_conn.fileno(), e, stderr_capture.getvalue(), print_args
+                write_conn.fileno(),
+                e,
+                stderr_capture.getvalue(),
+                print_args,
+                compression_threshold,
             )
 
     @staticmethod
@@ -227,6 +302,7 @@ class TaskExecutor:
         write_conn,
         security_config: SecurityConfig,
         _query: Query = None,  # unused, only to keep signatures consistent across modes
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
     ):
         """Execute a Python code task in per-item mode."""
 
@@ -269,11 +345,17 @@ class TaskExecutor:
 
                 result.append(output_item)
 
-            TaskExecutor._put_result(write_conn.fileno(), result, print_args)
+            TaskExecutor._put_result(
+                write_conn.fileno(), result, print_args, compression_threshold
+            )
 
         except BaseException as e:
             TaskExecutor._put_error(
-                write_conn.fileno(), e, stderr_capture.getvalue(), print_args
+                write_conn.fileno(),
+                e,
+                stderr_capture.getvalue(),
+                print_args,
+                compression_threshold,
             )
 
     @staticmethod
@@ -295,18 +377,28 @@ class TaskExecutor:
         return user_output
 
     @staticmethod
-    def _put_result(write_fd: int, result: Items, print_args: PrintArgs):
-        message: PipeResultMessage = {
-            "result": result,
-            "print_args": TaskExecutor._truncate_print_args(print_args),
-        }
+    def _put_result(
+        write_fd: int,
+        result: Items,
+        print_args: PrintArgs,
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
+    ):
+        try:
+            TaskExecutor._write_print_frames(
+                write_fd, print_args, compression_threshold
+            )
 
-        data = json.dumps(message, default=str, ensure_ascii=False).encode("utf-8")
-        length_bytes = len(data).to_bytes(PIPE_MSG_PREFIX_LENGTH, "big")
+            data = memoryview(TaskExecutor._encode_json(result))
+            for offset in range(0, len(data), PIPE_FRAME_MAX_CHUNK_SIZE):
+                TaskExecutor._write_frame(
+                    write_fd,
+                    PipeFrameType.RESULT_CHUNK,
+                    data[offset : offset + PIPE_FRAME_MAX_CHUNK_SIZE],
+                    compression_threshold,
+                )
 
-        try:
-            TaskExecutor._write_bytes(write_fd, length_bytes)
-            TaskExecutor._write_bytes(write_fd, data)
+            TaskExecutor._write_metrics_frame(write_fd)
+            TaskExecutor._write_frame(write_fd, PipeFrameType.END, b"")
         finally:
             try:
                 os.close(write_fd)
@@ -319,6 +411,7 @@ class TaskExecutor:
         e: BaseException,
         stderr: str = "",
         print_args: PrintArgs | None = None,
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
     ):
         if print_args is None:
             print_args = []
@@ -332,23 +425,51 @@ class TaskExecutor:
             "stderr": stderr,
         }
 
-        message: PipeErrorMessage = {
-            "error": task_error_info,
-            "print_args": TaskExecutor._truncate_print_args(print_args),
-        }
-
-        data = json.dumps(message, default=str, ensure_ascii=False).encode("utf-8")
-        length_bytes = len(data).to_bytes(PIPE_MSG_PREFIX_LENGTH, "big")
-
         try:
-            TaskExecutor._write_bytes(write_fd, length_bytes)
-            TaskExecutor._write_bytes(write_fd, data)
+            TaskExecutor._write_print_frames(
+                write_fd, print_args, compression_threshold
+            )
+            TaskExecutor._write_frame(
+                write_fd,
+                PipeFrameType.ERROR,
+                TaskExecutor._encode_json(task_error_info),
+                compression_threshold,
+            )
+            TaskExecutor._write_metrics_frame(write_fd)
+            TaskExecutor._write_frame(write_fd, PipeFrameType.END, b"")
         finally:
             try:
                 os.close(write_fd)
             except Exception:
                 pass
 
+    @staticmethod
+    def _write_print_frames(
+        write_fd: int, print_args: PrintArgs, compression_threshold: int
+    ):
+        for args in TaskExecutor._truncate_print_args(print_args):
+            TaskExecutor._write_frame(
+                write_fd,
+                PipeFrameType.PRINT,
+                TaskExecutor._encode_json(args),
+                compression_threshold,
+            )
+
+    @staticmethod
+    def _write_metrics_frame(write_fd: int):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        metrics: PipeMetrics = {
+            "max_rss_kb": usage.ru_maxrss,
+            "cpu_time": usage.ru_utime + usage.ru_stime,
+        }
+        TaskExecutor._write_frame(
+            write_fd, PipeFrameType.METRICS, TaskExecutor._encode_json(metrics)
+        )
+
+    @staticmethod
+    def _encode_json(value) -> bytes:
+        return json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+
     # ========== print() ==========
 
     @staticmethod
@@ -496,10 +617,54 @@ class TaskExecutor:
     # ========== pipe I/O ==========
 
     @staticmethod
-    def _write_bytes(fd: int, data: bytes):
-        total_written = 0
-        while total_written < len(data):
-            written = os.write(fd, data[total_written:])
+    def _write_frame(
+        fd: int,
+        frame_type: PipeFrameType,
+        payload: bytes | memoryview,
+        compression_threshold: int = DEFAULT_PIPE_COMPRESSION_THRESHOLD,
+    ):
+        """Write a frame: fixed-size header (version, type, flags, 8-byte length) followed by the payload."""
+
+        flags = 0
+        if compression_threshold and len(payload) >= compression_threshold:
+            compressed = zlib.compress(payload, PIPE_FRAME_COMPRESSION_LEVEL)
+            # incompressible payloads grow, which could push a full chunk over the frame size limit
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= PIPE_FRAME_FLAG_COMPRESSED
+
+        header = PIPE_FRAME_HEADER.pack(
+            PIPE_FRAME_VERSION, frame_type, flags, len(payload)
+        )
+        TaskExecutor._write_buffers(fd, [header, payload])
+
+    @staticmethod
+    def _write_buffers(fd: int, buffers: list[bytes | memoryview]):
+        """Write buffers with as few syscalls as possible, advancing memoryviews on partial writes instead of copying the remainder."""
+
+        views = [memoryview(buffer) for buffer in buffers if len(buffer)]
+        while views:
+            written = os.writev(fd, views)
             if written == 0:
                 raise OSError("Write failed")
-            total_written += written
+            while views and written >= len(views[0]):
+                written -= len(views.pop(0))
+            if written:
+                views[0] = views[0][written:]
+
+    @staticmethod
+    def _enlarge_pipe(fd: int):
+        """Raise the pipe capacity on Linux, so large results need fewer context switches between writer and reader."""
+
+        set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+        if set_pipe_size is None:
+            return
+
+        try:
+            fcntl.fcntl(fd, set_pipe_size, PIPE_BUFFER_SIZE)
+        except PermissionError:
+            # above /proc/sys/fs/pipe-max-size, or this user's pipes already
+            # take up /proc/sys/fs/pipe-user-pages-soft
+            logger.debug("Not permitted to enlarge task pipe, keeping its capacity")
+        except OSError as e:
+            logger.warning(f"Failed to enlarge task pipe, keeping its capacity: {e}")
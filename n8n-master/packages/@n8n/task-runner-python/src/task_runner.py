@@ -1,13 +1,15 @@
 import asyncio
+import heapq
 import logging
 import time
-from typing import Callable, Awaitable
+from typing import Any, Callable, Awaitable
 from dataclasses import dataclass
 from urllib.parse import urlparse
 import websockets
 from websockets.exceptions import InvalidStatus
 from websockets.asyncio.client import ClientConnection
 import random
+from multiprocessing.context import ForkServerProcess
 from src.errors import TaskCancelledError
 
 
@@ -15,6 +17,7 @@ from src.config.task_runner_config import TaskRunnerConfig
 from src.errors import (
     NoIdleTimeoutHandlerError,
     TaskMissingError,
+    TaskSubprocessFailedError,
     WebsocketConnectionError,
 )
 from src.message_types.broker import TaskSettings
@@ -24,17 +27,24 @@ from src.constants import (
     RUNNER_NAME,
     TASK_REJECTED_REASON_AT_CAPACITY,
     TASK_REJECTED_REASON_OFFER_EXPIRED,
+    TASK_REJECTED_REASON_SHUTTING_DOWN,
+    TASK_REJECTED_REASON_MEMORY_PRESSURE,
     TASK_TYPE_PYTHON,
     OFFER_INTERVAL,
     OFFER_VALIDITY,
     OFFER_VALIDITY_MAX_JITTER,
     OFFER_VALIDITY_LATENCY_BUFFER,
+    CANCEL_GRACE_PERIOD,
+    READINESS_MAX_START_FAILURES,
+    READINESS_MAX_LATENCY_FRACTION,
     TASK_BROKER_WS_PATH,
     RPC_BROWSER_CONSOLE_LOG_METHOD,
     LOG_TASK_COMPLETE,
     LOG_TASK_CANCEL,
     LOG_TASK_CANCEL_UNKNOWN,
     LOG_TASK_CANCEL_WAITING,
+    LOG_WARM_UP_COMPLETE,
+    WARM_UP_TASK_CODE,
 )
 from src.message_types import (
     BrokerMessage,
@@ -58,16 +68,21 @@ from src.task_state import TaskState, TaskStatus
 from src.task_executor import TaskExecutor
 from src.task_analyzer import TaskAnalyzer
 from src.config.security_config import SecurityConfig
+from src.process_exit import wait_for_process_exit
+from src.runner_metrics import RunnerMetrics
+from src.result_cache import ResultCache
+from src.concurrency_controller import ConcurrencyController
+from src.memory_admission import MemoryAdmission
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskOffer:
     offer_id: str
-    valid_until: float
+    valid_until: float  # monotonic clock
 
     @property
     def has_expired(self) -> bool:
-        return time.time() > self.valid_until
+        return time.monotonic() > self.valid_until
 
 
 class TaskRunner:
@@ -83,9 +98,14 @@ class TaskRunner:
         self.can_send_offers = False
 
         self.open_offers: dict[str, TaskOffer] = {}
+        # min-heap of (valid_until, offer_id), lazily pruned of accepted offers
+        self.offer_expiries: list[tuple[float, str]] = []
         self.running_tasks: dict[str, TaskState] = {}
 
         self.offers_coroutine: asyncio.Task | None = None
+        self.pending_kills: list[ForkServerProcess] = []
+        self.kill_coroutines: set[asyncio.Task] = set()
+        self.metrics = RunnerMetrics()
         self.serde = MessageSerde()
         self.executor = TaskExecutor()
         self.security_config = SecurityConfig(
@@ -95,11 +115,35 @@ class TaskRunner:
             runner_env_deny=config.env_deny,
         )
         self.analyzer = TaskAnalyzer(self.security_config)
+        self.result_cache: ResultCache | None = (
+            ResultCache(
+                ttl=config.result_cache_ttl,
+                max_size=config.result_cache_max_size,
+                security_config=self.security_config,
+                metrics=self.metrics,
+            )
+            if config.result_cache_enabled
+            else None
+        )
+        self.concurrency_controller: ConcurrencyController | None = (
+            ConcurrencyController(
+                min_concurrency=config.min_concurrency,
+                max_concurrency=config.max_concurrency,
+                metrics=self.metrics,
+            )
+            if config.adaptive_concurrency_enabled
+            else None
+        )
+        self.memory_admission: MemoryAdmission | None = (
+            MemoryAdmission(config.memory_budget, self.metrics)
+            if config.memory_budget > 0
+            else None
+        )
         self.logger = logging.getLogger(__name__)
 
         self.idle_coroutine: asyncio.Task | None = None
         self.on_idle_timeout: Callable[[], Awaitable[None]] | None = None
-        self.last_activity_time = time.time()
+        self.last_activity_time = time.monotonic()
         self.is_shutting_down = False
 
         self.task_broker_uri = config.task_broker_uri
@@ -112,10 +156,46 @@ class TaskRunner:
     def running_tasks_count(self) -> int:
         return len(self.running_tasks)
 
+    @property
+    def concurrency_limit(self) -> int:
+        if self.concurrency_controller is not None:
+            return self.concurrency_controller.limit
+        return self.config.max_concurrency
+
+    def readiness(self) -> dict[str, Any]:
+        """Whether the runner can take on more work, from state it already tracks.
+
+        Task latency only updates as tasks finish, so it is ignored while the
+        runner is idle, where it would otherwise stay stale after a slow burst.
+        """
+
+        free_slots = max(0, self.concurrency_limit - self.running_tasks_count)
+        task_latency = (
+            self.metrics.task_latency_ewma if self.running_tasks_count else None
+        )
+        checks = {
+            "registered": self.can_send_offers,
+            "free_slots": free_slots > 0,
+            "forkserver": self.metrics.subprocess_start_failures
+            < READINESS_MAX_START_FAILURES,
+            "task_latency": task_latency is None
+            or task_latency < self.config.task_timeout * READINESS_MAX_LATENCY_FRACTION,
+        }
+        return {
+            "ready": all(checks.values()),
+            "checks": checks,
+            "free_slots": free_slots,
+            "running_tasks": self.running_tasks_count,
+            "task_latency": task_latency,
+        }
+
     async def start(self) -> None:
         if self.config.is_auto_shutdown_enabled and not self.on_idle_timeout:
             raise NoIdleTimeoutHandlerError(self.config.auto_shutdown_timeout)
 
+        if self.config.warm_up_enabled:
+            await self._warm_up()
+
         headers = {"Authorization": f"Bearer {self.config.grant_token}"}
 
         while not self.is_shutting_down:
@@ -153,11 +233,65 @@ class TaskRunner:
             except asyncio.CancelledError:
                 pass
 
+    # ========== Warm-up ==========
+
+    async def _warm_up(self) -> None:
+        """Pay cold-start costs before sending offers, so that the first tasks do not."""
+
+        start_time = time.monotonic()
+
+        try:
+            preload_modules = sorted(
+                (
+                    self.security_config.stdlib_allow
+                    | self.security_config.external_allow
+                )
+                - {"*"}
+            )
+            await asyncio.to_thread(self.executor.start_forkserver, preload_modules)
+            forkserver_duration = self._get_duration(start_time)
+
+            validation_start_time = time.monotonic()
+            self.analyzer.validate(WARM_UP_TASK_CODE)
+            validation_duration = self._get_duration(validation_start_time)
+
+            task_start_time = time.monotonic()
+            process, read_conn, write_conn = self.executor.create_process(
+                code=WARM_UP_TASK_CODE,
+                node_mode="all_items",
+                items=[],
+                security_config=self.security_config,
+            )
+            await asyncio.to_thread(
+                self.executor.execute_process,
+                process=process,
+                read_conn=read_conn,
+                write_conn=write_conn,
+                task_timeout=self.config.task_timeout,
+                continue_on_fail=False,
+            )
+            task_duration = self._get_duration(task_start_time)
+        except Exception as e:
+            self.logger.warning(f"Warm-up failed, continuing without it: {e}")
+            return
+
+        self.metrics.warm_up_duration = time.monotonic() - start_time
+        self.logger.info(
+            LOG_WARM_UP_COMPLETE.format(
+                duration=self._get_duration(start_time),
+                forkserver=forkserver_duration,
+                validation=validation_duration,
+                task=task_duration,
+            )
+        )
+
     # ========== Shutdown ==========
 
     async def stop(self) -> None:
         self.is_shutting_down = True
         self.can_send_offers = False
+        self.open_offers.clear()
+        self.offer_expiries.clear()
 
         await self._cancel_coroutine(self.offers_coroutine)
         await self._cancel_coroutine(self.idle_coroutine)
@@ -180,9 +314,15 @@ class TaskRunner:
             f"Waiting for {self.running_tasks_count} tasks to complete (timeout: {timeout}s)..."
         )
 
-        start_time = time.time()
-        while self.running_tasks and (time.time() - start_time) < timeout:
-            await asyncio.sleep(0.5)
+        _, pending = await asyncio.wait(
+            [
+                asyncio.create_task(task_state.completed.wait())
+                for task_state in self.running_tasks.values()
+            ],
+            timeout=timeout,
+        )
+        for waiter in pending:
+            waiter.cancel()
 
         if self.running_tasks:
             self.logger.warning(
@@ -195,16 +335,20 @@ class TaskRunner:
 
         self.logger.warning(f"Terminating {self.running_tasks_count} tasks...")
 
-        tasks_to_terminate = [
-            asyncio.to_thread(self.executor.stop_process, task_state.process)
+        processes = [
+            task_state.process
             for task_state in self.running_tasks.values()
             if task_state.process
         ]
 
-        if tasks_to_terminate:
-            await asyncio.gather(*tasks_to_terminate, return_exceptions=True)
+        for process in processes:
+            self.executor.terminate_process(process)
+
+        if processes:
+            await self._kill_unresponsive_processes(processes)
 
-        self.running_tasks.clear()
+        for task_id in list(self.running_tasks):
+            self._remove_task(task_id)
 
         self.logger.warning("Terminated tasks")
 
@@ -253,6 +397,14 @@ class TaskRunner:
         self._reset_idle_timer()
 
     async def _handle_task_offer_accept(self, message: BrokerTaskOfferAccept) -> None:
+        if self.is_shutting_down:
+            response = RunnerTaskRejected(
+                task_id=message.task_id,
+                reason=TASK_REJECTED_REASON_SHUTTING_DOWN,
+            )
+            await self._send_message(response)
+            return
+
         offer = self.open_offers.get(message.offer_id)
 
         if offer is None or offer.has_expired:
@@ -263,7 +415,7 @@ class TaskRunner:
             await self._send_message(response)
             return
 
-        if self.running_tasks_count >= self.config.max_concurrency:
+        if self.running_tasks_count >= self.concurrency_limit:
             response = RunnerTaskRejected(
                 task_id=message.task_id,
                 reason=TASK_REJECTED_REASON_AT_CAPACITY,
@@ -271,6 +423,17 @@ class TaskRunner:
             await self._send_message(response)
             return
 
+        if self.memory_admission is not None and not self.memory_admission.can_admit(
+            self.running_tasks.values()
+        ):
+            self.metrics.tasks_rejected_memory += 1
+            response = RunnerTaskRejected(
+                task_id=message.task_id,
+                reason=TASK_REJECTED_REASON_MEMORY_PRESSURE,
+            )
+            await self._send_message(response)
+            return
+
         del self.open_offers[message.offer_id]
 
         task_state = TaskState(message.task_id)
@@ -296,13 +459,38 @@ class TaskRunner:
         task_state.workflow_id = message.settings.workflow_id
         task_state.node_name = message.settings.node_name
         task_state.node_id = message.settings.node_id
+        task_state.memory_estimate = MemoryAdmission.estimate(
+            message.settings.payload_size
+        )
+
+        # Accepting charged the task the baseline, its payload size is only known now
+        if self.memory_admission is not None and not self.memory_admission.fits(
+            (
+                other
+                for other_task_id, other in self.running_tasks.items()
+                if other_task_id != message.task_id
+            ),
+            task_state.memory_estimate,
+        ):
+            self.metrics.tasks_rejected_memory += 1
+            self.logger.warning(
+                f"Task {message.task_id} exceeds the memory budget, not running it"
+            )
+            response = RunnerTaskError(
+                task_id=message.task_id,
+                error={"message": TASK_REJECTED_REASON_MEMORY_PRESSURE},
+            )
+            await self._send_message(response)
+            self._remove_task(message.task_id)
+            self._reset_idle_timer()
+            return
 
         task_state.status = TaskStatus.RUNNING
         asyncio.create_task(self._execute_task(message.task_id, message.settings))
         self.logger.info(f"Received task {message.task_id}")
 
     async def _execute_task(self, task_id: str, task_settings: TaskSettings) -> None:
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
             task_state = self.running_tasks.get(task_id)
@@ -312,24 +500,39 @@ class TaskRunner:
 
             self.analyzer.validate(task_settings.code)
 
-            process, read_conn, write_conn = self.executor.create_process(
-                code=task_settings.code,
-                node_mode=task_settings.node_mode,
-                items=task_settings.items,
-                security_config=self.security_config,
-                query=task_settings.query,
-            )
+            cache_key = None
+            cached = None
+            if self.result_cache is not None and ResultCache.is_cacheable(
+                task_settings.code
+            ):
+                cache_key = self.result_cache.key(task_settings)
+                cached = self.result_cache.get(cache_key)
+
+            if cached is not None:
+                result = cached.result
+                print_args = cached.print_args
+                result_size_bytes = cached.size
+            else:
+                result, print_args, result_size_bytes = await self._run_process(
+                    task_state, task_settings
+                )
+                self.metrics.subprocess_start_failures = 0
+                self.metrics.record_task_latency(time.monotonic() - start_time)
 
-            task_state.process = process
+                if self.concurrency_controller is not None:
+                    self.concurrency_controller.record_task_latency(
+                        time.monotonic() - start_time
+                    )
 
-            result, print_args, result_size_bytes = await asyncio.to_thread(
-                self.executor.execute_process,
-                process=process,
-                read_conn=read_conn,
-                write_conn=write_conn,
-                task_timeout=self.config.task_timeout,
-                continue_on_fail=task_settings.continue_on_fail,
-            )
+                # size 0 marks an error returned as items under continue-on-fail
+                if (
+                    cache_key
+                    and self.result_cache is not None
+                    and result_size_bytes > 0
+                ):
+                    self.result_cache.put(
+                        cache_key, result, print_args, result_size_bytes
+                    )
 
             for print_args_per_call in print_args:
                 await self._send_rpc_message(
@@ -339,14 +542,21 @@ class TaskRunner:
             response = RunnerTaskDone(task_id=task_id, data={"result": result})
             await self._send_message(response)
 
-            self.logger.info(
-                LOG_TASK_COMPLETE.format(
-                    task_id=task_id,
-                    duration=self._get_duration(start_time),
-                    result_size=self._get_result_size(result_size_bytes),
-                    **task_state.context(),
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    LOG_TASK_COMPLETE.format(
+                        task_id=task_id,
+                        duration=self._get_duration(start_time),
+                        result_size=self._get_result_size(result_size_bytes),
+                        **task_state.context(),
+                    ),
+                    extra={
+                        "task": task_state.log_context(
+                            duration_ms=round((time.monotonic() - start_time) * 1000),
+                            result_size_bytes=result_size_bytes,
+                        )
+                    },
                 )
-            )
 
         except TaskCancelledError as e:
             response = RunnerTaskError(task_id=task_id, error={"message": str(e)})
@@ -359,6 +569,8 @@ class TaskRunner:
             await self._send_message(response)
 
         except Exception as e:
+            if isinstance(e, TaskSubprocessFailedError) and e.original_error:
+                self.metrics.subprocess_start_failures += 1
             self.logger.error(f"Task {task_id} failed", exc_info=True)
             error = {
                 "message": getattr(e, "message", str(e)),
@@ -368,9 +580,37 @@ class TaskRunner:
             await self._send_message(response)
 
         finally:
-            self.running_tasks.pop(task_id, None)
+            task_state = self._remove_task(task_id)
+            if task_state and task_state.cancel_requested_at is not None:
+                self._record_cancel(task_id, task_state)
             self._reset_idle_timer()
 
+    async def _run_process(self, task_state: TaskState, task_settings: TaskSettings):
+        process, read_conn, write_conn = self.executor.create_process(
+            code=task_settings.code,
+            node_mode=task_settings.node_mode,
+            items=task_settings.items,
+            security_config=self.security_config,
+            query=task_settings.query,
+            compression_threshold=self.config.pipe_compression_threshold,
+            payload_size=task_settings.payload_size,
+        )
+
+        task_state.process = process
+
+        if task_state.status == TaskStatus.ABORTING:
+            raise TaskCancelledError()  # cancelled before the process started
+
+        return await asyncio.to_thread(
+            self.executor.execute_process,
+            process=process,
+            read_conn=read_conn,
+            write_conn=write_conn,
+            task_timeout=self.config.task_timeout,
+            continue_on_fail=task_settings.continue_on_fail,
+            is_cancelled=lambda: task_state.status == TaskStatus.ABORTING,
+        )
+
     async def _handle_task_cancel(self, message: BrokerTaskCancel) -> None:
         task_id = message.task_id
         task_state = self.running_tasks.get(task_id)
@@ -380,16 +620,72 @@ class TaskRunner:
             return
 
         if task_state.status == TaskStatus.WAITING_FOR_SETTINGS:
-            self.running_tasks.pop(task_id, None)
+            self._remove_task(task_id)
             self.logger.info(LOG_TASK_CANCEL_WAITING.format(task_id=task_id))
             await self._send_offers()
             return
 
         if task_state.status == TaskStatus.RUNNING:
             task_state.status = TaskStatus.ABORTING
-            await asyncio.to_thread(self.executor.stop_process, task_state.process)
+            task_state.cancel_requested_at = time.monotonic()
+            if task_state.process:
+                self._stop_process_in_background(task_state.process)
+
+    def _stop_process_in_background(self, process: ForkServerProcess) -> None:
+        """Signal SIGTERM now and escalate to SIGKILL later, without blocking the message loop.
+
+        Cancellations arriving in the same event loop iteration, e.g. when a workflow
+        is stopped, share a single escalation coroutine and grace period.
+        """
+
+        self.executor.terminate_process(process)
+        self.pending_kills.append(process)
+
+        if len(self.pending_kills) == 1:
+            coroutine = asyncio.create_task(self._kill_pending_processes())
+            self.kill_coroutines.add(coroutine)
+            coroutine.add_done_callback(self.kill_coroutines.discard)
+
+    async def _kill_pending_processes(self) -> None:
+        processes, self.pending_kills = self.pending_kills, []
+        await self._kill_unresponsive_processes(processes)
+
+    async def _kill_unresponsive_processes(
+        self, processes: list[ForkServerProcess]
+    ) -> None:
+        """Wait out the grace period for already signalled processes, then SIGKILL all stragglers at once."""
+
+        await asyncio.wait(
+            [asyncio.create_task(wait_for_process_exit(p)) for p in processes],
+            timeout=CANCEL_GRACE_PERIOD,
+        )
+
+        for process in processes:
+            self.executor.kill_process(process)
+
+    def _remove_task(self, task_id: str) -> TaskState | None:
+        task_state = self.running_tasks.pop(task_id, None)
+        if task_state:
+            task_state.completed.set()
+        return task_state
+
+    def _record_cancel(self, task_id: str, task_state: TaskState) -> None:
+        assert task_state.cancel_requested_at is not None
+        self.metrics.record_cancel(time.monotonic() - task_state.cancel_requested_at)
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(
-                LOG_TASK_CANCEL.format(task_id=task_id, **task_state.context())
+                LOG_TASK_CANCEL.format(
+                    task_id=task_id,
+                    duration=self._get_duration(task_state.cancel_requested_at),
+                    **task_state.context(),
+                ),
+                extra={
+                    "task": task_state.log_context(
+                        duration_ms=round(
+                            (time.monotonic() - task_state.cancel_requested_at) * 1000
+                        )
+                    )
+                },
             )
 
     async def _send_rpc_message(self, task_id: str, method_name: str, params: list):
@@ -409,7 +705,7 @@ class TaskRunner:
     # ========== Formatting ==========
 
     def _get_duration(self, start_time: float) -> str:
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         if elapsed < 1:
             return f"{int(elapsed * 1000)}ms"
@@ -443,29 +739,45 @@ class TaskRunner:
         if not self.can_send_offers:
             return
 
-        expired_offer_ids = [
-            offer_id
-            for offer_id, offer in self.open_offers.items()
-            if offer.has_expired
-        ]
-
-        for offer_id in expired_offer_ids:
-            self.open_offers.pop(offer_id, None)
-
-        offers_to_send = self.config.max_concurrency - (
+        now = time.monotonic()
+        while self.offer_expiries and self.offer_expiries[0][0] < now:
+            _, offer_id = heapq.heappop(self.offer_expiries)
+            self.open_offers.pop(offer_id, None)  # no-op if already accepted
+
+        if len(self.offer_expiries) > 2 * (
+            len(self.open_offers) + self.config.max_concurrency
+        ):
+            # drop entries of accepted offers so the heap stays proportional to open offers
+            self.offer_expiries = [
+                (offer.valid_until, offer.offer_id)
+                for offer in self.open_offers.values()
+            ]
+            heapq.heapify(self.offer_expiries)
+
+        if self.concurrency_controller is not None:
+            self.concurrency_controller.update(self.running_tasks_count)
+        concurrency = self.concurrency_limit
+
+        offers_to_send = concurrency - (
             len(self.open_offers) + self.running_tasks_count
         )
 
+        if self.memory_admission is not None:
+            offers_to_send = min(
+                offers_to_send,
+                self.memory_admission.free_slots(self.running_tasks.values())
+                - len(self.open_offers),
+            )
+
         for _ in range(offers_to_send):
             offer_id = nanoid()
 
             valid_for_ms = OFFER_VALIDITY + random.randint(0, OFFER_VALIDITY_MAX_JITTER)
 
-            valid_until = (
-                time.time() + (valid_for_ms / 1000) + OFFER_VALIDITY_LATENCY_BUFFER
-            )
+            valid_until = now + (valid_for_ms / 1000) + OFFER_VALIDITY_LATENCY_BUFFER
 
             self.open_offers[offer_id] = TaskOffer(offer_id, valid_until)
+            heapq.heappush(self.offer_expiries, (valid_until, offer_id))
 
             message = RunnerTaskOffer(
                 offer_id=offer_id, task_type=TASK_TYPE_PYTHON, valid_for=valid_for_ms
@@ -481,7 +793,7 @@ class TaskRunner:
         if not self.config.is_auto_shutdown_enabled:
             return
 
-        self.last_activity_time = time.time()
+        self.last_activity_time = time.monotonic()
 
         if self.idle_coroutine and not self.idle_coroutine.done():
             self.idle_coroutine.cancel()
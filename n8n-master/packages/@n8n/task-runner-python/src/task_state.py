@@ -1,5 +1,6 @@
+import asyncio
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from multiprocessing.context import ForkServerProcess
 
 
@@ -9,24 +10,23 @@ class TaskStatus(Enum):
     ABORTING = "aborting"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskState:
     task_id: str
-    status: TaskStatus
+    status: TaskStatus = TaskStatus.WAITING_FOR_SETTINGS
     process: ForkServerProcess | None = None
     workflow_name: str | None = None
     workflow_id: str | None = None
     node_name: str | None = None
     node_id: str | None = None
+    cancel_requested_at: float | None = None  # monotonic clock
+    memory_estimate: int = 0  # bytes, from the settings payload size
+    completed: asyncio.Event = field(default_factory=asyncio.Event)
 
-    def __init__(self, task_id: str):
-        self.task_id = task_id
-        self.status = TaskStatus.WAITING_FOR_SETTINGS
-        self.process = None
-        self.workflow_name = None
-        self.workflow_id = None
-        self.node_name = None
-        self.node_id = None
+    def log_context(self, **fields) -> dict:
+        """Structured fields for `extra={"task": ...}`, picked up by the JSON log formatter."""
+
+        return {"task_id": self.task_id, **self.context(), **fields}
 
     def context(self):
         return {
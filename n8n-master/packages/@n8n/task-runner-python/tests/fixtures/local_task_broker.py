@@ -9,6 +9,7 @@ from src.nanoid import nanoid
 
 from tests.fixtures.test_constants import (
     TASK_RESPONSE_WAIT,
+    LOCAL_TASK_BROKER_AUTH_PATH,
     LOCAL_TASK_BROKER_WS_PATH,
 )
 
@@ -23,7 +24,10 @@ class ActiveTask:
 
 
 class LocalTaskBroker:
-    def __init__(self):
+    def __init__(self, auth_token: str | None = None):
+        """With an `auth_token`, connections need a grant token issued by the auth endpoint, usable once."""
+        self.auth_token = auth_token
+        self.grant_tokens: set[str] = set()
         self.port: int | None = None
         self.app = web.Application()
         self.runner: web.AppRunner | None = None
@@ -35,6 +39,7 @@ class LocalTaskBroker:
         self.task_settings: dict[TaskId, TaskSettings] = {}
         self.rpc_messages: dict[TaskId, list[dict]] = {}
         self.app.router.add_get(LOCAL_TASK_BROKER_WS_PATH, self.websocket_handler)
+        self.app.router.add_post(LOCAL_TASK_BROKER_AUTH_PATH, self.auth_handler)
 
     async def start(self) -> None:
         self.runner = web.AppRunner(self.app)
@@ -59,8 +64,23 @@ class LocalTaskBroker:
         if self.runner:
             await self.runner.cleanup()
 
+    async def auth_handler(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if self.auth_token is None or body.get("token") != self.auth_token:
+            raise web.HTTPForbidden()
+
+        grant_token = nanoid()
+        self.grant_tokens.add(grant_token)
+        return web.json_response({"data": {"token": grant_token}})
+
     async def websocket_handler(self, request: web.Request) -> web_ws.WebSocketResponse:
         print(f"WebSocket connection request from {request.remote}")
+        if self.auth_token is not None:
+            grant_token = request.headers.get("Authorization", "")[len("Bearer ") :]
+            if grant_token not in self.grant_tokens:
+                raise web.HTTPForbidden()
+            self.grant_tokens.remove(grant_token)  # consumed on first use
+
         ws = web_ws.WebSocketResponse()
         await ws.prepare(request)
         connection_id = nanoid()
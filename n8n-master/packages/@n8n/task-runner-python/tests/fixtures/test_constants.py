@@ -1,5 +1,7 @@
 # Local task broker
 LOCAL_TASK_BROKER_WS_PATH = "/runners/_ws"
+LOCAL_TASK_BROKER_AUTH_PATH = "/runners/auth"
+LOCAL_TASK_BROKER_AUTH_TOKEN = "test_auth_token"
 
 # Timing
 TASK_RESPONSE_WAIT = 3
@@ -38,3 +38,30 @@ async def test_health_check_server_ressponds_mid_execution(broker, manager):
         response = await session.get(manager.get_health_check_url())
         assert response.status == 200
         assert await response.text() == "OK"
+
+
+@pytest.mark.asyncio
+async def test_liveness_endpoint(broker, manager):
+    async with aiohttp.ClientSession() as session:
+        response = await session.get(f"{manager.get_health_check_url()}/healthz")
+        assert response.status == 200
+        assert await response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_endpoint_after_registration(broker, manager):
+    url = f"{manager.get_health_check_url()}/readyz"
+
+    async with aiohttp.ClientSession() as session:
+        for _ in range(50):
+            response = await session.get(url)
+            if response.status == 200:
+                break
+            await asyncio.sleep(0.1)
+
+        readiness = await response.json()
+
+    assert response.status == 200
+    assert readiness["ready"] is True
+    assert readiness["checks"]["registered"] is True
+    assert readiness["free_slots"] > 0
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import signal
+import sys
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from tests.fixtures.local_task_broker import LocalTaskBroker
+from tests.fixtures.task_runner_manager import TaskRunnerManager
+from tests.fixtures.test_constants import LOCAL_TASK_BROKER_AUTH_TOKEN
+
+
+@pytest_asyncio.fixture
+async def broker():
+    # Rejects a grant token used twice, so each runner process needs its own.
+    broker = LocalTaskBroker(auth_token=LOCAL_TASK_BROKER_AUTH_TOKEN)
+    await broker.start()
+    yield broker
+    await broker.stop()
+
+
+@pytest_asyncio.fixture
+async def supervisor_manager(broker):
+    manager = TaskRunnerManager(
+        task_broker_url=broker.get_url(),
+        custom_env={
+            "N8N_RUNNERS_SUPERVISOR_PROCESSES": "2",
+            "N8N_RUNNERS_AUTH_TOKEN": LOCAL_TASK_BROKER_AUTH_TOKEN,
+        },
+    )
+    await manager.start()
+    yield manager
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_registers_one_runner_per_process(broker, supervisor_manager):
+    for _ in range(50):
+        if len(broker.get_messages_of_type("runner:info")) == 2:
+            break
+        await asyncio.sleep(0.1)
+
+    assert len(broker.get_messages_of_type("runner:info")) == 2
+
+
+@pytest.mark.asyncio
+async def test_supervisor_serves_aggregated_metrics(broker, supervisor_manager):
+    url = f"{supervisor_manager.get_health_check_url()}/metrics"
+
+    async with aiohttp.ClientSession() as session:
+        for _ in range(50):
+            response = await session.get(url)
+            metrics = await response.json()
+            if metrics["processes_alive"] == 2:
+                break
+            await asyncio.sleep(0.1)
+
+    assert metrics["processes"] == 2
+    assert metrics["processes_alive"] == 2
+    assert metrics["max_concurrency"] == 5
+
+
+def child_pids(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        state, ppid = stat[0], int(stat[1])
+        if ppid == pid and state != "Z":
+            children.append(int(entry))
+    return children
+
+
+def is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform != "linux", reason="parent death signal is Linux only")
+async def test_runner_processes_exit_when_supervisor_is_killed(
+    broker, supervisor_manager
+):
+    for _ in range(50):
+        if len(broker.get_messages_of_type("runner:info")) == 2:
+            break
+        await asyncio.sleep(0.1)
+
+    assert supervisor_manager.subprocess is not None
+    runner_pids = child_pids(supervisor_manager.subprocess.pid)
+    assert len(runner_pids) >= 2
+
+    # Not awaiting the supervisor, its stdout stays open while any runner lives.
+    supervisor_manager.subprocess.send_signal(signal.SIGKILL)
+
+    for _ in range(50):
+        if not any(is_running(pid) for pid in runner_pids):
+            break
+        await asyncio.sleep(0.1)
+
+    still_running = [pid for pid in runner_pids if is_running(pid)]
+    for pid in still_running:
+        os.kill(pid, signal.SIGKILL)
+    assert still_running == []
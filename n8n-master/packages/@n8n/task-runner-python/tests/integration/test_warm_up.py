@@ -0,0 +1,57 @@
+import asyncio
+import textwrap
+
+import pytest
+import pytest_asyncio
+from src.nanoid import nanoid
+
+from tests.fixtures.task_runner_manager import TaskRunnerManager
+from tests.integration.conftest import create_task_settings, wait_for_task_done
+
+
+@pytest_asyncio.fixture
+async def manager_with_warm_up(broker):
+    manager = TaskRunnerManager(
+        task_broker_url=broker.get_url(),
+        custom_env={
+            "N8N_RUNNERS_WARM_UP_ENABLED": "true",
+            "N8N_RUNNERS_STDLIB_ALLOW": "json",
+        },
+    )
+    await manager.start()
+    yield manager
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_runs_before_first_task(broker, manager_with_warm_up):
+    for _ in range(50):
+        if any(
+            "Warm-up completed" in line for line in manager_with_warm_up.stdout_buffer
+        ):
+            break
+        await asyncio.sleep(0.1)
+
+    warm_up_index = next(
+        i
+        for i, line in enumerate(manager_with_warm_up.stdout_buffer)
+        if "Warm-up completed" in line
+    )
+    registered_index = next(
+        i
+        for i, line in enumerate(manager_with_warm_up.stdout_buffer)
+        if "Registered with broker" in line
+    )
+    assert warm_up_index < registered_index
+
+    task_id = nanoid()
+    code = textwrap.dedent("""
+        import json
+        return [{"json": json.loads('{"warm": true}')}]
+    """)
+    task_settings = create_task_settings(code=code, node_mode="all_items")
+    await broker.send_task(task_id=task_id, task_settings=task_settings)
+
+    result = await wait_for_task_done(broker, task_id)
+
+    assert result["data"]["result"] == [{"json": {"warm": True}}]
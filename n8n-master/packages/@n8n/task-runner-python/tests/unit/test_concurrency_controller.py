@@ -0,0 +1,114 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.concurrency_controller import ConcurrencyController
+from src.host_load import HostLoad
+from src.runner_metrics import RunnerMetrics
+
+
+def sampler_returning(*loads: HostLoad) -> Mock:
+    sampler = Mock()
+    sampler.sample.side_effect = list(loads)
+    return sampler
+
+
+HEALTHY = HostLoad(cpu_saturation=0.2, memory_headroom=0.5)
+BUSY = HostLoad(cpu_saturation=0.8, memory_headroom=0.5)
+
+
+class TestConcurrencyController:
+    def create(self, *loads: HostLoad) -> ConcurrencyController:
+        controller = ConcurrencyController(
+            min_concurrency=1,
+            max_concurrency=8,
+            metrics=RunnerMetrics(),
+            sampler=sampler_returning(*loads),
+        )
+        controller.next_adjustment_at = 0
+        return controller
+
+    def update(self, controller: ConcurrencyController, running: int) -> int:
+        controller.next_adjustment_at = 0  # skip the interval between decisions
+        return controller.update(running)
+
+    @pytest.mark.parametrize(
+        "load, reason",
+        [
+            (HostLoad(cpu_saturation=0.95, memory_headroom=0.5), "cpu"),
+            (HostLoad(cpu_saturation=0.2, memory_headroom=0.05), "memory"),
+        ],
+    )
+    def test_halves_limit_on_overload(self, load, reason):
+        controller = self.create(load)
+
+        assert self.update(controller, 8) == 4
+        assert controller.metrics.concurrency_limit == 4
+        assert controller.metrics.concurrency_decreases == 1
+        assert controller.metrics.concurrency_last_reason == reason
+
+    def test_never_goes_below_min(self):
+        overloaded = HostLoad(cpu_saturation=1.0, memory_headroom=None)
+        controller = self.create(*[overloaded] * 5)
+
+        for _ in range(5):
+            limit = self.update(controller, 0)
+
+        assert limit == 1
+
+    def test_grows_by_one_only_while_saturated(self):
+        overloaded = HostLoad(cpu_saturation=1.0, memory_headroom=None)
+        controller = self.create(overloaded, HEALTHY, HEALTHY, HEALTHY)
+
+        assert self.update(controller, 8) == 4
+        assert self.update(controller, 2) == 4  # idle slots, no evidence for more
+        assert self.update(controller, 4) == 5
+        assert self.update(controller, 5) == 6
+        assert controller.metrics.concurrency_increases == 2
+
+    def degrade_latency(self, controller: ConcurrencyController) -> None:
+        for _ in range(5):
+            controller.record_task_latency(0.1)
+        for _ in range(10):
+            controller.record_task_latency(1.0)
+
+    def test_decreases_when_latency_degrades_under_pressure(self):
+        controller = self.create(BUSY)
+        self.degrade_latency(controller)
+
+        assert self.update(controller, 8) == 4
+        assert controller.metrics.concurrency_last_reason == "latency"
+
+    def test_ignores_latency_of_slow_tasks_on_healthy_host(self):
+        controller = self.create(HEALTHY)
+        self.degrade_latency(controller)
+
+        assert self.update(controller, 8) == 8
+        assert controller.metrics.concurrency_decreases == 0
+
+    def test_cuts_once_for_lasting_latency_change(self):
+        controller = self.create(BUSY, BUSY)
+        self.degrade_latency(controller)
+
+        assert self.update(controller, 8) == 4
+        controller.record_task_latency(1.0)
+
+        assert self.update(controller, 4) == 5
+        assert controller.metrics.concurrency_decreases == 1
+
+    def test_ignores_unavailable_signals(self):
+        controller = self.create(HostLoad(cpu_saturation=None, memory_headroom=None))
+
+        assert self.update(controller, 8) == 8
+        assert controller.metrics.concurrency_decreases == 0
+
+    def test_adjusts_at_most_once_per_interval(self):
+        overloaded = HostLoad(cpu_saturation=1.0, memory_headroom=None)
+        controller = self.create(overloaded, overloaded)
+
+        with patch("src.concurrency_controller.time.monotonic", return_value=100):
+            controller.update(8)
+            limit = controller.update(8)
+
+        assert limit == 4
+        assert controller.sampler.sample.call_count == 1
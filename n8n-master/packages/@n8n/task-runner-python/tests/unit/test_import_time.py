@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Own import cost of the entry point, excluding asyncio which it always needs.
+STARTUP_IMPORT_BUDGET_US = 80_000
+STARTUP_IMPORT_RUNS = 5  # minimum taken, more runs ride out noisy CI machines
+
+DEFERRED_MODULES = {
+    "src.main": {
+        "websockets",
+        "src.task_runner",
+        "src.task_analyzer",
+        "src.task_executor",
+        "src.message_serde",
+        "multiprocessing",
+    },
+    # preloaded into the forkserver, so inherited by every task subprocess
+    "src.task_executor": {
+        "websockets",
+        "src.task_runner",
+        "src.task_analyzer",
+        "src.message_serde",
+        "asyncio",
+    },
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, per `python -X importtime`."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize("module", DEFERRED_MODULES.keys())
+def test_heavy_modules_are_deferred(module):
+    imported = import_times(module).keys()
+
+    assert DEFERRED_MODULES[module].isdisjoint(imported)
+
+
+def test_entry_point_import_time_within_budget():
+    own_import_times = []
+    for _ in range(STARTUP_IMPORT_RUNS):
+        times = import_times("src.main")
+        own_import_times.append(times["src.main"] - times.get("asyncio", 0))
+
+    assert min(own_import_times) < STARTUP_IMPORT_BUDGET_US
@@ -0,0 +1,150 @@
+import json
+import logging
+import logging.handlers
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.constants import LOG_FORMAT, LOG_TIMESTAMP_FORMAT
+from src.logs import ColorFormatter, JsonFormatter, setup_logging
+
+
+def create_record(message: str = "Completed task", **extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        name="src.task_runner",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg=message,
+        args=(),
+        exc_info=None,
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    def test_includes_task_context_as_fields(self):
+        record = create_record(
+            task={"task_id": "abc", "node_name": "Code", "duration_ms": 12}
+        )
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Completed task"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "src.task_runner"
+        assert entry["task_id"] == "abc"
+        assert entry["node_name"] == "Code"
+        assert entry["duration_ms"] == 12
+
+    def test_task_context_does_not_replace_core_fields(self):
+        record = create_record(task={"task_id": "abc", "message": "x", "level": "y"})
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Completed task"
+        assert entry["level"] == "INFO"
+        assert entry["task_id"] == "abc"
+
+    def test_includes_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = create_record()
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestColorFormatter:
+    @pytest.fixture
+    def formatter(self):
+        with patch("src.logs.sys.stdout.isatty", return_value=True):
+            formatter = ColorFormatter(LOG_FORMAT, LOG_TIMESTAMP_FORMAT)
+        formatter.use_colors = True
+        return formatter
+
+    def test_colors_level_and_message(self, formatter):
+        formatted = formatter.format(create_record("hello\tworld"))
+
+        timestamp, level, message = formatted.split("  ", 2)
+        assert level == "\033[32mINFO\033[0m"
+        assert message == "\033[32mhello\tworld\033[0m"
+        assert timestamp.count(":") == 2
+
+    def test_without_colors_uses_log_format(self, formatter):
+        formatter.use_colors = False
+
+        assert formatter.format(create_record("hello")).endswith("\tINFO\thello")
+
+
+class TestSetupLogging:
+    @pytest.fixture(autouse=True)
+    def restore_root_logger(self):
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        yield
+        root.handlers, root.level = handlers, level
+
+    def test_records_go_through_queue(self):
+        with patch("src.logs.atexit.register") as register:
+            setup_logging()
+
+        handler = logging.getLogger().handlers[-1]
+        listener = register.call_args.args[0].__self__
+        listener.stop()
+
+        assert isinstance(handler, logging.handlers.QueueHandler)
+        assert isinstance(listener, logging.handlers.QueueListener)
+
+    def test_json_format_from_env(self, monkeypatch):
+        monkeypatch.setenv("N8N_RUNNERS_LOG_FORMAT", "json")
+
+        with patch("src.logs.atexit.register") as register:
+            setup_logging()
+
+        listener = register.call_args.args[0].__self__
+        listener.stop()
+
+        assert isinstance(listener.handlers[0].formatter, JsonFormatter)
+
+    def test_json_format_logs_exception_through_queue(self, monkeypatch, capsys):
+        monkeypatch.setenv("N8N_RUNNERS_LOG_FORMAT", "json")
+
+        with patch("src.logs.atexit.register") as register:
+            setup_logging()
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("src.task_runner").exception(
+                "Task %s failed", "abc", extra={"task": {"task_id": "abc"}}
+            )
+
+        register.call_args.args[0].__self__.stop()
+        entry = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+
+        assert entry["message"] == "Task abc failed"
+        assert entry["task_id"] == "abc"
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_repeated_setup_does_not_duplicate_records(self, capsys):
+        with patch("src.logs.atexit.register") as register:
+            setup_logging()
+            setup_logging()
+
+        logging.getLogger("src.task_runner").warning("Only once")
+        register.call_args.args[0].__self__.stop()
+
+        assert capsys.readouterr().out.count("Only once") == 1
+        assert (
+            sum(
+                isinstance(handler, logging.handlers.QueueHandler)
+                for handler in logging.getLogger().handlers
+            )
+            == 1
+        )
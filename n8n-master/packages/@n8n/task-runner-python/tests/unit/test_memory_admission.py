@@ -0,0 +1,73 @@
+import os
+from unittest.mock import Mock, patch
+
+from src.constants import MEMORY_PAYLOAD_FACTOR, MEMORY_TASK_BASELINE
+from src.host_load import read_rss
+from src.memory_admission import MemoryAdmission
+from src.runner_metrics import RunnerMetrics
+from src.task_state import TaskState
+
+MiB = 1024 * 1024
+
+
+def task_with(memory_estimate: int = 0, pid: int | None = None) -> TaskState:
+    task_state = TaskState("task")
+    task_state.memory_estimate = memory_estimate
+    if pid is not None:
+        task_state.process = Mock(pid=pid)
+    return task_state
+
+
+def fake_rss(rss_by_pid: dict[int, int]):
+    return lambda pid: rss_by_pid.get(pid)
+
+
+class TestMemoryAdmission:
+    def test_estimate_scales_with_payload(self):
+        assert MemoryAdmission.estimate(0) == MEMORY_TASK_BASELINE
+        assert (
+            MemoryAdmission.estimate(10 * MiB)
+            == MEMORY_TASK_BASELINE + 10 * MiB * MEMORY_PAYLOAD_FACTOR
+        )
+
+    def test_projection_uses_larger_of_estimate_and_child_rss(self):
+        admission = MemoryAdmission(budget=1024 * MiB, metrics=RunnerMetrics())
+        tasks = [
+            task_with(memory_estimate=100 * MiB, pid=1),  # child still small
+            task_with(memory_estimate=40 * MiB, pid=2),  # child grew past estimate
+            task_with(),  # waiting for settings
+        ]
+        rss = {os.getpid(): 50 * MiB, 1: 10 * MiB, 2: 300 * MiB}
+
+        with patch("src.memory_admission.read_rss", side_effect=fake_rss(rss)):
+            usage = admission.projected_usage(tasks)
+
+        assert usage == 50 * MiB + 100 * MiB + 300 * MiB + MEMORY_TASK_BASELINE
+        assert admission.metrics.memory_projected_usage == usage
+
+    def test_free_slots_counts_baseline_tasks_that_fit(self):
+        admission = MemoryAdmission(
+            budget=MEMORY_TASK_BASELINE * 4, metrics=RunnerMetrics()
+        )
+        rss = {os.getpid(): MEMORY_TASK_BASELINE}
+
+        with patch("src.memory_admission.read_rss", side_effect=fake_rss(rss)):
+            assert admission.free_slots([]) == 3
+            assert admission.free_slots([task_with(), task_with()]) == 1
+            assert not admission.can_admit([task_with()] * 3)
+
+    def test_fits_task_of_known_size(self):
+        admission = MemoryAdmission(budget=512 * MiB, metrics=RunnerMetrics())
+        rss = {os.getpid(): 100 * MiB}
+
+        with patch("src.memory_admission.read_rss", side_effect=fake_rss(rss)):
+            assert admission.fits([task_with()], MemoryAdmission.estimate(50 * MiB))
+            assert not admission.fits(
+                [task_with()], MemoryAdmission.estimate(100 * MiB)
+            )
+
+    def test_read_rss_of_own_process(self):
+        rss = read_rss(os.getpid())
+
+        if rss is not None:  # only readable where /proc is mounted
+            assert rss > 0
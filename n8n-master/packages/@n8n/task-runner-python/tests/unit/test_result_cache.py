@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.config.security_config import SecurityConfig
+from src.message_types.broker import TaskSettings
+from src.result_cache import ResultCache
+from src.runner_metrics import RunnerMetrics
+
+
+def security_config(**overrides) -> SecurityConfig:
+    config = {
+        "stdlib_allow": {"json"},
+        "external_allow": set(),
+        "builtins_deny": {"eval"},
+        "runner_env_deny": True,
+    }
+    config.update(overrides)
+    return SecurityConfig(**config)
+
+
+def task_settings(**overrides) -> TaskSettings:
+    settings = {
+        "code": "# n8n: cacheable\nreturn _items",
+        "node_mode": "all_items",
+        "continue_on_fail": False,
+        "items": [{"json": {"a": 1}}],
+        "workflow_name": "workflow",
+        "workflow_id": "workflow-id",
+        "node_name": "node",
+        "node_id": "node-id",
+    }
+    settings.update(overrides)
+    return TaskSettings(**settings)
+
+
+class TestResultCache:
+    @pytest.fixture
+    def cache(self):
+        return ResultCache(
+            ttl=60,
+            max_size=100,
+            security_config=security_config(),
+            metrics=RunnerMetrics(),
+        )
+
+    def test_is_cacheable_requires_marker_line(self):
+        assert ResultCache.is_cacheable("x = 1\n  # n8n: cacheable\nreturn []")
+        assert not ResultCache.is_cacheable("return []")
+        assert not ResultCache.is_cacheable('return ["# n8n: cacheable"]')
+
+    def test_key_depends_on_code_inputs_mode_and_security_config(self, cache):
+        key = cache.key(task_settings())
+
+        assert cache.key(task_settings()) == key
+        assert cache.key(task_settings(code="# n8n: cacheable\nreturn []")) != key
+        assert cache.key(task_settings(items=[{"json": {"a": 2}}])) != key
+        assert cache.key(task_settings(node_mode="per_item")) != key
+
+        other_cache = ResultCache(
+            ttl=60,
+            max_size=100,
+            security_config=security_config(stdlib_allow={"*"}),
+            metrics=RunnerMetrics(),
+        )
+        assert other_cache.key(task_settings()) != key
+
+    def test_key_ignores_dict_ordering_of_items(self, cache):
+        first = task_settings(items=[{"json": {"a": 1, "b": 2}}])
+        second = task_settings(items=[{"json": {"b": 2, "a": 1}}])
+
+        assert cache.key(first) == cache.key(second)
+
+    def test_get_counts_hits_and_misses(self, cache):
+        assert cache.get("key") is None
+
+        cache.put("key", [{"json": {}}], [["hello"]], 10)
+        entry = cache.get("key")
+
+        assert entry is not None
+        assert entry.result == [{"json": {}}]
+        assert entry.print_args == [["hello"]]
+        assert cache.metrics.result_cache_hits == 1
+        assert cache.metrics.result_cache_misses == 1
+
+    def test_expired_entries_are_misses(self, cache):
+        with patch("src.result_cache.time.monotonic", return_value=1000):
+            cache.put("key", [], [], 10)
+
+        with patch("src.result_cache.time.monotonic", return_value=1060):
+            assert cache.get("key") is None
+
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_evicts_least_recently_used_over_size_budget(self, cache):
+        cache.put("first", [], [], 40)
+        cache.put("second", [], [], 40)
+        cache.get("first")
+
+        cache.put("third", [], [], 40)
+
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+        assert cache.size == 80
+        assert cache.metrics.result_cache_evictions == 1
+        assert cache.metrics.result_cache_size == 80
+
+    def test_skips_results_larger_than_budget(self, cache):
+        cache.put("key", [], [], 101)
+
+        assert len(cache) == 0
+        assert cache.size == 0
@@ -1,12 +1,15 @@
 import logging
+import threading
+from queue import Queue
 from unittest.mock import Mock, patch
 
 import pytest
 
 pytest.importorskip("sentry_sdk")
 
-from src.config.sentry_config import SentryConfig
-from src.sentry import TaskRunnerSentry, setup_sentry
+from src.config.sentry_config import SentryConfig, parse_sample_rates
+from src.errors import ConfigurationError
+from src.sentry import CaptureQueueHandler, TaskRunnerSentry, setup_sentry
 from src.constants import (
     EXECUTOR_ALL_ITEMS_FILENAME,
     EXECUTOR_PER_ITEM_FILENAME,
@@ -42,26 +45,31 @@ class TestTaskRunnerSentry:
         with (
             patch("sentry_sdk.init") as mock_init,
             patch("sentry_sdk.set_tag") as mock_set_tag,
+            patch("sentry_sdk.flush"),
             patch("sentry_sdk.integrations.logging.LoggingIntegration") as mock_logging,
+            patch("sentry_sdk.integrations.logging.EventHandler"),
         ):
             mock_logging_instance = Mock()
             mock_logging.return_value = mock_logging_instance
             sentry = TaskRunnerSentry(sentry_config)
 
             sentry.init()
+            sentry.shutdown()
 
             mock_init.assert_called_once_with(
                 dsn="https://test@sentry.io/123456",
                 release="n8n@1.0.0",
                 environment="test",
                 server_name="test-deployment",
-                before_send=sentry._filter_out_ignored_errors,
+                before_send=sentry._before_send,
                 attach_stacktrace=True,
                 send_default_pii=False,
                 auto_enabling_integrations=False,
                 default_integrations=True,
                 integrations=[mock_logging_instance],
+                transport=None,
             )
+            mock_logging.assert_called_once_with(level=logging.ERROR, event_level=None)
             mock_set_tag.assert_called_once_with(
                 SENTRY_TAG_SERVER_TYPE_KEY, SENTRY_TAG_SERVER_TYPE_VALUE
             )
@@ -181,6 +189,142 @@ class TestTaskRunnerSentry:
             assert result == event
 
 
+def exception_event(exc_type: str = "TaskResultReadError", lineno: int = 10):
+    return {
+        "exception": {
+            "values": [
+                {
+                    "type": exc_type,
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "filename": "src/task_runner.py",
+                                "function": "_execute_task",
+                                "lineno": lineno,
+                            }
+                        ]
+                    },
+                }
+            ]
+        }
+    }
+
+
+class TestSentryEventFiltering:
+    def test_samples_by_error_type(self, sentry_config):
+        sentry_config.sample_rates = {"TaskResultReadError": 0.25, "*": 0.0}
+        sentry_config.dedup_window = 0
+        draws = iter([0.1, 0.5])
+        sentry = TaskRunnerSentry(sentry_config, random_source=lambda: next(draws))
+
+        assert sentry._before_send(exception_event(), {}) is not None
+        assert sentry._before_send(exception_event(), {}) is None
+        assert sentry._before_send(exception_event("OtherError"), {}) is None
+        assert sentry.dropped_sampled == 2
+
+    def test_sends_everything_without_sample_rates(self, sentry_config):
+        sentry_config.dedup_window = 0
+        sentry = TaskRunnerSentry(sentry_config, random_source=lambda: 0.99)
+
+        assert sentry._before_send(exception_event(), {}) is not None
+
+    def test_drops_duplicates_within_window(self, sentry_config):
+        sentry = TaskRunnerSentry(sentry_config)
+
+        with patch("src.sentry.time.monotonic", side_effect=[100.0, 110.0, 120.0]):
+            assert sentry._before_send(exception_event(lineno=1), {}) is not None
+            assert sentry._before_send(exception_event(lineno=1), {}) is None
+            assert sentry._before_send(exception_event(lineno=2), {}) is not None
+
+        assert sentry.dropped_duplicate == 1
+
+    def test_resends_duplicate_after_window(self, sentry_config):
+        sentry_config.dedup_window = 60
+        sentry = TaskRunnerSentry(sentry_config)
+
+        with patch("src.sentry.time.monotonic", side_effect=[100.0, 161.0]):
+            assert sentry._before_send(exception_event(), {}) is not None
+            assert sentry._before_send(exception_event(), {}) is not None
+
+        assert sentry.dropped_duplicate == 0
+
+    def test_rate_limits_per_window(self, sentry_config):
+        sentry_config.rate_limit = 2
+        sentry_config.dedup_window = 0
+        sentry = TaskRunnerSentry(sentry_config)
+
+        with patch(
+            "src.sentry.time.monotonic", side_effect=[100.0, 101.0, 102.0, 160.0]
+        ):
+            results = [
+                sentry._before_send(exception_event(lineno=lineno), {})
+                for lineno in range(4)
+            ]
+
+        assert [result is not None for result in results] == [True, True, False, True]
+        assert sentry.dropped_rate_limited == 1
+        assert sentry.events_sent == 3
+
+    def test_ignored_errors_do_not_count_against_limits(self, sentry_config):
+        sentry_config.rate_limit = 1
+        sentry = TaskRunnerSentry(sentry_config)
+        ignored = exception_event(IGNORED_ERROR_TYPES[0].__name__)
+
+        assert sentry._before_send(ignored, {}) is None
+        assert sentry._before_send(exception_event(), {}) is not None
+
+
+class TestSentryCapture:
+    def test_captures_error_logs_on_background_thread(self, sentry_config):
+        import sentry_sdk
+        from sentry_sdk.transport import Transport
+
+        captured: list[tuple[str, dict]] = []
+
+        class CollectingTransport(Transport):
+            def capture_envelope(self, envelope):
+                event = envelope.get_event()
+                if event is not None:
+                    captured.append((threading.current_thread().name, event))
+
+        sentry = TaskRunnerSentry(sentry_config, transport=CollectingTransport())
+        sentry.init()
+        try:
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                logging.getLogger("test_sentry").error("Task failed", exc_info=True)
+            logging.getLogger("test_sentry").error("Broker unreachable")
+        finally:
+            sentry.shutdown()
+            sentry_sdk.get_client().close()
+
+        assert len(captured) == 2
+        thread_name, event = captured[0]
+        assert thread_name == "sentry-capture"
+        assert event["exception"]["values"][-1]["type"] == "RuntimeError"
+        assert event["tags"][SENTRY_TAG_SERVER_TYPE_KEY] == SENTRY_TAG_SERVER_TYPE_VALUE
+
+        _, message_event = captured[1]
+        frames = message_event["threads"]["values"][0]["stacktrace"]["frames"]
+        functions = [frame["function"] for frame in frames]
+        assert "test_captures_error_logs_on_background_thread" in functions
+        assert "_capture_records" not in functions
+
+    def test_drops_records_when_capture_queue_is_full(self):
+        queue: Queue = Queue(maxsize=1)
+        handler = CaptureQueueHandler(queue, stacktrace=lambda: {"frames": []})
+        record = logging.LogRecord(
+            "test", logging.ERROR, __file__, 1, "boom", None, None
+        )
+
+        handler.emit(record)
+        handler.emit(record)
+
+        assert queue.qsize() == 1
+        assert handler.dropped == 1
+
+
 class TestSetupSentry:
     def test_returns_none_when_disabled(self, disabled_sentry_config):
         result = setup_sentry(disabled_sentry_config)
@@ -254,3 +398,29 @@ class TestSentryConfig:
         assert config.n8n_version == ""
         assert config.environment == ""
         assert config.deployment_name == ""
+
+    @patch.dict(
+        "os.environ",
+        {
+            "N8N_RUNNERS_SENTRY_SAMPLE_RATES": "TaskRuntimeError=0.1, *=0.5",
+            "N8N_RUNNERS_SENTRY_RATE_LIMIT": "10",
+            "N8N_RUNNERS_SENTRY_DEDUP_WINDOW": "0",
+        },
+        clear=True,
+    )
+    def test_from_env_reads_sampling_settings(self):
+        config = SentryConfig.from_env()
+
+        assert config.sample_rates == {"TaskRuntimeError": 0.1, "*": 0.5}
+        assert config.rate_limit == 10
+        assert config.dedup_window == 0
+
+    @pytest.mark.parametrize("value", ["TaskRuntimeError", "=0.5", "X=abc", "X=1.5"])
+    def test_parse_sample_rates_rejects_invalid_entries(self, value):
+        with pytest.raises(ConfigurationError):
+            parse_sample_rates(value)
+
+    @patch.dict("os.environ", {"N8N_RUNNERS_SENTRY_RATE_LIMIT": "-1"}, clear=True)
+    def test_from_env_rejects_negative_rate_limit(self):
+        with pytest.raises(ConfigurationError):
+            SentryConfig.from_env()
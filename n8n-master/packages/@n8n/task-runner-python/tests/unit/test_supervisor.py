@@ -0,0 +1,196 @@
+import urllib.error
+from email.message import Message
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.config.supervisor_config import SupervisorConfig
+from src.config.task_runner_config import TaskRunnerConfig
+from src.errors import ConfigurationError
+from src.supervisor import Supervisor, split_concurrency
+
+
+@pytest.fixture
+def config():
+    return TaskRunnerConfig(
+        grant_token="test-token",
+        task_broker_uri="http://127.0.0.1:5679",
+        max_concurrency=5,
+        max_payload_size=1024 * 1024,
+        task_timeout=60,
+        auto_shutdown_timeout=0,
+        graceful_shutdown_timeout=10,
+        stdlib_allow={"*"},
+        external_allow={"*"},
+        builtins_deny=set(),
+        env_deny=False,
+    )
+
+
+def exited_process(exitcode: int):
+    process = Mock()
+    process.exitcode = exitcode
+    process.is_alive.return_value = False
+    return process
+
+
+class TestSplitConcurrency:
+    @pytest.mark.parametrize(
+        "max_concurrency,processes,expected",
+        [
+            (5, 1, [5]),
+            (6, 3, [2, 2, 2]),
+            (5, 2, [3, 2]),
+            (10, 4, [3, 3, 2, 2]),
+        ],
+    )
+    def test_spreads_concurrency_evenly(self, max_concurrency, processes, expected):
+        assert split_concurrency(max_concurrency, processes) == expected
+
+
+class TestSupervisor:
+    def test_assigns_concurrency_share_to_each_runner(self, config):
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=2, auth_token="test-auth-token")
+        )
+
+        assert [r.config.max_concurrency for r in supervisor.runners] == [3, 2]
+        assert all(r.config.grant_token == "test-token" for r in supervisor.runners)
+
+    def test_caps_processes_at_max_concurrency(self, config):
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=8, auth_token="test-auth-token")
+        )
+
+        assert len(supervisor.runners) == 5
+        assert all(r.config.max_concurrency == 1 for r in supervisor.runners)
+
+    @pytest.mark.asyncio
+    async def test_restarts_crashed_runner(self, config):
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=2, auth_token="test-auth-token")
+        )
+        runner = supervisor.runners[0]
+        processes = [exited_process(1), exited_process(-9), exited_process(0)]
+
+        def spawn(_runner, _grant_token):
+            process = processes.pop(0)
+            if not processes:
+                supervisor.is_shutting_down = True
+            return process
+
+        with (
+            patch.object(supervisor, "_spawn", side_effect=spawn) as spawn_mock,
+            patch("src.supervisor.fetch_grant_token", side_effect=["t1", "t2", "t3"]),
+            patch("src.supervisor.wait_for_process_exit", new_callable=AsyncMock),
+            patch("src.supervisor.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await supervisor._supervise(runner)
+
+        assert runner.restarts == 2
+        assert supervisor.metrics()["restarts"] == 2
+        assert [call.args[1] for call in spawn_mock.call_args_list] == [
+            "t1",
+            "t2",
+            "t3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fetches_grant_token_with_auth_token(self, config):
+        config.auto_shutdown_timeout = 15
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=2, auth_token="test-auth-token")
+        )
+        runner = supervisor.runners[0]
+
+        with (
+            patch.object(supervisor, "_spawn", return_value=exited_process(0)),
+            patch(
+                "src.supervisor.fetch_grant_token", return_value="t1"
+            ) as fetch_grant_token,
+            patch("src.supervisor.wait_for_process_exit", new_callable=AsyncMock),
+        ):
+            await supervisor._supervise(runner)
+
+        fetch_grant_token.assert_called_once_with(
+            "http://127.0.0.1:5679/runners/auth", "test-auth-token"
+        )
+
+    @pytest.mark.asyncio
+    async def test_stops_runner_when_auth_token_is_rejected(self, config):
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=2, auth_token="wrong")
+        )
+        runner = supervisor.runners[0]
+        rejected = urllib.error.HTTPError(
+            supervisor.auth_url, 403, "Forbidden", Message(), None
+        )
+
+        with (
+            patch.object(supervisor, "_spawn") as spawn,
+            patch("src.supervisor.fetch_grant_token", side_effect=rejected),
+        ):
+            await supervisor._supervise(runner)
+
+        spawn.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_does_not_restart_runner_exiting_after_idle(self, config):
+        config.auto_shutdown_timeout = 15
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=2, auth_token="test-auth-token")
+        )
+        runner = supervisor.runners[0]
+
+        with (
+            patch.object(supervisor, "_spawn", return_value=exited_process(0)) as spawn,
+            patch("src.supervisor.fetch_grant_token", return_value="t1"),
+            patch("src.supervisor.wait_for_process_exit", new_callable=AsyncMock),
+        ):
+            await supervisor._supervise(runner)
+
+        spawn.assert_called_once()
+        assert runner.restarts == 0
+
+    def test_aggregates_running_tasks_across_runners(self, config):
+        supervisor = Supervisor(
+            config, SupervisorConfig(processes=3, auth_token="test-auth-token")
+        )
+        supervisor.running_tasks_counts[0] = 2
+        supervisor.running_tasks_counts[2] = 1
+
+        metrics = supervisor.metrics()
+
+        assert metrics["running_tasks"] == 3
+        assert metrics["processes"] == 3
+        assert metrics["processes_alive"] == 0
+
+
+class TestSupervisorConfig:
+    @patch.dict("os.environ", {}, clear=True)
+    def test_disabled_by_default(self):
+        assert SupervisorConfig.from_env().enabled is False
+
+    @patch.dict(
+        "os.environ",
+        {
+            "N8N_RUNNERS_SUPERVISOR_PROCESSES": "4",
+            "N8N_RUNNERS_AUTH_TOKEN": "test-auth-token",
+        },
+    )
+    def test_enabled_with_multiple_processes(self):
+        config = SupervisorConfig.from_env()
+
+        assert config.processes == 4
+        assert config.auth_token == "test-auth-token"
+        assert config.enabled is True
+
+    @patch.dict("os.environ", {"N8N_RUNNERS_SUPERVISOR_PROCESSES": "4"}, clear=True)
+    def test_requires_auth_token_with_multiple_processes(self):
+        with pytest.raises(ConfigurationError):
+            SupervisorConfig.from_env()
+
+    @patch.dict("os.environ", {"N8N_RUNNERS_SUPERVISOR_PROCESSES": "0"})
+    def test_rejects_non_positive_processes(self):
+        with pytest.raises(ConfigurationError):
+            SupervisorConfig.from_env()
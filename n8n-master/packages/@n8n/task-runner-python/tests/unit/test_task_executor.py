@@ -1,18 +1,68 @@
+import fcntl
+import logging
+import os
 import pytest
 import json
+import zlib
 from unittest.mock import MagicMock, patch
 
 from src.task_executor import TaskExecutor
 from src.pipe_reader import PipeReader
-from src.errors import TaskCancelledError, TaskKilledError, TaskSubprocessFailedError
-from src.constants import SIGTERM_EXIT_CODE, SIGKILL_EXIT_CODE, PIPE_MSG_PREFIX_LENGTH
+from src.errors import (
+    InvalidPipeMsgContentError,
+    InvalidPipeMsgLengthError,
+    TaskCancelledError,
+    TaskKilledError,
+    TaskSubprocessFailedError,
+)
+from src.constants import (
+    SIGTERM_EXIT_CODE,
+    SIGKILL_EXIT_CODE,
+    PIPE_FRAME_VERSION,
+    PIPE_FRAME_FLAG_COMPRESSED,
+    PIPE_BUFFER_SIZE,
+    PIPE_DEFAULT_BUFFER_SIZE,
+    PIPE_FRAME_MAX_SIZE,
+)
 from src.message_types.pipe import (
-    PipeResultMessage,
-    PipeErrorMessage,
+    PIPE_FRAME_HEADER,
+    PipeFrameType,
     TaskErrorInfo,
 )
 
 
+def frame_header(frame_type: PipeFrameType, length: int = 0, flags: int = 0) -> bytes:
+    return PIPE_FRAME_HEADER.pack(PIPE_FRAME_VERSION, frame_type, flags, length)
+
+
+def frame(frame_type: PipeFrameType, payload: bytes = b"", flags: int = 0) -> bytes:
+    return frame_header(frame_type, len(payload), flags) + payload
+
+
+def readv_returning(reads: list[bytes]):
+    """Side effect for a mocked os.readv that fills the buffer with each read in turn."""
+
+    reads_iter = iter(reads)
+
+    def readv(_fd, buffers):
+        data = next(reads_iter)
+        buffers[0][: len(data)] = data
+        return len(data)
+
+    return readv
+
+
+def read_frames(data: bytes) -> PipeReader:
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, data)
+    os.close(write_fd)
+
+    reader = PipeReader(read_fd, MagicMock())
+    reader.run()
+    os.close(read_fd)
+    return reader
+
+
 class TestTaskExecutorProcessExitHandling:
     def test_sigterm_raises_task_cancelled_error(self):
         process = MagicMock()
@@ -32,6 +82,27 @@ class TestTaskExecutorProcessExitHandling:
                 continue_on_fail=False,
             )
 
+    def test_cancel_during_start_kills_started_process(self):
+        process = MagicMock()
+        process.is_alive.return_value = True
+
+        read_conn = MagicMock()
+        write_conn = MagicMock()
+        read_conn.fileno.return_value = 999
+
+        with pytest.raises(TaskCancelledError):
+            TaskExecutor.execute_process(
+                process=process,
+                read_conn=read_conn,
+                write_conn=write_conn,
+                task_timeout=60,
+                continue_on_fail=False,
+                is_cancelled=lambda: True,
+            )
+
+        process.start.assert_called_once()
+        process.kill.assert_called_once()
+
     def test_sigkill_raises_task_killed_error(self):
         process = MagicMock()
         process.is_alive.return_value = False
@@ -92,16 +163,16 @@ class TestTaskExecutorProcessExitHandling:
 
 
 class TestTaskExecutorPipeCommunication:
-    @patch("os.read")
-    def test_successful_result_communication(self, mock_os_read):
-        result_data: PipeResultMessage = {
-            "result": [{"json": {"foo": "bar"}}],
-            "print_args": [],
-        }
-        result_json = json.dumps(result_data).encode("utf-8")
-        result_length = len(result_json).to_bytes(PIPE_MSG_PREFIX_LENGTH, "big")
-
-        mock_os_read.side_effect = [result_length, result_json]
+    @patch("os.readv")
+    def test_successful_result_communication(self, mock_os_readv):
+        result_json = json.dumps([{"json": {"foo": "bar"}}]).encode("utf-8")
+        mock_os_readv.side_effect = readv_returning(
+            [
+                frame_header(PipeFrameType.RESULT_CHUNK, len(result_json)),
+                result_json,
+                frame_header(PipeFrameType.END),
+            ]
+        )
 
         process = MagicMock()
         process.is_alive.return_value = False
@@ -123,8 +194,8 @@ class TestTaskExecutorPipeCommunication:
         assert print_args == []
         assert size == len(result_json)
 
-    @patch("os.read")
-    def test_successful_error_communication(self, mock_os_read):
+    @patch("os.readv")
+    def test_successful_error_communication(self, mock_os_readv):
         from src.errors import TaskRuntimeError
 
         error_info: TaskErrorInfo = {
@@ -133,14 +204,14 @@ class TestTaskExecutorPipeCommunication:
             "stack": "traceback...",
             "stderr": "",
         }
-        error_data: PipeErrorMessage = {
-            "error": error_info,
-            "print_args": [],
-        }
-        error_json = json.dumps(error_data).encode("utf-8")
-        error_length = len(error_json).to_bytes(PIPE_MSG_PREFIX_LENGTH, "big")
-
-        mock_os_read.side_effect = [error_length, error_json]
+        error_json = json.dumps(error_info).encode("utf-8")
+        mock_os_readv.side_effect = readv_returning(
+            [
+                frame_header(PipeFrameType.ERROR, len(error_json)),
+                error_json,
+                frame_header(PipeFrameType.END),
+            ]
+        )
 
         process = MagicMock()
         process.is_alive.return_value = False
@@ -163,36 +234,213 @@ class TestTaskExecutorPipeCommunication:
         assert exc_info.value.stack_trace == "traceback..."
 
 
+class TestPipeFraming:
+    def test_reassembles_result_chunks_and_print_records(self):
+        result_json = json.dumps([{"json": {"foo": "bar"}}]).encode("utf-8")
+        data = (
+            frame(PipeFrameType.PRINT, b'["hello"]')
+            + frame(PipeFrameType.RESULT_CHUNK, result_json[:5])
+            + frame(PipeFrameType.RESULT_CHUNK, result_json[5:])
+            + frame(PipeFrameType.METRICS, b'{"max_rss_kb": 1, "cpu_time": 0.5}')
+            + frame(PipeFrameType.END)
+        )
+
+        reader = read_frames(data)
+
+        assert reader.error is None
+        assert reader.pipe_message == {
+            "result": [{"json": {"foo": "bar"}}],
+            "print_args": [["hello"]],
+        }
+        assert reader.metrics == {"max_rss_kb": 1, "cpu_time": 0.5}
+
+    def test_decompresses_compressed_frames(self):
+        result_json = json.dumps([{"json": {"a": "x" * 1000}}]).encode("utf-8")
+        data = frame(
+            PipeFrameType.RESULT_CHUNK,
+            zlib.compress(result_json),
+            PIPE_FRAME_FLAG_COMPRESSED,
+        ) + frame(PipeFrameType.END)
+
+        reader = read_frames(data)
+
+        assert reader.error is None
+        assert reader.pipe_message is not None
+        assert reader.pipe_message["result"] == [{"json": {"a": "x" * 1000}}]
+        assert reader.message_size == len(result_json)
+
+    def test_rejects_unsupported_version(self):
+        data = PIPE_FRAME_HEADER.pack(PIPE_FRAME_VERSION + 1, PipeFrameType.END, 0, 0)
+
+        reader = read_frames(data)
+
+        assert isinstance(reader.error, InvalidPipeMsgContentError)
+
+    def test_rejects_unknown_frame_type(self):
+        data = PIPE_FRAME_HEADER.pack(PIPE_FRAME_VERSION, 99, 0, 0)
+
+        reader = read_frames(data)
+
+        assert isinstance(reader.error, InvalidPipeMsgContentError)
+
+    def test_rejects_empty_payload_frame(self):
+        reader = read_frames(frame(PipeFrameType.RESULT_CHUNK))
+
+        assert isinstance(reader.error, InvalidPipeMsgLengthError)
+
+    def test_rejects_frame_over_size_limit_before_reading_it(self):
+        data = frame_header(PipeFrameType.RESULT_CHUNK, PIPE_FRAME_MAX_SIZE + 1)
+
+        reader = read_frames(data)
+
+        assert isinstance(reader.error, InvalidPipeMsgLengthError)
+
+    def test_rejects_compressed_frame_expanding_over_size_limit(self):
+        data = frame(
+            PipeFrameType.RESULT_CHUNK,
+            zlib.compress(b"[" + b" " * 1000 + b"]"),
+            PIPE_FRAME_FLAG_COMPRESSED,
+        ) + frame(PipeFrameType.END)
+
+        with patch("src.pipe_reader.PIPE_FRAME_MAX_SIZE", 100):
+            reader = read_frames(data)
+
+        assert isinstance(reader.error, InvalidPipeMsgContentError)
+
+    def test_rejects_message_over_size_limit(self):
+        data = (
+            frame(PipeFrameType.RESULT_CHUNK, b"[1,")
+            + frame(PipeFrameType.RESULT_CHUNK, b"2]")
+            + frame(PipeFrameType.END)
+        )
+
+        with patch("src.pipe_reader.PIPE_MSG_MAX_SIZE", 4):
+            reader = read_frames(data)
+
+        assert isinstance(reader.error, InvalidPipeMsgLengthError)
+
+    def test_fails_on_missing_end_frame(self):
+        reader = read_frames(frame(PipeFrameType.RESULT_CHUNK, b"[]"))
+
+        assert isinstance(reader.error, EOFError)
+
+    @pytest.mark.parametrize("compression_threshold", [0, 1])
+    def test_writer_round_trip(self, compression_threshold):
+        result = [{"json": {"index": i, "text": "ü" * 50}} for i in range(100)]
+        read_fd, write_fd = os.pipe()
+
+        with patch("src.task_executor.PIPE_FRAME_MAX_CHUNK_SIZE", 1024):
+            TaskExecutor._put_result(
+                write_fd, result, [["a", "b"], ["c"]], compression_threshold
+            )
+
+        reader = PipeReader(read_fd, MagicMock())
+        reader.run()
+        os.close(read_fd)
+
+        assert reader.error is None
+        assert reader.pipe_message == {
+            "result": result,
+            "print_args": [["a", "b"], ["c"]],
+        }
+        assert reader.metrics is not None
+        assert reader.metrics["max_rss_kb"] > 0
+
+
 class TestTaskExecutorLowLevelIO:
-    @patch("os.read")
-    def test_read_exact_bytes_single_read(self, mock_os_read):
+    @patch("os.readv")
+    def test_read_exact_bytes_single_read(self, mock_os_readv):
         data = b"test data"
-        mock_os_read.return_value = data
+        mock_os_readv.side_effect = readv_returning([data])
 
         result = PipeReader._read_exact_bytes(999, len(data))
 
         assert result == data
-        mock_os_read.assert_called_once_with(999, len(data))
+        mock_os_readv.assert_called_once()
 
-    @patch("os.read")
-    def test_read_exact_bytes_multiple_reads(self, mock_os_read):
-        mock_os_read.side_effect = [b"test", b" ", b"data"]
+    @patch("os.readv")
+    def test_read_exact_bytes_multiple_reads(self, mock_os_readv):
+        mock_os_readv.side_effect = readv_returning([b"test", b" ", b"data"])
 
         result = PipeReader._read_exact_bytes(999, 9)
 
         assert result == b"test data"
-        assert mock_os_read.call_count == 3
+        assert mock_os_readv.call_count == 3
 
-    @patch("os.read")
-    def test_read_exact_bytes_eof_error(self, mock_os_read):
-        mock_os_read.side_effect = [b"test", b""]  # empty for EOF
+    @patch("os.readv")
+    def test_read_exact_bytes_eof_error(self, mock_os_readv):
+        mock_os_readv.side_effect = readv_returning([b"test", b""])  # empty for EOF
 
         with pytest.raises(EOFError, match="Pipe closed before reading all data"):
             PipeReader._read_exact_bytes(999, 10)
 
-    @patch("os.write")
-    def test_write_bytes_write_failure(self, mock_os_write):
-        mock_os_write.return_value = 0
+    def test_parse_result_joins_chunks(self):
+        data = '[{"json": {"a": "ü"}}]'.encode("utf-8")
+        split = data.index("ü".encode("utf-8")) + 1  # inside the multi-byte character
+        chunks = [bytearray(data[:split]), bytearray(data[split:])]
+
+        assert PipeReader._parse_result(chunks) == [{"json": {"a": "ü"}}]
+        assert chunks == []
+
+    @patch("os.writev")
+    def test_write_buffers_write_failure(self, mock_os_writev):
+        mock_os_writev.return_value = 0
 
         with pytest.raises(OSError, match="Write failed"):
-            TaskExecutor._write_bytes(999, b"test data")
+            TaskExecutor._write_buffers(999, [b"test data"])
+
+    @patch("os.writev")
+    def test_write_buffers_resumes_after_partial_writes(self, mock_os_writev):
+        written = bytearray()
+
+        def partial_writev(_fd, views):
+            data = b"".join(bytes(view) for view in views)[:3]
+            written.extend(data)
+            return len(data)
+
+        mock_os_writev.side_effect = partial_writev
+
+        TaskExecutor._write_buffers(999, [b"header", b"", b"payload"])
+
+        assert bytes(written) == b"headerpayload"
+
+    @pytest.mark.parametrize(
+        "payload_size, enlarged",
+        [(PIPE_DEFAULT_BUFFER_SIZE, False), (PIPE_DEFAULT_BUFFER_SIZE + 1, True)],
+    )
+    def test_create_process_enlarges_pipe_only_for_large_payloads(
+        self, payload_size, enlarged
+    ):
+        with patch.object(TaskExecutor, "_enlarge_pipe") as enlarge_pipe:
+            _, read_conn, write_conn = TaskExecutor.create_process(
+                code="return []",
+                node_mode="all_items",
+                items=[],
+                security_config=MagicMock(),
+                payload_size=payload_size,
+            )
+        read_conn.close()
+        write_conn.close()
+
+        assert enlarge_pipe.called is enlarged
+
+    @pytest.mark.skipif(not hasattr(fcntl, "F_SETPIPE_SZ"), reason="Linux only")
+    def test_enlarge_pipe_keeps_capacity_when_not_permitted(self, caplog):
+        with (
+            patch("src.task_executor.fcntl.fcntl", side_effect=PermissionError),
+            caplog.at_level(logging.DEBUG, logger="src.task_executor"),
+        ):
+            TaskExecutor._enlarge_pipe(0)
+
+        assert "Not permitted to enlarge task pipe" in caplog.text
+
+    def test_enlarge_pipe(self):
+        read_fd, write_fd = os.pipe()
+        try:
+            TaskExecutor._enlarge_pipe(write_fd)
+
+            if hasattr(fcntl, "F_GETPIPE_SZ"):
+                assert fcntl.fcntl(write_fd, fcntl.F_GETPIPE_SZ) == PIPE_BUFFER_SIZE
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
@@ -1,27 +1,48 @@
+import asyncio
+import time
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch, Mock
 from websockets.exceptions import InvalidStatus
 
 from src.task_runner import TaskRunner
+from src.task_state import TaskState, TaskStatus
+from src.message_types import (
+    BrokerTaskCancel,
+    BrokerTaskSettings,
+    BrokerTaskOfferAccept,
+    RunnerTaskError,
+    RunnerTaskRejected,
+)
+from src.constants import (
+    TASK_REJECTED_REASON_AT_CAPACITY,
+    TASK_REJECTED_REASON_MEMORY_PRESSURE,
+    TASK_REJECTED_REASON_SHUTTING_DOWN,
+)
 from src.config.task_runner_config import TaskRunnerConfig
+from src.message_types.broker import TaskSettings
+
+
+def make_config(**overrides) -> TaskRunnerConfig:
+    defaults = dict(
+        grant_token="test-token",
+        task_broker_uri="http://127.0.0.1:5679",
+        max_concurrency=5,
+        max_payload_size=1024 * 1024,
+        task_timeout=60,
+        auto_shutdown_timeout=0,
+        graceful_shutdown_timeout=10,
+        stdlib_allow={"*"},
+        external_allow={"*"},
+        builtins_deny=set(),
+        env_deny=False,
+    )
+    return TaskRunnerConfig(**{**defaults, **overrides})
 
 
 class TestTaskRunnerConnectionRetry:
     @pytest.fixture
     def config(self):
-        return TaskRunnerConfig(
-            grant_token="test-token",
-            task_broker_uri="http://127.0.0.1:5679",
-            max_concurrency=5,
-            max_payload_size=1024 * 1024,
-            task_timeout=60,
-            auto_shutdown_timeout=0,
-            graceful_shutdown_timeout=10,
-            stdlib_allow={"*"},
-            external_allow={"*"},
-            builtins_deny=set(),
-            env_deny=False,
-        )
+        return make_config()
 
     @pytest.mark.asyncio
     async def test_connection_failure_logs_warning_not_crash(self, config):
@@ -67,3 +88,462 @@ class TestTaskRunnerConnectionRetry:
             assert "Authentication failed with status 403" in args
 
             assert mock_connect.call_count == 1
+
+
+class TestTaskRunnerCancellation:
+    @pytest.fixture
+    def runner(self):
+        config = make_config()
+        return TaskRunner(config)
+
+    def running_task(self, runner: TaskRunner, task_id: str) -> TaskState:
+        task_state = TaskState(task_id)
+        task_state.status = TaskStatus.RUNNING
+        task_state.process = Mock()
+        runner.running_tasks[task_id] = task_state
+        return task_state
+
+    @pytest.mark.asyncio
+    async def test_cancel_signals_without_waiting_for_exit(self, runner):
+        task_state = self.running_task(runner, "task-1")
+
+        with (
+            patch.object(runner.executor, "terminate_process") as terminate,
+            patch.object(runner.executor, "stop_process") as stop,
+            patch.object(runner, "_kill_pending_processes", new=AsyncMock()),
+        ):
+            await runner._handle_task_cancel(BrokerTaskCancel("task-1", "stopped"))
+
+        terminate.assert_called_once_with(task_state.process)
+        stop.assert_not_called()
+        assert task_state.status == TaskStatus.ABORTING
+        assert task_state.cancel_requested_at is not None
+
+    @pytest.mark.asyncio
+    async def test_mass_cancellation_shares_one_escalation(self, runner):
+        task_states = [self.running_task(runner, f"task-{i}") for i in range(3)]
+
+        with (
+            patch.object(runner.executor, "terminate_process"),
+            patch.object(runner.executor, "kill_process") as kill,
+            patch("src.task_runner.wait_for_process_exit", new=AsyncMock()),
+        ):
+            for task_state in task_states:
+                await runner._handle_task_cancel(
+                    BrokerTaskCancel(task_state.task_id, "stopped")
+                )
+
+            assert len(runner.kill_coroutines) == 1
+            await asyncio.gather(*runner.kill_coroutines)
+
+        assert kill.call_count == 3
+        assert runner.pending_kills == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_process_starts_is_seen_after_start(self, runner):
+        task_state = self.running_task(runner, "task-1")
+        task_state.process = None
+        settings = TaskSettings(
+            code="return _items",
+            node_mode="all_items",
+            continue_on_fail=False,
+            items=[],
+            workflow_name="workflow",
+            workflow_id="workflow-id",
+            node_name="node",
+            node_id="node-id",
+        )
+
+        def execute_process(is_cancelled, **kwargs):
+            # the cancel arrives after the thread is scheduled, before start()
+            task_state.status = TaskStatus.ABORTING
+            return is_cancelled()
+
+        with (
+            patch.object(
+                runner.executor, "create_process", return_value=(Mock(), Mock(), Mock())
+            ),
+            patch.object(runner.executor, "execute_process", new=execute_process),
+        ):
+            assert await runner._run_process(task_state, settings) is True
+
+    def test_freed_slot_records_cancel_latency(self, runner):
+        task_state = self.running_task(runner, "task-1")
+        task_state.cancel_requested_at = time.monotonic() - 0.25
+
+        runner._record_cancel("task-1", task_state)
+
+        assert runner.metrics.tasks_cancelled == 1
+        assert runner.metrics.cancel_latency_max >= 0.25
+
+
+class TestTaskRunnerShutdown:
+    @pytest.fixture
+    def runner(self):
+        config = make_config()
+        return TaskRunner(config)
+
+    @pytest.mark.asyncio
+    async def test_wait_for_tasks_returns_when_last_task_completes(self, runner):
+        for task_id in ("task-1", "task-2"):
+            runner.running_tasks[task_id] = TaskState(task_id)
+
+        async def complete_tasks():
+            await asyncio.sleep(0.01)
+            runner._remove_task("task-1")
+            await asyncio.sleep(0.01)
+            runner._remove_task("task-2")
+
+        start = time.monotonic()
+        await asyncio.gather(runner._wait_for_tasks(), complete_tasks())
+
+        assert runner.running_tasks == {}
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_wait_for_tasks_cancels_waiters_on_timeout(self, runner):
+        runner.config.graceful_shutdown_timeout = 0.01
+        runner.running_tasks["task-1"] = TaskState("task-1")
+        tasks_before = asyncio.all_tasks()
+
+        await runner._wait_for_tasks()
+        await asyncio.sleep(0)
+
+        assert asyncio.all_tasks() == tasks_before
+
+    @pytest.mark.asyncio
+    async def test_terminate_tasks_signals_all_processes_before_escalating(
+        self, runner
+    ):
+        calls = []
+        for task_id in ("task-1", "task-2"):
+            task_state = TaskState(task_id)
+            task_state.process = Mock(name=task_id)
+            runner.running_tasks[task_id] = task_state
+
+        with (
+            patch.object(
+                runner.executor,
+                "terminate_process",
+                side_effect=lambda p: calls.append(("term", p)),
+            ),
+            patch.object(
+                runner.executor,
+                "kill_process",
+                side_effect=lambda p: calls.append(("kill", p)),
+            ),
+            patch("src.task_runner.wait_for_process_exit", new=AsyncMock()),
+        ):
+            await runner._terminate_tasks()
+
+        assert [call[0] for call in calls] == ["term", "term", "kill", "kill"]
+        assert runner.running_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_rejects_accepted_offers_while_shutting_down(self, runner):
+        runner.is_shutting_down = True
+
+        with patch.object(runner, "_send_message", new=AsyncMock()) as send:
+            await runner._handle_task_offer_accept(
+                BrokerTaskOfferAccept(task_id="task-1", offer_id="offer-1")
+            )
+
+        response = send.call_args[0][0]
+        assert isinstance(response, RunnerTaskRejected)
+        assert response.reason == TASK_REJECTED_REASON_SHUTTING_DOWN
+        assert runner.running_tasks == {}
+
+
+class TestTaskRunnerOffers:
+    @pytest.fixture
+    def runner(self):
+        config = make_config(max_concurrency=3)
+        runner = TaskRunner(config)
+        runner.can_send_offers = True
+        return runner
+
+    @pytest.mark.asyncio
+    async def test_expired_offers_are_replaced(self, runner):
+        with patch.object(runner, "_send_message", new=AsyncMock()):
+            await runner._send_offers()
+            first_offer_ids = set(runner.open_offers)
+
+            with patch(
+                "src.task_runner.time.monotonic", return_value=time.monotonic() + 60
+            ):
+                await runner._send_offers()
+
+        assert len(runner.open_offers) == 3
+        assert first_offer_ids.isdisjoint(runner.open_offers)
+
+    @pytest.mark.asyncio
+    async def test_accepted_offer_does_not_count_as_open(self, runner):
+        with patch.object(runner, "_send_message", new=AsyncMock()):
+            await runner._send_offers()
+            offer_id = next(iter(runner.open_offers))
+
+            await runner._handle_task_offer_accept(
+                BrokerTaskOfferAccept(task_id="task-1", offer_id=offer_id)
+            )
+            await runner._send_offers()
+
+        assert offer_id not in runner.open_offers
+        assert len(runner.open_offers) + runner.running_tasks_count == 3
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_stays_bounded_under_turnover(self, runner):
+        with patch.object(runner, "_send_message", new=AsyncMock()):
+            for round_number in range(100):
+                await runner._send_offers()
+                for offer_id in list(runner.open_offers):
+                    task_id = f"task-{round_number}-{offer_id}"
+                    await runner._handle_task_offer_accept(
+                        BrokerTaskOfferAccept(task_id=task_id, offer_id=offer_id)
+                    )
+                    runner._remove_task(task_id)
+
+        assert (
+            len(runner.offer_expiries)
+            <= 2 * (len(runner.open_offers) + runner.config.max_concurrency)
+            + runner.config.max_concurrency
+        )
+
+
+class TestTaskRunnerResultCache:
+    @pytest.fixture
+    def runner(self):
+        config = make_config(result_cache_enabled=True)
+        runner = TaskRunner(config)
+        runner._send_message = AsyncMock()
+        return runner
+
+    async def run_task(self, runner: TaskRunner, task_id: str, code: str):
+        runner.running_tasks[task_id] = TaskState(task_id)
+        settings = TaskSettings(
+            code=code,
+            node_mode="all_items",
+            continue_on_fail=False,
+            items=[{"json": {"a": 1}}],
+            workflow_name="workflow",
+            workflow_id="workflow-id",
+            node_name="node",
+            node_id="node-id",
+        )
+        await runner._handle_task_settings(BrokerTaskSettings(task_id, settings))
+        await runner.running_tasks[task_id].completed.wait()
+
+    @pytest.mark.asyncio
+    async def test_cacheable_task_runs_once(self, runner):
+        code = "# n8n: cacheable\nreturn _items"
+
+        with patch.object(
+            runner,
+            "_run_process",
+            new=AsyncMock(return_value=([{"json": {"a": 1}}], [], 20)),
+        ) as run_process:
+            await self.run_task(runner, "task-1", code)
+            await self.run_task(runner, "task-2", code)
+
+        run_process.assert_awaited_once()
+        assert runner.metrics.result_cache_hits == 1
+        assert runner.metrics.result_cache_misses == 1
+        results = [
+            call.args[0].data
+            for call in runner._send_message.await_args_list
+            if hasattr(call.args[0], "data")
+        ]
+        assert results == [{"result": [{"json": {"a": 1}}]}] * 2
+
+    @pytest.mark.asyncio
+    async def test_task_without_marker_is_not_cached(self, runner):
+        with patch.object(
+            runner,
+            "_run_process",
+            new=AsyncMock(return_value=([{"json": {"a": 1}}], [], 20)),
+        ) as run_process:
+            await self.run_task(runner, "task-1", "return _items")
+            await self.run_task(runner, "task-2", "return _items")
+
+        assert run_process.await_count == 2
+        assert runner.metrics.result_cache_misses == 0
+
+
+class TestTaskRunnerAdaptiveConcurrency:
+    @pytest.mark.asyncio
+    async def test_offers_follow_controller_limit(self):
+        config = make_config(max_concurrency=8, adaptive_concurrency_enabled=True)
+        runner = TaskRunner(config)
+        runner.can_send_offers = True
+        runner._send_message = AsyncMock()
+
+        assert runner.concurrency_controller is not None
+        runner.concurrency_controller.limit = 3
+        with patch.object(runner.concurrency_controller, "update") as update:
+            await runner._send_offers()
+
+        update.assert_called_once_with(0)
+
+        assert len(runner.open_offers) == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects_accept_over_controller_limit(self):
+        config = make_config(max_concurrency=8, adaptive_concurrency_enabled=True)
+        runner = TaskRunner(config)
+        runner.can_send_offers = True
+        runner._send_message = AsyncMock()
+
+        await runner._send_offers()
+        offer_id = next(iter(runner.open_offers))
+        runner.running_tasks["task-1"] = TaskState("task-1")
+
+        assert runner.concurrency_controller is not None
+        runner.concurrency_controller.limit = 1
+        await runner._handle_task_offer_accept(
+            BrokerTaskOfferAccept(task_id="task-2", offer_id=offer_id)
+        )
+
+        response = runner._send_message.await_args.args[0]
+        assert isinstance(response, RunnerTaskRejected)
+        assert response.reason == TASK_REJECTED_REASON_AT_CAPACITY
+        assert "task-2" not in runner.running_tasks
+
+
+class TestTaskRunnerMemoryAdmission:
+    @pytest.fixture
+    def runner(self):
+        config = make_config(memory_budget=1024 * 1024 * 1024)
+        runner = TaskRunner(config)
+        runner.can_send_offers = True
+        runner._send_message = AsyncMock()
+        return runner
+
+    @pytest.mark.asyncio
+    async def test_rejects_accept_over_budget(self, runner):
+        await runner._send_offers()
+        offer_id = next(iter(runner.open_offers))
+
+        assert runner.memory_admission is not None
+        with patch.object(runner.memory_admission, "free_slots", return_value=0):
+            await runner._handle_task_offer_accept(
+                BrokerTaskOfferAccept(task_id="task-1", offer_id=offer_id)
+            )
+
+        response = runner._send_message.await_args.args[0]
+        assert isinstance(response, RunnerTaskRejected)
+        assert response.reason == TASK_REJECTED_REASON_MEMORY_PRESSURE
+        assert runner.metrics.tasks_rejected_memory == 1
+        assert "task-1" not in runner.running_tasks
+
+    @pytest.mark.asyncio
+    async def test_fails_accepted_task_whose_payload_exceeds_budget(self, runner):
+        runner.running_tasks["task-1"] = TaskState("task-1")
+        settings = TaskSettings(
+            code="return _items",
+            node_mode="all_items",
+            continue_on_fail=False,
+            items=[],
+            workflow_name="workflow",
+            workflow_id="workflow-id",
+            node_name="node",
+            node_id="node-id",
+            payload_size=512 * 1024 * 1024,
+        )
+
+        with patch.object(runner, "_execute_task", new=AsyncMock()) as execute:
+            await runner._handle_task_settings(BrokerTaskSettings("task-1", settings))
+
+        execute.assert_not_called()
+        response = runner._send_message.await_args.args[0]
+        assert isinstance(response, RunnerTaskError)
+        assert response.error["message"] == TASK_REJECTED_REASON_MEMORY_PRESSURE
+        assert runner.metrics.tasks_rejected_memory == 1
+        assert "task-1" not in runner.running_tasks
+
+    @pytest.mark.asyncio
+    async def test_runs_accepted_task_within_budget(self, runner):
+        runner.running_tasks["task-1"] = TaskState("task-1")
+        settings = TaskSettings(
+            code="return _items",
+            node_mode="all_items",
+            continue_on_fail=False,
+            items=[],
+            workflow_name="workflow",
+            workflow_id="workflow-id",
+            node_name="node",
+            node_id="node-id",
+            payload_size=1024,
+        )
+
+        with patch.object(runner, "_execute_task", new=AsyncMock()) as execute:
+            await runner._handle_task_settings(BrokerTaskSettings("task-1", settings))
+            await asyncio.sleep(0)
+
+        execute.assert_called_once()
+        assert runner.running_tasks["task-1"].status == TaskStatus.RUNNING
+
+    @pytest.mark.asyncio
+    async def test_stops_offering_over_budget(self, runner):
+        assert runner.memory_admission is not None
+        with patch.object(runner.memory_admission, "free_slots", return_value=2):
+            await runner._send_offers()
+
+        assert len(runner.open_offers) == 2
+
+        with patch.object(runner.memory_admission, "free_slots", return_value=0):
+            runner.open_offers.clear()
+            await runner._send_offers()
+
+        assert len(runner.open_offers) == 0
+
+
+class TestTaskRunnerReadiness:
+    @pytest.fixture
+    def runner(self):
+        config = make_config(max_concurrency=2)
+        runner = TaskRunner(config)
+        runner.can_send_offers = True
+        return runner
+
+    def test_ready_when_registered_with_free_slots(self, runner):
+        readiness = runner.readiness()
+
+        assert readiness["ready"] is True
+        assert readiness["free_slots"] == 2
+
+    def test_not_ready_before_registration(self, runner):
+        runner.can_send_offers = False
+
+        readiness = runner.readiness()
+
+        assert readiness["ready"] is False
+        assert readiness["checks"]["registered"] is False
+
+    def test_not_ready_when_saturated(self, runner):
+        runner.running_tasks = {"a": TaskState("a"), "b": TaskState("b")}
+
+        readiness = runner.readiness()
+
+        assert readiness["ready"] is False
+        assert readiness["free_slots"] == 0
+
+    def test_not_ready_after_repeated_subprocess_start_failures(self, runner):
+        runner.metrics.subprocess_start_failures = 3
+
+        assert runner.readiness()["checks"]["forkserver"] is False
+
+    def test_not_ready_when_recent_tasks_are_slow(self, runner):
+        runner.running_tasks = {"a": TaskState("a")}
+        runner.metrics.record_task_latency(45)
+
+        readiness = runner.readiness()
+
+        assert readiness["checks"]["task_latency"] is False
+        assert readiness["task_latency"] == 45
+
+    def test_ready_when_idle_after_slow_tasks(self, runner):
+        runner.metrics.record_task_latency(45)
+
+        readiness = runner.readiness()
+
+        assert readiness["ready"] is True
+        assert readiness["checks"]["task_latency"] is True